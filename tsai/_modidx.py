@@ -14,7 +14,20 @@ d = { 'settings': { 'branch': 'main',
                                'tsai.analysis.Learner.step_importance': ('analysis.html#learner.step_importance', 'tsai/analysis.py'),
                                'tsai.analysis.Learner.top_losses': ('analysis.html#learner.top_losses', 'tsai/analysis.py')},
             'tsai.basics': {},
-            'tsai.calibration': { 'tsai.calibration.ECELoss': ('calibration.html#eceloss', 'tsai/calibration.py'),
+            'tsai.calibration': { 'tsai.calibration.CalibrationStats': ('calibration.html#calibrationstats', 'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.__getitem__': ( 'calibration.html#calibrationstats.__getitem__',
+                                                                                     'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.__init__': ( 'calibration.html#calibrationstats.__init__',
+                                                                                  'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.ece': ('calibration.html#calibrationstats.ece', 'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.nll': ('calibration.html#calibrationstats.nll', 'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.reliability': ( 'calibration.html#calibrationstats.reliability',
+                                                                                     'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.reset': ( 'calibration.html#calibrationstats.reset',
+                                                                               'tsai/calibration.py'),
+                                  'tsai.calibration.CalibrationStats.update': ( 'calibration.html#calibrationstats.update',
+                                                                                'tsai/calibration.py'),
+                                  'tsai.calibration.ECELoss': ('calibration.html#eceloss', 'tsai/calibration.py'),
                                   'tsai.calibration.ECELoss.__init__': ('calibration.html#eceloss.__init__', 'tsai/calibration.py'),
                                   'tsai.calibration.ECELoss.forward': ('calibration.html#eceloss.forward', 'tsai/calibration.py'),
                                   'tsai.calibration.Learner.calibrate_model': ( 'calibration.html#learner.calibrate_model',
@@ -29,10 +42,16 @@ d = { 'settings': { 'branch': 'main',
                                   'tsai.calibration.TemperatureSetter': ('calibration.html#temperaturesetter', 'tsai/calibration.py'),
                                   'tsai.calibration.TemperatureSetter.__init__': ( 'calibration.html#temperaturesetter.__init__',
                                                                                    'tsai/calibration.py'),
+                                  'tsai.calibration.TemperatureSetter._grid_forward': ( 'calibration.html#temperaturesetter._grid_forward',
+                                                                                        'tsai/calibration.py'),
+                                  'tsai.calibration.TemperatureSetter._update_reservoir': ( 'calibration.html#temperaturesetter._update_reservoir',
+                                                                                            'tsai/calibration.py'),
                                   'tsai.calibration.TemperatureSetter.forward': ( 'calibration.html#temperaturesetter.forward',
                                                                                   'tsai/calibration.py'),
                                   'tsai.calibration.plot_calibration_curve': ( 'calibration.html#plot_calibration_curve',
-                                                                               'tsai/calibration.py')},
+                                                                               'tsai/calibration.py'),
+                                  'tsai.calibration.plot_reliability_diagram': ( 'calibration.html#plot_reliability_diagram',
+                                                                                 'tsai/calibration.py')},
             'tsai.callback.MVP': { 'tsai.callback.MVP.MVP': ('callback.mvp.html#mvp', 'tsai/callback/MVP.py'),
                                    'tsai.callback.MVP.MVP.__init__': ('callback.mvp.html#mvp.__init__', 'tsai/callback/MVP.py'),
                                    'tsai.callback.MVP.MVP._loss': ('callback.mvp.html#mvp._loss', 'tsai/callback/MVP.py'),
@@ -52,6 +71,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                                            'tsai/callback/PredictionDynamics.py'),
                                                   'tsai.callback.PredictionDynamics.PredictionDynamics.__init__': ( 'callback.predictiondynamics.html#predictiondynamics.__init__',
                                                                                                                     'tsai/callback/PredictionDynamics.py'),
+                                                  'tsai.callback.PredictionDynamics.PredictionDynamics._plot_epoch': ( 'callback.predictiondynamics.html#predictiondynamics._plot_epoch',
+                                                                                                                       'tsai/callback/PredictionDynamics.py'),
                                                   'tsai.callback.PredictionDynamics.PredictionDynamics.after_epoch': ( 'callback.predictiondynamics.html#predictiondynamics.after_epoch',
                                                                                                                        'tsai/callback/PredictionDynamics.py'),
                                                   'tsai.callback.PredictionDynamics.PredictionDynamics.after_pred': ( 'callback.predictiondynamics.html#predictiondynamics.after_pred',
@@ -63,7 +84,21 @@ d = { 'settings': { 'branch': 'main',
                                                   'tsai.callback.PredictionDynamics.PredictionDynamics.update_graph': ( 'callback.predictiondynamics.html#predictiondynamics.update_graph',
                                                                                                                         'tsai/callback/PredictionDynamics.py')},
             'tsai.callback.all': {},
-            'tsai.callback.core': { 'tsai.callback.core.BatchSubsampler': ('callback.core.html#batchsubsampler', 'tsai/callback/core.py'),
+            'tsai.callback.core': { 'tsai.callback.core.AutocastMixedPrecision': ( 'callback.core.html#autocastmixedprecision',
+                                                                                   'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision.__init__': ( 'callback.core.html#autocastmixedprecision.__init__',
+                                                                                            'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision._exit': ( 'callback.core.html#autocastmixedprecision._exit',
+                                                                                         'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision.after_batch': ( 'callback.core.html#autocastmixedprecision.after_batch',
+                                                                                               'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision.after_loss': ( 'callback.core.html#autocastmixedprecision.after_loss',
+                                                                                              'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision.after_pred': ( 'callback.core.html#autocastmixedprecision.after_pred',
+                                                                                              'tsai/callback/core.py'),
+                                    'tsai.callback.core.AutocastMixedPrecision.before_batch': ( 'callback.core.html#autocastmixedprecision.before_batch',
+                                                                                                'tsai/callback/core.py'),
+                                    'tsai.callback.core.BatchSubsampler': ('callback.core.html#batchsubsampler', 'tsai/callback/core.py'),
                                     'tsai.callback.core.BatchSubsampler.__init__': ( 'callback.core.html#batchsubsampler.__init__',
                                                                                      'tsai/callback/core.py'),
                                     'tsai.callback.core.BatchSubsampler.before_batch': ( 'callback.core.html#batchsubsampler.before_batch',
@@ -91,6 +126,39 @@ d = { 'settings': { 'branch': 'main',
                                                                                  'tsai/callback/core.py'),
                                     'tsai.callback.core.ShowGraph.update_graph': ( 'callback.core.html#showgraph.update_graph',
                                                                                    'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler': ('callback.core.html#trainingprofiler', 'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.__init__': ( 'callback.core.html#trainingprofiler.__init__',
+                                                                                      'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler._mark': ( 'callback.core.html#trainingprofiler._mark',
+                                                                                   'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler._now': ( 'callback.core.html#trainingprofiler._now',
+                                                                                  'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler._reset': ( 'callback.core.html#trainingprofiler._reset',
+                                                                                    'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_backward': ( 'callback.core.html#trainingprofiler.after_backward',
+                                                                                            'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_batch': ( 'callback.core.html#trainingprofiler.after_batch',
+                                                                                         'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_fit': ( 'callback.core.html#trainingprofiler.after_fit',
+                                                                                       'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_loss': ( 'callback.core.html#trainingprofiler.after_loss',
+                                                                                        'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_pred': ( 'callback.core.html#trainingprofiler.after_pred',
+                                                                                        'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.after_step': ( 'callback.core.html#trainingprofiler.after_step',
+                                                                                        'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.before_batch': ( 'callback.core.html#trainingprofiler.before_batch',
+                                                                                          'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.before_fit': ( 'callback.core.html#trainingprofiler.before_fit',
+                                                                                        'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.before_train': ( 'callback.core.html#trainingprofiler.before_train',
+                                                                                          'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.before_validate': ( 'callback.core.html#trainingprofiler.before_validate',
+                                                                                             'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.summary': ( 'callback.core.html#trainingprofiler.summary',
+                                                                                     'tsai/callback/core.py'),
+                                    'tsai.callback.core.TrainingProfiler.times': ( 'callback.core.html#trainingprofiler.times',
+                                                                                   'tsai/callback/core.py'),
                                     'tsai.callback.core.TransformScheduler': ( 'callback.core.html#transformscheduler',
                                                                                'tsai/callback/core.py'),
                                     'tsai.callback.core.TransformScheduler.__init__': ( 'callback.core.html#transformscheduler.__init__',
@@ -118,6 +186,13 @@ d = { 'settings': { 'branch': 'main',
                                                                                       'tsai/callback/core.py'),
                                     'tsai.callback.core._PerInstanceLoss.forward': ( 'callback.core.html#_perinstanceloss.forward',
                                                                                      'tsai/callback/core.py'),
+                                    'tsai.callback.core._TimedTransform': ('callback.core.html#_timedtransform', 'tsai/callback/core.py'),
+                                    'tsai.callback.core._TimedTransform.__call__': ( 'callback.core.html#_timedtransform.__call__',
+                                                                                     'tsai/callback/core.py'),
+                                    'tsai.callback.core._TimedTransform.__init__': ( 'callback.core.html#_timedtransform.__init__',
+                                                                                     'tsai/callback/core.py'),
+                                    'tsai.callback.core._TimedTransform.__setattr__': ( 'callback.core.html#_timedtransform.__setattr__',
+                                                                                        'tsai/callback/core.py'),
                                     'tsai.callback.core.get_lds_kernel_window': ( 'callback.core.html#get_lds_kernel_window',
                                                                                   'tsai/callback/core.py'),
                                     'tsai.callback.core.prepare_LDS_weights': ( 'callback.core.html#prepare_lds_weights',
@@ -186,7 +261,14 @@ d = { 'settings': { 'branch': 'main',
                                                                                                 'tsai/callback/noisy_student.py')},
             'tsai.data.all': {},
             'tsai.data.basics': {},
-            'tsai.data.core': { 'tsai.data.core.NoTfmLists': ('data.core.html#notfmlists', 'tsai/data/core.py'),
+            'tsai.data.core': { 'tsai.data.core.LengthBucketSampler': ('data.core.html#lengthbucketsampler', 'tsai/data/core.py'),
+                                'tsai.data.core.LengthBucketSampler.__init__': ( 'data.core.html#lengthbucketsampler.__init__',
+                                                                                 'tsai/data/core.py'),
+                                'tsai.data.core.LengthBucketSampler.__iter__': ( 'data.core.html#lengthbucketsampler.__iter__',
+                                                                                 'tsai/data/core.py'),
+                                'tsai.data.core.LengthBucketSampler.__len__': ( 'data.core.html#lengthbucketsampler.__len__',
+                                                                                'tsai/data/core.py'),
+                                'tsai.data.core.NoTfmLists': ('data.core.html#notfmlists', 'tsai/data/core.py'),
                                 'tsai.data.core.NoTfmLists.__getitem__': ('data.core.html#notfmlists.__getitem__', 'tsai/data/core.py'),
                                 'tsai.data.core.NoTfmLists.__init__': ('data.core.html#notfmlists.__init__', 'tsai/data/core.py'),
                                 'tsai.data.core.NoTfmLists.__len__': ('data.core.html#notfmlists.__len__', 'tsai/data/core.py'),
@@ -198,6 +280,10 @@ d = { 'settings': { 'branch': 'main',
                                 'tsai.data.core.NumpyDataLoader': ('data.core.html#numpydataloader', 'tsai/data/core.py'),
                                 'tsai.data.core.NumpyDataLoader.__init__': ('data.core.html#numpydataloader.__init__', 'tsai/data/core.py'),
                                 'tsai.data.core.NumpyDataLoader.__len__': ('data.core.html#numpydataloader.__len__', 'tsai/data/core.py'),
+                                'tsai.data.core.NumpyDataLoader._get_rank_idxs': ( 'data.core.html#numpydataloader._get_rank_idxs',
+                                                                                   'tsai/data/core.py'),
+                                'tsai.data.core.NumpyDataLoader._pad_shards': ( 'data.core.html#numpydataloader._pad_shards',
+                                                                                'tsai/data/core.py'),
                                 'tsai.data.core.NumpyDataLoader.c': ('data.core.html#numpydataloader.c', 'tsai/data/core.py'),
                                 'tsai.data.core.NumpyDataLoader.cat': ('data.core.html#numpydataloader.cat', 'tsai/data/core.py'),
                                 'tsai.data.core.NumpyDataLoader.class_priors': ( 'data.core.html#numpydataloader.class_priors',
@@ -300,12 +386,29 @@ d = { 'settings': { 'branch': 'main',
                                                                                'tsai/data/core.py'),
                                 'tsai.data.core.TSMultiLabelClassification.__init__': ( 'data.core.html#tsmultilabelclassification.__init__',
                                                                                         'tsai/data/core.py'),
+                                'tsai.data.core.TSMultiLabelClassification._is_batch': ( 'data.core.html#tsmultilabelclassification._is_batch',
+                                                                                         'tsai/data/core.py'),
                                 'tsai.data.core.TSMultiLabelClassification.decodes': ( 'data.core.html#tsmultilabelclassification.decodes',
                                                                                        'tsai/data/core.py'),
                                 'tsai.data.core.TSMultiLabelClassification.encodes': ( 'data.core.html#tsmultilabelclassification.encodes',
                                                                                        'tsai/data/core.py'),
                                 'tsai.data.core.TSMultiLabelClassification.setups': ( 'data.core.html#tsmultilabelclassification.setups',
                                                                                       'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray': ('data.core.html#tsraggedarray', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.__array__': ('data.core.html#tsraggedarray.__array__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.__getitem__': ( 'data.core.html#tsraggedarray.__getitem__',
+                                                                              'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.__init__': ('data.core.html#tsraggedarray.__init__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.__len__': ('data.core.html#tsraggedarray.__len__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.__repr__': ('data.core.html#tsraggedarray.__repr__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.dtype': ('data.core.html#tsraggedarray.dtype', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.from_sequences': ( 'data.core.html#tsraggedarray.from_sequences',
+                                                                                 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.load': ('data.core.html#tsraggedarray.load', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.nbytes': ('data.core.html#tsraggedarray.nbytes', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.save': ('data.core.html#tsraggedarray.save', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.shape': ('data.core.html#tsraggedarray.shape', 'tsai/data/core.py'),
+                                'tsai.data.core.TSRaggedArray.vars': ('data.core.html#tsraggedarray.vars', 'tsai/data/core.py'),
                                 'tsai.data.core.TSTensor': ('data.core.html#tstensor', 'tsai/data/core.py'),
                                 'tsai.data.core.TSTensor.__new__': ('data.core.html#tstensor.__new__', 'tsai/data/core.py'),
                                 'tsai.data.core.TSTensor.__repr__': ('data.core.html#tstensor.__repr__', 'tsai/data/core.py'),
@@ -317,6 +420,10 @@ d = { 'settings': { 'branch': 'main',
                                 'tsai.data.core.TSTensorBlock.__init__': ('data.core.html#tstensorblock.__init__', 'tsai/data/core.py'),
                                 'tsai.data.core.TSTfmdLists': ('data.core.html#tstfmdlists', 'tsai/data/core.py'),
                                 'tsai.data.core.TSTfmdLists.__getitem__': ('data.core.html#tstfmdlists.__getitem__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSTfmdLists.__init__': ('data.core.html#tstfmdlists.__init__', 'tsai/data/core.py'),
+                                'tsai.data.core.TSTfmdLists._get': ('data.core.html#tstfmdlists._get', 'tsai/data/core.py'),
+                                'tsai.data.core.TSToFloat': ('data.core.html#tstofloat', 'tsai/data/core.py'),
+                                'tsai.data.core.TSToFloat.encodes': ('data.core.html#tstofloat.encodes', 'tsai/data/core.py'),
                                 'tsai.data.core.TfmdDL._one_pass': ('data.core.html#tfmddl._one_pass', 'tsai/data/core.py'),
                                 'tsai.data.core.ToFloat': ('data.core.html#tofloat', 'tsai/data/core.py'),
                                 'tsai.data.core.ToFloat.decodes': ('data.core.html#tofloat.decodes', 'tsai/data/core.py'),
@@ -334,8 +441,14 @@ d = { 'settings': { 'branch': 'main',
                                 'tsai.data.core.TorchDataset.__len__': ('data.core.html#torchdataset.__len__', 'tsai/data/core.py'),
                                 'tsai.data.core._check_split': ('data.core.html#_check_split', 'tsai/data/core.py'),
                                 'tsai.data.core._check_splits': ('data.core.html#_check_splits', 'tsai/data/core.py'),
+                                'tsai.data.core._encode_labels': ('data.core.html#_encode_labels', 'tsai/data/core.py'),
                                 'tsai.data.core._flatten_list': ('data.core.html#_flatten_list', 'tsai/data/core.py'),
+                                'tsai.data.core._get_vocab_lookup': ('data.core.html#_get_vocab_lookup', 'tsai/data/core.py'),
+                                'tsai.data.core._is_half': ('data.core.html#_is_half', 'tsai/data/core.py'),
+                                'tsai.data.core._kind': ('data.core.html#_kind', 'tsai/data/core.py'),
+                                'tsai.data.core._merge_ranges': ('data.core.html#_merge_ranges', 'tsai/data/core.py'),
                                 'tsai.data.core._remove_brackets': ('data.core.html#_remove_brackets', 'tsai/data/core.py'),
+                                'tsai.data.core._setup_items': ('data.core.html#_setup_items', 'tsai/data/core.py'),
                                 'tsai.data.core.add_ds': ('data.core.html#add_ds', 'tsai/data/core.py'),
                                 'tsai.data.core.get_best_dl_params': ('data.core.html#get_best_dl_params', 'tsai/data/core.py'),
                                 'tsai.data.core.get_best_dls_params': ('data.core.html#get_best_dls_params', 'tsai/data/core.py'),
@@ -424,7 +537,13 @@ d = { 'settings': { 'branch': 'main',
                                  'tsai.data.image.TSToRP.__init__': ('data.image.html#tstorp.__init__', 'tsai/data/image.py'),
                                  'tsai.data.image.TSToRP.encodes': ('data.image.html#tstorp.encodes', 'tsai/data/image.py'),
                                  'tsai.data.image.ToTSImage': ('data.image.html#totsimage', 'tsai/data/image.py'),
-                                 'tsai.data.image.ToTSImage.encodes': ('data.image.html#totsimage.encodes', 'tsai/data/image.py')},
+                                 'tsai.data.image.ToTSImage.encodes': ('data.image.html#totsimage.encodes', 'tsai/data/image.py'),
+                                 'tsai.data.image._apply_cmap': ('data.image.html#_apply_cmap', 'tsai/data/image.py'),
+                                 'tsai.data.image._cmap_lut': ('data.image.html#_cmap_lut', 'tsai/data/image.py'),
+                                 'tsai.data.image._gaf': ('data.image.html#_gaf', 'tsai/data/image.py'),
+                                 'tsai.data.image._kbins': ('data.image.html#_kbins', 'tsai/data/image.py'),
+                                 'tsai.data.image._mtf': ('data.image.html#_mtf', 'tsai/data/image.py'),
+                                 'tsai.data.image._rp': ('data.image.html#_rp', 'tsai/data/image.py')},
             'tsai.data.metadatasets': { 'tsai.data.metadatasets.TSMetaDataset': ( 'data.metadatasets.html#tsmetadataset',
                                                                                   'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.__getitem__': ( 'data.metadatasets.html#tsmetadataset.__getitem__',
@@ -433,14 +552,20 @@ d = { 'settings': { 'branch': 'main',
                                                                                            'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.__len__': ( 'data.metadatasets.html#tsmetadataset.__len__',
                                                                                           'tsai/data/metadatasets.py'),
-                                        'tsai.data.metadatasets.TSMetaDataset._mapping': ( 'data.metadatasets.html#tsmetadataset._mapping',
+                                        'tsai.data.metadatasets.TSMetaDataset._offsets': ( 'data.metadatasets.html#tsmetadataset._offsets',
                                                                                            'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.cat': ( 'data.metadatasets.html#tsmetadataset.cat',
                                                                                       'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.len': ( 'data.metadatasets.html#tsmetadataset.len',
                                                                                       'tsai/data/metadatasets.py'),
+                                        'tsai.data.metadatasets.TSMetaDataset.map_idxs': ( 'data.metadatasets.html#tsmetadataset.map_idxs',
+                                                                                           'tsai/data/metadatasets.py'),
+                                        'tsai.data.metadatasets.TSMetaDataset.mapping': ( 'data.metadatasets.html#tsmetadataset.mapping',
+                                                                                          'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.new_empty': ( 'data.metadatasets.html#tsmetadataset.new_empty',
                                                                                             'tsai/data/metadatasets.py'),
+                                        'tsai.data.metadatasets.TSMetaDataset.split_idxs': ( 'data.metadatasets.html#tsmetadataset.split_idxs',
+                                                                                             'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.vars': ( 'data.metadatasets.html#tsmetadataset.vars',
                                                                                        'tsai/data/metadatasets.py'),
                                         'tsai.data.metadatasets.TSMetaDataset.vocab': ( 'data.metadatasets.html#tsmetadataset.vocab',
@@ -462,12 +587,16 @@ d = { 'settings': { 'branch': 'main',
                                                                                'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoader.__len__': ( 'data.mixed.html#mixeddataloader.__len__',
                                                                               'tsai/data/mixed.py'),
-                                 'tsai.data.mixed.MixedDataLoader._arrayisin': ( 'data.mixed.html#mixeddataloader._arrayisin',
-                                                                                 'tsai/data/mixed.py'),
+                                 'tsai.data.mixed.MixedDataLoader._batch_idxs': ( 'data.mixed.html#mixeddataloader._batch_idxs',
+                                                                                  'tsai/data/mixed.py'),
+                                 'tsai.data.mixed.MixedDataLoader._gathered_batches': ( 'data.mixed.html#mixeddataloader._gathered_batches',
+                                                                                        'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoader._get_idxs': ( 'data.mixed.html#mixeddataloader._get_idxs',
                                                                                 'tsai/data/mixed.py'),
-                                 'tsai.data.mixed.MixedDataLoader._get_vals': ( 'data.mixed.html#mixeddataloader._get_vals',
-                                                                                'tsai/data/mixed.py'),
+                                 'tsai.data.mixed.MixedDataLoader._get_targets': ( 'data.mixed.html#mixeddataloader._get_targets',
+                                                                                   'tsai/data/mixed.py'),
+                                 'tsai.data.mixed.MixedDataLoader._is_duplicate': ( 'data.mixed.html#mixeddataloader._is_duplicate',
+                                                                                    'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoader._split_idxs': ( 'data.mixed.html#mixeddataloader._split_idxs',
                                                                                   'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoader.new': ('data.mixed.html#mixeddataloader.new', 'tsai/data/mixed.py'),
@@ -479,6 +608,10 @@ d = { 'settings': { 'branch': 'main',
                                                                                  'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoader.to': ('data.mixed.html#mixeddataloader.to', 'tsai/data/mixed.py'),
                                  'tsai.data.mixed.MixedDataLoaders': ('data.mixed.html#mixeddataloaders', 'tsai/data/mixed.py'),
+                                 'tsai.data.mixed._MixedBatches': ('data.mixed.html#_mixedbatches', 'tsai/data/mixed.py'),
+                                 'tsai.data.mixed._MixedBatches.__getitem__': ( 'data.mixed.html#_mixedbatches.__getitem__',
+                                                                                'tsai/data/mixed.py'),
+                                 'tsai.data.mixed._MixedBatches.__init__': ('data.mixed.html#_mixedbatches.__init__', 'tsai/data/mixed.py'),
                                  'tsai.data.mixed.get_mixed_dls': ('data.mixed.html#get_mixed_dls', 'tsai/data/mixed.py')},
             'tsai.data.mixed_augmentation': { 'tsai.data.mixed_augmentation.CutMix1d': ( 'data.mixed_augmentation.html#cutmix1d',
                                                                                          'tsai/data/mixed_augmentation.py'),
@@ -1265,6 +1398,10 @@ d = { 'settings': { 'branch': 'main',
                                       'tsai.data.validation.TSSplitter': ('data.validation.html#tssplitter', 'tsai/data/validation.py'),
                                       'tsai.data.validation.TrainValidTestSplitter': ( 'data.validation.html#trainvalidtestsplitter',
                                                                                        'tsai/data/validation.py'),
+                                      'tsai.data.validation._is_idxs': ('data.validation.html#_is_idxs', 'tsai/data/validation.py'),
+                                      'tsai.data.validation._is_nested_split': ( 'data.validation.html#_is_nested_split',
+                                                                                 'tsai/data/validation.py'),
+                                      'tsai.data.validation._split_max': ('data.validation.html#_split_max', 'tsai/data/validation.py'),
                                       'tsai.data.validation.balance_idx': ('data.validation.html#balance_idx', 'tsai/data/validation.py'),
                                       'tsai.data.validation.calculate_fcst_stats': ( 'data.validation.html#calculate_fcst_stats',
                                                                                      'tsai/data/validation.py'),
@@ -1274,6 +1411,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                      'tsai/data/validation.py'),
                                       'tsai.data.validation.combine_split_data': ( 'data.validation.html#combine_split_data',
                                                                                    'tsai/data/validation.py'),
+                                      'tsai.data.validation.compact_splits': ( 'data.validation.html#compact_splits',
+                                                                               'tsai/data/validation.py'),
                                       'tsai.data.validation.get_df_usable_idxs': ( 'data.validation.html#get_df_usable_idxs',
                                                                                    'tsai/data/validation.py'),
                                       'tsai.data.validation.get_forecasting_splits': ( 'data.validation.html#get_forecasting_splits',
@@ -1306,7 +1445,28 @@ d = { 'settings': { 'branch': 'main',
                              'tsai.export.nb_name_to_py': ('export.html#nb_name_to_py', 'tsai/export.py')},
             'tsai.imports': {},
             'tsai.index': {},
-            'tsai.inference': {'tsai.inference.Learner.get_X_preds': ('inference.html#learner.get_x_preds', 'tsai/inference.py')},
+            'tsai.inference': { 'tsai.inference.Learner.get_X_preds': ('inference.html#learner.get_x_preds', 'tsai/inference.py'),
+                                'tsai.inference._ExportModel': ('inference.html#_exportmodel', 'tsai/inference.py'),
+                                'tsai.inference._ExportModel.__init__': ('inference.html#_exportmodel.__init__', 'tsai/inference.py'),
+                                'tsai.inference._ExportModel.forward': ('inference.html#_exportmodel.forward', 'tsai/inference.py'),
+                                'tsai.inference._QuantizedModel': ('inference.html#_quantizedmodel', 'tsai/inference.py'),
+                                'tsai.inference._QuantizedModel.__init__': ('inference.html#_quantizedmodel.__init__', 'tsai/inference.py'),
+                                'tsai.inference._QuantizedModel.__reduce_ex__': ( 'inference.html#_quantizedmodel.__reduce_ex__',
+                                                                                  'tsai/inference.py'),
+                                'tsai.inference._QuantizedModel.forward': ('inference.html#_quantizedmodel.forward', 'tsai/inference.py'),
+                                'tsai.inference._check_outputs': ('inference.html#_check_outputs', 'tsai/inference.py'),
+                                'tsai.inference._export_input': ('inference.html#_export_input', 'tsai/inference.py'),
+                                'tsai.inference._is_all': ('inference.html#_is_all', 'tsai/inference.py'),
+                                'tsai.inference._load_scripted_model': ('inference.html#_load_scripted_model', 'tsai/inference.py'),
+                                'tsai.inference._quantizable_model': ('inference.html#_quantizable_model', 'tsai/inference.py'),
+                                'tsai.inference._quantized_splitter': ('inference.html#_quantized_splitter', 'tsai/inference.py'),
+                                'tsai.inference._time_exported': ('inference.html#_time_exported', 'tsai/inference.py'),
+                                'tsai.inference._to_onnx': ('inference.html#_to_onnx', 'tsai/inference.py'),
+                                'tsai.inference._to_torchscript': ('inference.html#_to_torchscript', 'tsai/inference.py'),
+                                'tsai.inference._validate_model': ('inference.html#_validate_model', 'tsai/inference.py'),
+                                'tsai.inference.benchmark_export': ('inference.html#benchmark_export', 'tsai/inference.py'),
+                                'tsai.inference.export_model': ('inference.html#export_model', 'tsai/inference.py'),
+                                'tsai.inference.quantize': ('inference.html#quantize', 'tsai/inference.py')},
             'tsai.learner': { 'tsai.learner.Learner.decoder': ('learner.html#learner.decoder', 'tsai/learner.py'),
                               'tsai.learner.Learner.inverse_transform': ('learner.html#learner.inverse_transform', 'tsai/learner.py'),
                               'tsai.learner.Learner.one_batch': ('learner.html#learner.one_batch', 'tsai/learner.py'),
@@ -1344,7 +1504,18 @@ d = { 'settings': { 'branch': 'main',
                              'tsai.losses.TweedieLoss.forward': ('losses.html#tweedieloss.forward', 'tsai/losses.py')},
             'tsai.metrics': { 'tsai.metrics.F1_multi': ('metrics.html#f1_multi', 'tsai/metrics.py'),
                               'tsai.metrics.Fbeta_multi': ('metrics.html#fbeta_multi', 'tsai/metrics.py'),
+                              'tsai.metrics.HistogramMetric': ('metrics.html#histogrammetric', 'tsai/metrics.py'),
+                              'tsai.metrics.HistogramMetric.__init__': ('metrics.html#histogrammetric.__init__', 'tsai/metrics.py'),
+                              'tsai.metrics.HistogramMetric.accum_values': ('metrics.html#histogrammetric.accum_values', 'tsai/metrics.py'),
+                              'tsai.metrics.HistogramMetric.reset': ('metrics.html#histogrammetric.reset', 'tsai/metrics.py'),
+                              'tsai.metrics.HistogramMetric.value': ('metrics.html#histogrammetric.value', 'tsai/metrics.py'),
                               'tsai.metrics.MatthewsCorrCoefBinary': ('metrics.html#matthewscorrcoefbinary', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_above': ('metrics.html#_hist_above', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_lift': ('metrics.html#_hist_lift', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_lift_at_specificity': ('metrics.html#_hist_lift_at_specificity', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_mAP': ('metrics.html#_hist_map', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_recall_at_specificity': ('metrics.html#_hist_recall_at_specificity', 'tsai/metrics.py'),
+                              'tsai.metrics._hist_top_k_lift': ('metrics.html#_hist_top_k_lift', 'tsai/metrics.py'),
                               'tsai.metrics._lift': ('metrics.html#_lift', 'tsai/metrics.py'),
                               'tsai.metrics._lift_at_specificity': ('metrics.html#_lift_at_specificity', 'tsai/metrics.py'),
                               'tsai.metrics._mAP': ('metrics.html#_map', 'tsai/metrics.py'),
@@ -1531,8 +1702,18 @@ d = { 'settings': { 'branch': 'main',
                                                                                                         'tsai/models/MINIROCKET.py'),
                                         'tsai.models.MINIROCKET.MiniRocketVotingClassifier.__repr__': ( 'models.minirocket.html#minirocketvotingclassifier.__repr__',
                                                                                                         'tsai/models/MINIROCKET.py'),
+                                        'tsai.models.MINIROCKET.MiniRocketVotingClassifier._get_head': ( 'models.minirocket.html#minirocketvotingclassifier._get_head',
+                                                                                                         'tsai/models/MINIROCKET.py'),
+                                        'tsai.models.MINIROCKET.MiniRocketVotingClassifier.fit': ( 'models.minirocket.html#minirocketvotingclassifier.fit',
+                                                                                                   'tsai/models/MINIROCKET.py'),
+                                        'tsai.models.MINIROCKET.MiniRocketVotingClassifier.predict': ( 'models.minirocket.html#minirocketvotingclassifier.predict',
+                                                                                                       'tsai/models/MINIROCKET.py'),
                                         'tsai.models.MINIROCKET.MiniRocketVotingClassifier.save': ( 'models.minirocket.html#minirocketvotingclassifier.save',
                                                                                                     'tsai/models/MINIROCKET.py'),
+                                        'tsai.models.MINIROCKET.MiniRocketVotingClassifier.transform': ( 'models.minirocket.html#minirocketvotingclassifier.transform',
+                                                                                                         'tsai/models/MINIROCKET.py'),
+                                        'tsai.models.MINIROCKET.MiniRocketVotingClassifier.transform_features': ( 'models.minirocket.html#minirocketvotingclassifier.transform_features',
+                                                                                                                  'tsai/models/MINIROCKET.py'),
                                         'tsai.models.MINIROCKET.MiniRocketVotingRegressor': ( 'models.minirocket.html#minirocketvotingregressor',
                                                                                               'tsai/models/MINIROCKET.py'),
                                         'tsai.models.MINIROCKET.MiniRocketVotingRegressor.__init__': ( 'models.minirocket.html#minirocketvotingregressor.__init__',
@@ -2370,7 +2551,9 @@ d = { 'settings': { 'branch': 'main',
             'tsai.models.explainability': { 'tsai.models.explainability.get_acts_and_grads': ( 'models.explainability.html#get_acts_and_grads',
                                                                                                'tsai/models/explainability.py'),
                                             'tsai.models.explainability.get_attribution_map': ( 'models.explainability.html#get_attribution_map',
-                                                                                                'tsai/models/explainability.py')},
+                                                                                                'tsai/models/explainability.py'),
+                                            'tsai.models.explainability.get_attribution_maps': ( 'models.explainability.html#get_attribution_maps',
+                                                                                                 'tsai/models/explainability.py')},
             'tsai.models.gMLP': { 'tsai.models.gMLP._SpatialGatingUnit': ('models.gmlp.html#_spatialgatingunit', 'tsai/models/gMLP.py'),
                                   'tsai.models.gMLP._SpatialGatingUnit.__init__': ( 'models.gmlp.html#_spatialgatingunit.__init__',
                                                                                     'tsai/models/gMLP.py'),
@@ -2410,6 +2593,13 @@ d = { 'settings': { 'branch': 'main',
                                                                                   'tsai/models/layers.py'),
                                     'tsai.models.layers.CausalConv1d.forward': ( 'models.layers.html#causalconv1d.forward',
                                                                                  'tsai/models/layers.py'),
+                                    'tsai.models.layers.CheckpointLayer': ('models.layers.html#checkpointlayer', 'tsai/models/layers.py'),
+                                    'tsai.models.layers.CheckpointLayer.__init__': ( 'models.layers.html#checkpointlayer.__init__',
+                                                                                     'tsai/models/layers.py'),
+                                    'tsai.models.layers.CheckpointLayer.__repr__': ( 'models.layers.html#checkpointlayer.__repr__',
+                                                                                     'tsai/models/layers.py'),
+                                    'tsai.models.layers.CheckpointLayer.forward': ( 'models.layers.html#checkpointlayer.forward',
+                                                                                    'tsai/models/layers.py'),
                                     'tsai.models.layers.Chomp1d': ('models.layers.html#chomp1d', 'tsai/models/layers.py'),
                                     'tsai.models.layers.Chomp1d.__init__': ('models.layers.html#chomp1d.__init__', 'tsai/models/layers.py'),
                                     'tsai.models.layers.Chomp1d.forward': ('models.layers.html#chomp1d.forward', 'tsai/models/layers.py'),
@@ -2654,8 +2844,10 @@ d = { 'settings': { 'branch': 'main',
                                     'tsai.models.layers.View.__init__': ('models.layers.html#view.__init__', 'tsai/models/layers.py'),
                                     'tsai.models.layers.View.__repr__': ('models.layers.html#view.__repr__', 'tsai/models/layers.py'),
                                     'tsai.models.layers.View.forward': ('models.layers.html#view.forward', 'tsai/models/layers.py'),
+                                    'tsai.models.layers._frozen_bn_stats': ('models.layers.html#_frozen_bn_stats', 'tsai/models/layers.py'),
                                     'tsai.models.layers.attentional_pool_head': ( 'models.layers.html#attentional_pool_head',
                                                                                   'tsai/models/layers.py'),
+                                    'tsai.models.layers.checkpoint_layer': ('models.layers.html#checkpoint_layer', 'tsai/models/layers.py'),
                                     'tsai.models.layers.create_conv_3d_head': ( 'models.layers.html#create_conv_3d_head',
                                                                                 'tsai/models/layers.py'),
                                     'tsai.models.layers.create_conv_3d_head.__init__': ( 'models.layers.html#create_conv_3d_head.__init__',
@@ -2724,8 +2916,12 @@ d = { 'settings': { 'branch': 'main',
                                                                                'tsai/models/multimodal.py'),
                                         'tsai.models.multimodal.Embeddings.__init__': ( 'models.multimodal.html#embeddings.__init__',
                                                                                         'tsai/models/multimodal.py'),
+                                        'tsai.models.multimodal.Embeddings._load_from_state_dict': ( 'models.multimodal.html#embeddings._load_from_state_dict',
+                                                                                                     'tsai/models/multimodal.py'),
                                         'tsai.models.multimodal.Embeddings.forward': ( 'models.multimodal.html#embeddings.forward',
                                                                                        'tsai/models/multimodal.py'),
+                                        'tsai.models.multimodal.Embeddings.reset_parameters': ( 'models.multimodal.html#embeddings.reset_parameters',
+                                                                                                'tsai/models/multimodal.py'),
                                         'tsai.models.multimodal.FusionMLP': ( 'models.multimodal.html#fusionmlp',
                                                                               'tsai/models/multimodal.py'),
                                         'tsai.models.multimodal.FusionMLP.__init__': ( 'models.multimodal.html#fusionmlp.__init__',
@@ -2770,7 +2966,25 @@ d = { 'settings': { 'branch': 'main',
                                                  'tsai.models.positional_encoders.PositionalEncoding': ( 'models.positional_encoders.html#positionalencoding',
                                                                                                          'tsai/models/positional_encoders.py')},
             'tsai.models.utils': { 'tsai.models.utils.SeqTokenizer': ('models.utils.html#seqtokenizer', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._arch_name': ('models.utils.html#_arch_name', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._bench_archs': ('models.utils.html#_bench_archs', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._bn_scale_shift': ('models.utils.html#_bn_scale_shift', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._build_bench_model': ('models.utils.html#_build_bench_model', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._fold_bn': ('models.utils.html#_fold_bn', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._fold_bn_into_next_linear': ( 'models.utils.html#_fold_bn_into_next_linear',
+                                                                                    'tsai/models/utils.py'),
+                                   'tsai.models.utils._fusable_conv': ('models.utils.html#_fusable_conv', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._fuse_inception_module': ( 'models.utils.html#_fuse_inception_module',
+                                                                                 'tsai/models/utils.py'),
+                                   'tsai.models.utils._fuse_sequential': ('models.utils.html#_fuse_sequential', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._is_bn_eval': ('models.utils.html#_is_bn_eval', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._is_noop': ('models.utils.html#_is_noop', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._merge_convs': ('models.utils.html#_merge_convs', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._peak_memory': ('models.utils.html#_peak_memory', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._set_weight_bias': ('models.utils.html#_set_weight_bias', 'tsai/models/utils.py'),
+                                   'tsai.models.utils._single_conv': ('models.utils.html#_single_conv', 'tsai/models/utils.py'),
                                    'tsai.models.utils.apply_idxs': ('models.utils.html#apply_idxs', 'tsai/models/utils.py'),
+                                   'tsai.models.utils.benchmark_models': ('models.utils.html#benchmark_models', 'tsai/models/utils.py'),
                                    'tsai.models.utils.build_tabular_model': ( 'models.utils.html#build_tabular_model',
                                                                               'tsai/models/utils.py'),
                                    'tsai.models.utils.build_ts_model': ('models.utils.html#build_ts_model', 'tsai/models/utils.py'),
@@ -2779,7 +2993,9 @@ d = { 'settings': { 'branch': 'main',
                                    'tsai.models.utils.change_model_head': ('models.utils.html#change_model_head', 'tsai/models/utils.py'),
                                    'tsai.models.utils.check_bias': ('models.utils.html#check_bias', 'tsai/models/utils.py'),
                                    'tsai.models.utils.check_weight': ('models.utils.html#check_weight', 'tsai/models/utils.py'),
+                                   'tsai.models.utils.compare_benchmarks': ('models.utils.html#compare_benchmarks', 'tsai/models/utils.py'),
                                    'tsai.models.utils.count_parameters': ('models.utils.html#count_parameters', 'tsai/models/utils.py'),
+                                   'tsai.models.utils.fuse_for_inference': ('models.utils.html#fuse_for_inference', 'tsai/models/utils.py'),
                                    'tsai.models.utils.get_clones': ('models.utils.html#get_clones', 'tsai/models/utils.py'),
                                    'tsai.models.utils.get_embed_size': ('models.utils.html#get_embed_size', 'tsai/models/utils.py'),
                                    'tsai.models.utils.get_layers': ('models.utils.html#get_layers', 'tsai/models/utils.py'),
@@ -2801,15 +3017,61 @@ d = { 'settings': { 'branch': 'main',
                                    'tsai.models.utils.true_forecaster': ('models.utils.html#true_forecaster', 'tsai/models/utils.py'),
                                    'tsai.models.utils.ts_splitter': ('models.utils.html#ts_splitter', 'tsai/models/utils.py')},
             'tsai.optimizer': {'tsai.optimizer.wrap_optimizer': ('optimizer.html#wrap_optimizer', 'tsai/optimizer.py')},
-            'tsai.optuna': {'tsai.optuna.run_optuna_study': ('optuna.html#run_optuna_study', 'tsai/optuna.py')},
+            'tsai.optuna': { 'tsai.optuna.OptunaPruningCallback': ('optuna.html#optunapruningcallback', 'tsai/optuna.py'),
+                             'tsai.optuna.OptunaPruningCallback.__init__': ('optuna.html#optunapruningcallback.__init__', 'tsai/optuna.py'),
+                             'tsai.optuna.OptunaPruningCallback.after_epoch': ( 'optuna.html#optunapruningcallback.after_epoch',
+                                                                                'tsai/optuna.py'),
+                             'tsai.optuna.OptunaPruningCallback.before_fit': ( 'optuna.html#optunapruningcallback.before_fit',
+                                                                               'tsai/optuna.py'),
+                             'tsai.optuna._optuna_worker': ('optuna.html#_optuna_worker', 'tsai/optuna.py'),
+                             'tsai.optuna._run_optuna_parallel': ('optuna.html#_run_optuna_parallel', 'tsai/optuna.py'),
+                             'tsai.optuna._share_arrays': ('optuna.html#_share_arrays', 'tsai/optuna.py'),
+                             'tsai.optuna.optuna_cache': ('optuna.html#optuna_cache', 'tsai/optuna.py'),
+                             'tsai.optuna.run_optuna_study': ('optuna.html#run_optuna_study', 'tsai/optuna.py')},
             'tsai.tslearner': { 'tsai.tslearner.TSClassifier': ('tslearner.html#tsclassifier', 'tsai/tslearner.py'),
                                 'tsai.tslearner.TSClassifier.__init__': ('tslearner.html#tsclassifier.__init__', 'tsai/tslearner.py'),
                                 'tsai.tslearner.TSForecaster': ('tslearner.html#tsforecaster', 'tsai/tslearner.py'),
                                 'tsai.tslearner.TSForecaster.__init__': ('tslearner.html#tsforecaster.__init__', 'tsai/tslearner.py'),
                                 'tsai.tslearner.TSRegressor': ('tslearner.html#tsregressor', 'tsai/tslearner.py'),
-                                'tsai.tslearner.TSRegressor.__init__': ('tslearner.html#tsregressor.__init__', 'tsai/tslearner.py')},
+                                'tsai.tslearner.TSRegressor.__init__': ('tslearner.html#tsregressor.__init__', 'tsai/tslearner.py'),
+                                'tsai.tslearner._AllReduceSum': ('tslearner.html#_allreducesum', 'tsai/tslearner.py'),
+                                'tsai.tslearner._AllReduceSum.backward': ('tslearner.html#_allreducesum.backward', 'tsai/tslearner.py'),
+                                'tsai.tslearner._AllReduceSum.forward': ('tslearner.html#_allreducesum.forward', 'tsai/tslearner.py'),
+                                'tsai.tslearner._DistributedTrainer': ('tslearner.html#_distributedtrainer', 'tsai/tslearner.py'),
+                                'tsai.tslearner._DistributedTrainer.__init__': ( 'tslearner.html#_distributedtrainer.__init__',
+                                                                                 'tsai/tslearner.py'),
+                                'tsai.tslearner._DistributedTrainer.after_fit': ( 'tslearner.html#_distributedtrainer.after_fit',
+                                                                                  'tsai/tslearner.py'),
+                                'tsai.tslearner._DistributedTrainer.after_validate': ( 'tslearner.html#_distributedtrainer.after_validate',
+                                                                                       'tsai/tslearner.py'),
+                                'tsai.tslearner._DistributedTrainer.before_fit': ( 'tslearner.html#_distributedtrainer.before_fit',
+                                                                                   'tsai/tslearner.py'),
+                                'tsai.tslearner._SyncBatchNorm': ('tslearner.html#_syncbatchnorm', 'tsai/tslearner.py'),
+                                'tsai.tslearner._SyncBatchNorm._check_input_dim': ( 'tslearner.html#_syncbatchnorm._check_input_dim',
+                                                                                    'tsai/tslearner.py'),
+                                'tsai.tslearner._SyncBatchNorm.forward': ('tslearner.html#_syncbatchnorm.forward', 'tsai/tslearner.py'),
+                                'tsai.tslearner._convert_batchnorm': ('tslearner.html#_convert_batchnorm', 'tsai/tslearner.py'),
+                                'tsai.tslearner._distributed_worker': ('tslearner.html#_distributed_worker', 'tsai/tslearner.py'),
+                                'tsai.tslearner._load_shared_array': ('tslearner.html#_load_shared_array', 'tsai/tslearner.py'),
+                                'tsai.tslearner._reduce_metric': ('tslearner.html#_reduce_metric', 'tsai/tslearner.py'),
+                                'tsai.tslearner._share_array': ('tslearner.html#_share_array', 'tsai/tslearner.py'),
+                                'tsai.tslearner.fit_distributed': ('tslearner.html#fit_distributed', 'tsai/tslearner.py')},
             'tsai.tutorials': {},
-            'tsai.utils': { 'tsai.utils.analyze_array': ('utils.html#analyze_array', 'tsai/utils.py'),
+            'tsai.utils': { 'tsai.utils.ChunkedArray': ('utils.html#chunkedarray', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__array__': ('utils.html#chunkedarray.__array__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__getitem__': ('utils.html#chunkedarray.__getitem__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__getstate__': ('utils.html#chunkedarray.__getstate__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__init__': ('utils.html#chunkedarray.__init__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__len__': ('utils.html#chunkedarray.__len__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__repr__': ('utils.html#chunkedarray.__repr__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.__setstate__': ('utils.html#chunkedarray.__setstate__', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray._get_chunks': ('utils.html#chunkedarray._get_chunks', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray._read_chunk': ('utils.html#chunkedarray._read_chunk', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.nbytes': ('utils.html#chunkedarray.nbytes', 'tsai/utils.py'),
+                            'tsai.utils.ChunkedArray.ndim': ('utils.html#chunkedarray.ndim', 'tsai/utils.py'),
+                            'tsai.utils._assign_chunk': ('utils.html#_assign_chunk', 'tsai/utils.py'),
+                            'tsai.utils._chunked_filename': ('utils.html#_chunked_filename', 'tsai/utils.py'),
+                            'tsai.utils.analyze_array': ('utils.html#analyze_array', 'tsai/utils.py'),
                             'tsai.utils.analyze_feature': ('utils.html#analyze_feature', 'tsai/utils.py'),
                             'tsai.utils.apply_cmap': ('utils.html#apply_cmap', 'tsai/utils.py'),
                             'tsai.utils.array2digits': ('utils.html#array2digits', 'tsai/utils.py'),
@@ -2823,6 +3085,7 @@ d = { 'settings': { 'branch': 'main',
                             'tsai.utils.chunks_calculator': ('utils.html#chunks_calculator', 'tsai/utils.py'),
                             'tsai.utils.clip_outliers': ('utils.html#clip_outliers', 'tsai/utils.py'),
                             'tsai.utils.cls_name': ('utils.html#cls_name', 'tsai/utils.py'),
+                            'tsai.utils.compact_idxs': ('utils.html#compact_idxs', 'tsai/utils.py'),
                             'tsai.utils.concat': ('utils.html#concat', 'tsai/utils.py'),
                             'tsai.utils.create_array': ('utils.html#create_array', 'tsai/utils.py'),
                             'tsai.utils.create_dir': ('utils.html#create_dir', 'tsai/utils.py'),
@@ -2889,7 +3152,9 @@ d = { 'settings': { 'branch': 'main',
                             'tsai.utils.named_partial.__init__': ('utils.html#named_partial.__init__', 'tsai/utils.py'),
                             'tsai.utils.named_partial.__repr__': ('utils.html#named_partial.__repr__', 'tsai/utils.py'),
                             'tsai.utils.np2memmap': ('utils.html#np2memmap', 'tsai/utils.py'),
+                            'tsai.utils.np_load_chunked': ('utils.html#np_load_chunked', 'tsai/utils.py'),
                             'tsai.utils.np_load_compressed': ('utils.html#np_load_compressed', 'tsai/utils.py'),
+                            'tsai.utils.np_save_chunked': ('utils.html#np_save_chunked', 'tsai/utils.py'),
                             'tsai.utils.np_save_compressed': ('utils.html#np_save_compressed', 'tsai/utils.py'),
                             'tsai.utils.npsave': ('utils.html#npsave', 'tsai/utils.py'),
                             'tsai.utils.pad_sequences': ('utils.html#pad_sequences', 'tsai/utils.py'),
@@ -2909,6 +3174,7 @@ d = { 'settings': { 'branch': 'main',
                             'tsai.utils.random_roll2d': ('utils.html#random_roll2d', 'tsai/utils.py'),
                             'tsai.utils.random_roll3d': ('utils.html#random_roll3d', 'tsai/utils.py'),
                             'tsai.utils.random_shuffle': ('utils.html#random_shuffle', 'tsai/utils.py'),
+                            'tsai.utils.range2slice': ('utils.html#range2slice', 'tsai/utils.py'),
                             'tsai.utils.reduce_memory_usage': ('utils.html#reduce_memory_usage', 'tsai/utils.py'),
                             'tsai.utils.remove_dir': ('utils.html#remove_dir', 'tsai/utils.py'),
                             'tsai.utils.remove_fn': ('utils.html#remove_fn', 'tsai/utils.py'),
@@ -2932,6 +3198,7 @@ d = { 'settings': { 'branch': 'main',
                             'tsai.utils.str2callable': ('utils.html#str2callable', 'tsai/utils.py'),
                             'tsai.utils.str2index': ('utils.html#str2index', 'tsai/utils.py'),
                             'tsai.utils.str2list': ('utils.html#str2list', 'tsai/utils.py'),
+                            'tsai.utils.take_idxs': ('utils.html#take_idxs', 'tsai/utils.py'),
                             'tsai.utils.test_eq_nan': ('utils.html#test_eq_nan', 'tsai/utils.py'),
                             'tsai.utils.test_error': ('utils.html#test_error', 'tsai/utils.py'),
                             'tsai.utils.test_ge': ('utils.html#test_ge', 'tsai/utils.py'),
@@ -2942,6 +3209,7 @@ d = { 'settings': { 'branch': 'main',
                             'tsai.utils.test_not_ok': ('utils.html#test_not_ok', 'tsai/utils.py'),
                             'tsai.utils.test_ok': ('utils.html#test_ok', 'tsai/utils.py'),
                             'tsai.utils.test_type': ('utils.html#test_type', 'tsai/utils.py'),
+                            'tsai.utils.time_fn': ('utils.html#time_fn', 'tsai/utils.py'),
                             'tsai.utils.to1d': ('utils.html#to1d', 'tsai/utils.py'),
                             'tsai.utils.to1darray': ('utils.html#to1darray', 'tsai/utils.py'),
                             'tsai.utils.to1dtensor': ('utils.html#to1dtensor', 'tsai/utils.py'),
@@ -156,7 +156,7 @@ def feature_importance(self:Learner,
     # X, y
     if X is None:
         X = self.dls.train.dataset.tls[0].items
-        if hasattr(self.dls.train.dataset.tls[0], '_splits'): X = X[self.dls.train.dataset.tls[0]._splits]
+        if hasattr(self.dls.train.dataset.tls[0], '_splits'): X = X[range2slice(self.dls.train.dataset.tls[0]._splits)]
     if y is None:
         y = self.dls.train.dataset.tls[1].items
     if partial_n is not None:
@@ -329,7 +329,7 @@ def step_importance(
     # X, y
     if X is None:
         X = self.dls.train.dataset.tls[0].items
-        if hasattr(self.dls.train.dataset.tls[0], '_splits'): X = X[self.dls.train.dataset.tls[0]._splits]
+        if hasattr(self.dls.train.dataset.tls[0], '_splits'): X = X[range2slice(self.dls.train.dataset.tls[0]._splits)]
     if y is None:
         y = self.dls.train.dataset.tls[1].items
     if partial_n is not None:
@@ -1,7 +1,8 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/021_calibration.ipynb.
 
 # %% auto 0
-__all__ = ['ModelWithTemperature', 'TemperatureSetter', 'ECELoss', 'plot_calibration_curve']
+__all__ = ['ModelWithTemperature', 'TemperatureSetter', 'ECELoss', 'CalibrationStats', 'plot_calibration_curve',
+           'plot_reliability_diagram']
 
 # %% ../nbs/021_calibration.ipynb 3
 from .imports import *
@@ -29,23 +30,66 @@ class ModelWithTemperature(nn.Module):
 class TemperatureSetter(nn.Module):
     """ Calibrates a binary classification model optimizing temperature """
 
-    def __init__(self, model, lr=0.01, max_iter=1_000, line_search_fn=None, n_bins=10, verbose=True):
+    def __init__(self, model, lr=0.01, max_iter=1_000, line_search_fn=None, n_bins=10, verbose=True, method='lbfgs', max_samples=None, 
+                 temperatures=None):
+        """
+        method: 'lbfgs' optimizes the temperature with LBFGS on the logits. All logits are kept unless `max_samples` is set, 
+            in which case a uniform reservoir sample of at most `max_samples` logits is used.
+            'grid' selects the temperature with the lowest NLL among `temperatures` (default: 201 values between 0.1 and 10) 
+            using statistics accumulated batch by batch, so no logits are stored.
+        """
         super().__init__()
+        assert method in ['lbfgs', 'grid'], "method must be 'lbfgs' or 'grid'"
         self.model = ModelWithTemperature(model) if not hasattr(model, 'temperature_scale') else model
         self.lr, self.max_iter, self.line_search_fn, self.n_bins, self.verbose = lr, max_iter, line_search_fn, n_bins, verbose 
+        self.method, self.max_samples = method, max_samples
+        self.temperatures = torch.logspace(-1, 1, 201) if temperatures is None else torch.as_tensor(temperatures, dtype=torch.float)
         self.nll_criterion = CrossEntropyLossFlat()
         self.ece_criterion = ECELoss(n_bins)
 
+    def _update_reservoir(self, logits, labels):
+        "Keeps a uniform sample of at most `max_samples` logits and labels (reservoir sampling)"
+        logits, labels = logits.detach().cpu(), labels.detach().cpu()
+        if self._reservoir is None:
+            self._reservoir = (logits[:self.max_samples], labels[:self.max_samples])
+            logits, labels, start = logits[self.max_samples:], labels[self.max_samples:], len(self._reservoir[0])
+            self._seen = start
+        elif len(self._reservoir[0]) < self.max_samples:
+            n = min(self.max_samples - len(self._reservoir[0]), len(logits))
+            self._reservoir = (torch.cat([self._reservoir[0], logits[:n]]), torch.cat([self._reservoir[1], labels[:n]]))
+            logits, labels = logits[n:], labels[n:]
+            self._seen += n
+        if not len(logits): return
+        # item t (0-based) replaces a random slot with probability max_samples / (t + 1). If a slot is selected more than once, the last 
+        # item wins, as when items are processed one at a time.
+        slots = (torch.rand(len(logits)) * (self._seen + 1 + torch.arange(len(logits)))).long()
+        keep = slots < self.max_samples
+        slots, items = slots[keep].numpy(), torch.arange(len(logits))[keep].numpy()
+        _, last = np.unique(slots[::-1], return_index=True)
+        slots, items = slots[::-1][last], items[::-1][last]
+        self._reservoir[0][slots], self._reservoir[1][slots] = logits[items], labels[items]
+        self._seen += len(logits)
+
     def forward(self, dl):
+        if self.method == 'grid': return self._grid_forward(dl)
         logits_list = []
         labels_list = []
+        self._reservoir = None
         with torch.no_grad():
             for input, label in dl:
                 logits = self.model(input)
-                logits_list.append(logits)
-                labels_list.append(label)
-            logits = torch.cat(logits_list)
-            labels = torch.cat(labels_list)
+                if self.max_samples is None:
+                    logits_list.append(logits)
+                    labels_list.append(label)
+                else:
+                    self._update_reservoir(logits, label)
+            if self.max_samples is None:
+                logits = torch.cat(logits_list)
+                labels = torch.cat(labels_list)
+            else:
+                logits, labels = self._reservoir
+                self._reservoir = None
+                pv(f'Using a sample of {len(logits)} logits', self.verbose)
 
         if self.verbose:
             before_temperature_nll = self.nll_criterion(logits, labels).item()
@@ -76,6 +120,23 @@ class TemperatureSetter(nn.Module):
         self.calibrated_model = self.model
         return self.calibrated_model
 
+    def _grid_forward(self, dl):
+        stats = CalibrationStats(self.n_bins, temperatures=torch.cat([torch.ones(1), self.temperatures]))
+        with torch.no_grad():
+            for input, label in dl:
+                stats.update(self.model(input), label)
+        nll, ece = stats.nll, stats.ece
+        best = nll[1:].argmin().item() + 1
+        self.model.temperature.data.fill_(stats.temperatures[best].item())
+        if self.verbose:
+            print(f'Before temperature - NLL: {nll[0]:.3f}, ECE: {ece[0]:.3f}')
+            print(f'Optimal temperature: {self.model.temperature.item():.3f}')
+            print(f'After temperature  - NLL: {nll[best]:.3f}, ECE: {ece[best]:.3f}\n')
+        self.stats = stats[[0, best]]
+        self.logits = self.scaled_logits = self.labels = None
+        self.calibrated_model = self.model
+        return self.calibrated_model
+
 
 class ECELoss(nn.Module):
     """Calculates the Expected Calibration Error of a model."""
@@ -104,6 +165,66 @@ class ECELoss(nn.Module):
         return ece
 
 # %% ../nbs/021_calibration.ipynb 5
+class CalibrationStats():
+    """Accumulates per-bin counts, confidences and accuracies (and the NLL) across batches for one or more temperatures.
+    It allows to calculate the ECE and reliability diagrams in constant memory."""
+    def __init__(self, n_bins=10, temperatures=None):
+        self.n_bins = n_bins
+        self.temperatures = torch.ones(1) if temperatures is None else torch.as_tensor(temperatures, dtype=torch.float).reshape(-1)
+        self.reset()
+
+    def reset(self):
+        self.counts = self.conf_sums = self.acc_sums = self.nll_sum = None
+        self.n = 0
+
+    def update(self, logits, labels, max_elements=2**24):
+        logits, labels = logits.detach().as_subclass(Tensor).float(), labels.detach().as_subclass(Tensor).reshape(-1).long()
+        n_temps, device = len(self.temperatures), logits.device
+        if self.counts is None:
+            self.counts, self.conf_sums, self.acc_sums = [torch.zeros(n_temps, self.n_bins, dtype=torch.float64, device=device) for _ in range(3)]
+            self.nll_sum = torch.zeros(n_temps, dtype=torch.float64, device=device)
+        boundaries = torch.linspace(0, 1, self.n_bins + 1, device=device)[1:-1]
+        temperatures = self.temperatures.to(device)
+        # temperatures are processed in groups to limit the size of the scaled logits
+        step = max(1, max_elements // max(1, logits.numel()))
+        for i in range(0, n_temps, step):
+            T = temperatures[i:i + step]
+            log_probs = (logits[None] / T.view(-1, 1, 1)).log_softmax(-1)
+            confidences, predictions = log_probs.max(-1)
+            confidences = confidences.exp().double()
+            bins = (torch.bucketize(confidences, boundaries) + torch.arange(len(T), device=device).view(-1, 1) * self.n_bins).flatten()
+            size = len(T) * self.n_bins
+            self.counts[i:i + step] += torch.bincount(bins, minlength=size).view(len(T), -1)
+            self.conf_sums[i:i + step] += torch.bincount(bins, weights=confidences.flatten(), minlength=size).view(len(T), -1)
+            self.acc_sums[i:i + step] += torch.bincount(bins, weights=(predictions == labels).double().flatten(), minlength=size).view(len(T), -1)
+            self.nll_sum[i:i + step] -= log_probs.gather(-1, labels.view(1, -1, 1).expand(len(T), -1, 1)).squeeze(-1).double().sum(-1)
+        self.n += len(labels)
+        return self
+
+    @property
+    def ece(self):
+        "Expected Calibration Error for each temperature"
+        return (self.conf_sums - self.acc_sums).abs().sum(-1).cpu() / max(1, self.n)
+    @property
+    def nll(self): 
+        "Negative log likelihood for each temperature"
+        return self.nll_sum.cpu() / max(1, self.n)
+
+    def reliability(self):
+        "Returns the mean confidence, accuracy and number of samples in each bin (nan for empty bins)"
+        counts = self.counts.cpu()
+        return self.conf_sums.cpu() / counts, self.acc_sums.cpu() / counts, counts
+
+    def __getitem__(self, idxs):
+        "Returns the statistics for the selected temperatures"
+        idxs = listify(idxs)
+        out = self.__class__(self.n_bins, self.temperatures[idxs])
+        if self.counts is not None:
+            out.counts, out.conf_sums, out.acc_sums, out.nll_sum = self.counts[idxs], self.conf_sums[idxs], self.acc_sums[idxs], self.nll_sum[idxs]
+        out.n = self.n
+        return out
+
+# %% ../nbs/021_calibration.ipynb 6
 def plot_calibration_curve(labels, logits, cal_logits=None, figsize=(6,6), n_bins=10, strategy='uniform'):
     y_true = labels.cpu().numpy()
     pos_probas = F.softmax(logits, dim=1)[:, 1].detach().cpu().numpy()
@@ -132,16 +253,41 @@ def plot_calibration_curve(labels, logits, cal_logits=None, figsize=(6,6), n_bin
     plt.legend(loc='best')
     plt.show()
 
-# %% ../nbs/021_calibration.ipynb 6
+# %% ../nbs/021_calibration.ipynb 7
+def plot_reliability_diagram(stats, labels=None, figsize=(6,6)):
+    "Plots accuracy vs confidence in each bin of a `CalibrationStats` object (one line per temperature)"
+    confidences, accuracies, counts = stats.reliability()
+    labels = ifnone(labels, [f'T={t:.3f}' for t in stats.temperatures.tolist()])
+    colors = ['orange', 'purple'] + [None] * len(labels)
+    fig, ax = plt.subplots(figsize=figsize)
+    fig.suptitle("Reliability diagram", fontsize=16)
+    for i in range(len(labels)):
+        in_bin = counts[i] > 0
+        ax.plot(confidences[i][in_bin], accuracies[i][in_bin], marker="o", linewidth=1, color=colors[i], label=labels[i])
+    ax.plot([0, 1], [0, 1], transform=ax.transAxes, color='gray', lw=1)
+    ax.set_xlabel("Confidence", fontsize=12)
+    ax.set_ylabel("Accuracy in each bin", fontsize=12)
+    ax.set_xticks(np.linspace(0,1,11))
+    ax.set_yticks(np.linspace(0,1,11))
+    ax.set_xlim(0,1)
+    ax.set_ylim(0,1)
+    plt.title(" - ".join([f"{l} ECE: {e:.3f}" for l,e in zip(labels, stats.ece.tolist())]))
+    plt.legend(loc='best')
+    plt.show()
+
+# %% ../nbs/021_calibration.ipynb 8
 @patch
 def calibrate_model(self:Learner, X=None, y=None, lr=1e-2, max_iter=10_000, line_search_fn=None, n_bins=10, strategy='uniform', 
-                    show_plot=True, figsize=(6,6), verbose=True):
+                    show_plot=True, figsize=(6,6), verbose=True, method='lbfgs', max_samples=None, temperatures=None):
     if X is not None and y is not None: 
         dl = self.dls.valid.new_dl(X, y)
     else: 
         dl = self.dls.valid
     assert dl.c == 2, "calibrate_model is only available for binary classification tasks"
-    temp_setter = TemperatureSetter(self.model, lr=lr, max_iter=max_iter, line_search_fn=line_search_fn, n_bins=n_bins, verbose=verbose)
+    temp_setter = TemperatureSetter(self.model, lr=lr, max_iter=max_iter, line_search_fn=line_search_fn, n_bins=n_bins, verbose=verbose, 
+                                    method=method, max_samples=max_samples, temperatures=temperatures)
     self.calibrated_model = temp_setter(dl)
-    if show_plot:
+    if show_plot and temp_setter.logits is None:
+        plot_reliability_diagram(temp_setter.stats, labels=['probas', 'calibrated probas'], figsize=figsize)
+    elif show_plot:
         plot_calibration_curve(temp_setter.labels, temp_setter.logits, temp_setter.scaled_logits, n_bins=n_bins, strategy=strategy, figsize=figsize)
@@ -12,7 +12,7 @@ class PredictionDynamics(Callback):
     order, run_valid = 65, True
 
     def __init__(self, show_perc=1., figsize=(10,6), alpha=.3, size=30, color='lime', cmap='gist_rainbow', normalize=False, 
-                 sensitivity=None, specificity=None):
+                 sensitivity=None, specificity=None, plot_every=1):
 
         """
         Args:
@@ -27,8 +27,13 @@ class PredictionDynamics(Callback):
             sensitivity: (aka recall or True Positive Rate) if you pass a float between 0. and 1. the sensitivity threshold will be plotted in the chart.
                          Only used in binary classification.
             specificity: (or True Negative Rate) if you pass a float between 0. and 1. it will be plotted in the chart. Only used in binary classification.
+            plot_every:  number of epochs between chart updates (the last epoch is always plotted). Predictions are only recorded in 
+                         epochs that are plotted.
 
         The red line in classification tasks indicate the average probability of true class.
+
+        Predictions of the selected validation samples are recorded in a buffer preallocated on the device, and only transferred to 
+        the cpu when the chart is updated.
         """
 
         store_attr()
@@ -40,47 +45,64 @@ class PredictionDynamics(Callback):
         self.cat = True if (hasattr(self.dls, "c") and self.dls.c > 1) else False
         if self.cat:
             self.binary = self.dls.c == 2
+        valid_size = len(self.dls.valid.dataset)
+        # position of each validation sample in the buffers (samples that are not displayed go to an extra, discarded, position)
         if self.show_perc != 1:
-            valid_size = len(self.dls.valid.dataset)
-            self.show_idxs = random_choice(valid_size, int(round(self.show_perc * valid_size)), replace=False)
-
-        # Prepare ground truth container
-        self.y_true = []
+            self.show_idxs = np.sort(np.random.choice(valid_size, int(round(self.show_perc * valid_size)), replace=False))
+            n_show = len(self.show_idxs)
+            dest = np.full(valid_size, n_show)
+            dest[self.show_idxs] = np.arange(n_show)
+        else:
+            n_show, dest = valid_size, np.arange(valid_size)
+        self._n_show = n_show
+        self._dest = torch.as_tensor(dest, device=self.dls.device)
+        self._y_true_buf = self._y_pred_buf = None
 
     def before_epoch(self):
-        # Prepare empty pred container in every epoch
-        self.y_pred = []
+        self._pos = 0
+        self._record = self.run and (self.epoch == 0 or self._plot_epoch())
+
+    def _plot_epoch(self): return (self.epoch + 1) % self.plot_every == 0 or self.epoch == self.n_epoch - 1
 
     def after_pred(self):
-        if self.training:
+        if self.training or not self._record:
             return
 
-        # Get y_true in epoch 0
-        if self.epoch == 0:
-            self.y_true.extend(self.y.cpu().flatten().numpy())
-
-        # Gather y_pred for every batch
+        # Get y_pred for every batch (without leaving the device)
         if self.cat:
             if self.binary:
-                y_pred = F.softmax(self.pred, -1)[:, 1].reshape(-1, 1).cpu()
+                y_pred = F.softmax(self.pred, -1)[:, 1]
             else:
-                y_pred = torch.gather(F.softmax(self.pred, -1), -1, self.y.reshape(-1, 1).long()).cpu()
+                y_pred = torch.gather(F.softmax(self.pred, -1), -1, self.y.reshape(-1, 1).long())
         else:
-            y_pred = self.pred.cpu()
-        self.y_pred.extend(y_pred.flatten().numpy())
+            y_pred = self.pred
+        bs = len(y_pred)
+        y_pred = y_pred.detach().reshape(bs, -1)
+        if self._y_pred_buf is None:
+            self._y_pred_buf = torch.empty(self._n_show + 1, y_pred.shape[1], dtype=y_pred.dtype, device=y_pred.device)
+            self._y_true_buf = torch.empty(self._n_show + 1, self.y[0].numel(), dtype=self.y.dtype, device=y_pred.device)
+        dest = self._dest[self._pos:self._pos + bs].to(y_pred.device)
+        self._y_pred_buf.index_copy_(0, dest, y_pred.to(self._y_pred_buf.dtype))
+
+        # Get y_true in epoch 0
+        if self.epoch == 0:
+            self._y_true_buf.index_copy_(0, dest, self.y.detach().reshape(bs, -1).to(self._y_true_buf.dtype))
+        self._pos += bs
 
     def after_epoch(self):
+        if not self._record or self._y_pred_buf is None:
+            return
+        
         # Ground truth
         if self.epoch == 0:
-            self.y_true = np.array(self.y_true)
-            if self.show_perc != 1:
-                self.y_true = self.y_true[self.show_idxs]
+            self.y_true = self._y_true_buf[:self._n_show].cpu().flatten().numpy()
             self.y_bounds = (np.min(self.y_true), np.max(self.y_true))
             self.min_x_bounds, self.max_x_bounds = np.min(self.y_true), np.max(self.y_true)
+            self._y_true_buf = None
+            if not self._plot_epoch():
+                return
 
-        self.y_pred = np.array(self.y_pred)
-        if self.show_perc != 1:
-            self.y_pred = self.y_pred[self.show_idxs]
+        self.y_pred = self._y_pred_buf[:self._n_show].cpu().flatten().numpy()
         if self.cat:
             neg_thr = None
             pos_thr = None
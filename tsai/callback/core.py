@@ -2,7 +2,7 @@
 
 # %% auto 0
 __all__ = ['ShowGraphCallback2', 'TransformScheduler', 'ShowGraph', 'SaveModel', 'get_lds_kernel_window', 'prepare_LDS_weights',
-           'WeightedPerSampleLoss', 'BatchSubsampler']
+           'WeightedPerSampleLoss', 'BatchSubsampler', 'TrainingProfiler', 'AutocastMixedPrecision']
 
 # %% ../../nbs/024_callback.core.ipynb 3
 from fastai.callback.all import *
@@ -306,3 +306,146 @@ class BatchSubsampler(Callback):
             self.learn.xb = tuple(xbi[...,idxs] for xbi in self.learn.xb)
             if self.update_y:
                 self.learn.yb = tuple(ybi[...,idxs] for ybi in self.learn.yb)
+
+# %% ../../nbs/024_callback.core.ipynb 26
+class _TimedTransform(GetAttr):
+    "Wraps a batch transform to accumulate the time spent applying it"
+    _default = 'tfm'
+    def __init__(self, tfm, name, times): self.__dict__.update(tfm=tfm, name=name, times=times)
+    def __setattr__(self, k, v): setattr(self.tfm, k, v) # attributes (like `magnitude`) are set on the wrapped transform
+    def __call__(self, x, **kwargs):
+        start = time.perf_counter()
+        x = self.tfm(x, **kwargs)
+        self.times[self.name] = self.times.get(self.name, 0) + time.perf_counter() - start
+        return x
+
+
+class TrainingProfiler(Callback):
+    """Callback that breaks down the time of each batch into data loading, batch_tfms, forward, loss, backward and optimizer step.
+
+    Args:
+    ====
+
+    percentiles:    percentiles of the per-batch times reported by `summary`.
+    trace_steps:    if set, `torch.profiler` is run on this number of training steps and a chrome trace is saved to `trace_path`.
+    trace_path:     path to the trace file (it can be opened in chrome://tracing or https://ui.perfetto.dev).
+    trace_wait:     number of training steps skipped before the profiler starts (the first steps are usually slower).
+    show:           prints the summary at the end of training.
+    """
+    order = -10 # timestamps are taken before other callbacks run
+
+    def __init__(self, percentiles:tuple=(50, 90, 99), trace_steps:Optional[int]=None, trace_path:str='profiler_trace.json',
+                 trace_wait:int=1, show:bool=False):
+        store_attr()
+
+    def _now(self):
+        if self.sync: torch.cuda.synchronize()
+        return time.perf_counter()
+
+    def before_fit(self):
+        self.run = not hasattr(self, "gather_preds") and not hasattr(self.learn, "lr_finder")
+        if not self.run: return
+        self.sync = self.dls.device is not None and torch.device(self.dls.device).type == 'cuda'
+        self.records, self._tfm_times, self._pipelines = [], {}, []
+        for dl in self.dls.loaders:
+            fs, names = dl.after_batch.fs, [type(f).__name__ for f in dl.after_batch.fs]
+            names = [n if names.count(n) == 1 else f'{n}_{names[:i].count(n)}' for i, n in enumerate(names)]
+            self._pipelines.append((dl.after_batch, fs))
+            dl.after_batch.fs = L(_TimedTransform(f, n, self._tfm_times) for f, n in zip(fs, names))
+        self.prof = None
+        if self.trace_steps:
+            def _save_trace(prof): prof.export_chrome_trace(str(self.trace_path))
+            self.prof = torch.profiler.profile(schedule=torch.profiler.schedule(wait=self.trace_wait, warmup=1, active=self.trace_steps),
+                                               on_trace_ready=_save_trace)
+            self.prof.start()
+
+    def _reset(self):
+        self._tfm_times.clear()
+        self._t = self._last = self._now()
+        self._marks = {}
+
+    def before_train(self):    self._reset()
+    def before_validate(self): self._reset()
+
+    def _mark(self, name):
+        t = self._now()
+        self._marks[name] = t - self._last
+        self._last = t
+
+    def before_batch(self):     self._mark('data')
+    def after_pred(self):       self._mark('forward')
+    def after_loss(self):       self._mark('loss')
+    def after_backward(self):   self._mark('backward')
+    def after_step(self):       self._mark('step')
+
+    def after_batch(self):
+        self._mark('other')
+        rec = {'epoch': self.epoch, 'phase': 'train' if self.training else 'valid', 'iter': self.iter}
+        tfm_times = dict(self._tfm_times)
+        batch_tfms = sum(tfm_times.values())
+        # batch_tfms are applied by the dataloader, so their time is part of the time waiting for the batch
+        rec['data'] = self._marks.get('data', 0) - batch_tfms
+        rec['batch_tfms'] = batch_tfms
+        for k in ['forward', 'loss', 'backward', 'step', 'other']: rec[k] = self._marks.get(k, np.nan)
+        rec['total'] = self._last - self._t
+        rec.update({f'tfm_{k}': v for k, v in tfm_times.items()})
+        self.records.append(rec)
+        self._tfm_times.clear()
+        self._marks, self._t = {}, self._last
+        if self.prof is not None and self.training: self.prof.step()
+
+    def after_fit(self):
+        if not getattr(self, 'run', False): return
+        for pipeline, fs in self._pipelines: pipeline.fs = fs
+        if self.prof is not None:
+            self.prof.stop()
+            self.prof = None
+        if self.show: display(self.summary())
+
+    @property
+    def times(self) -> pd.DataFrame:
+        "Time (seconds) per batch and step"
+        return pd.DataFrame(self.records)
+
+    def summary(self, by_epoch:bool=True) -> pd.DataFrame:
+        "Mean, total, % of the batch time and percentiles (ms) of each step per epoch and phase"
+        df = self.times
+        steps = [c for c in df.columns if c not in ['epoch', 'phase', 'iter', 'total']] + ['total']
+        keys = ['epoch', 'phase'] if by_epoch else ['phase']
+        out = []
+        for k, g in df.groupby(keys):
+            for s in steps:
+                v = g[s].dropna().values * 1000
+                if not len(v): continue
+                row = dict(zip(keys, k if is_listy(k) else [k]))
+                row.update({'step': s, 'mean_ms': v.mean(), 'total_s': v.sum() / 1000, 'pct': v.sum() / (g['total'].sum() * 1000) * 100})
+                row.update({f'p{p}_ms': np.percentile(v, p) for p in self.percentiles})
+                out.append(row)
+        return pd.DataFrame(out)
+
+# %% ../../nbs/024_callback.core.ipynb 30
+class AutocastMixedPrecision(Callback):
+    """Callback that runs the forward pass and the loss with `torch.autocast` (bfloat16 by default) on the device where data is.
+
+    Unlike fastai's `MixedPrecision` (CUDA only), it can be used on CPU. bfloat16 has the same range as float32, so there's no need to 
+    scale the loss. Weights, gradients and optimizer states are kept in float32. Predictions are cast back to float32.
+    """
+    order = 10
+
+    def __init__(self, dtype:torch.dtype=torch.bfloat16): 
+        store_attr()
+        self.autocast = None
+
+    def before_batch(self):
+        device_type = self.x.device.type if isinstance(self.x, torch.Tensor) else torch.device(ifnone(self.dls.device, 'cpu')).type
+        self.autocast = torch.autocast(device_type=device_type, dtype=self.dtype)
+        self.autocast.__enter__()
+
+    def after_pred(self): self.learn.pred = to_float(self.pred)
+    def after_loss(self): self._exit()
+    def after_batch(self): self._exit() # in case the batch was cancelled before the loss was calculated
+
+    def _exit(self):
+        if self.autocast is None: return
+        self.autocast.__exit__(None, None, None)
+        self.autocast = None
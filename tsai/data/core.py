@@ -3,11 +3,11 @@
 # %% auto 0
 __all__ = ['TSCategorize', 'TSRegression', 'TSForecasting', 'get_tsimage_dls', 'NumpyTensor', 'ToNumpyTensor', 'TSTensor',
            'ToTSTensor', 'show_tuple', 'TSLabelTensor', 'TSMaskTensor', 'ToFloat', 'ToInt', 'TSClassification',
-           'TSMultiLabelClassification', 'NumpyTensorBlock', 'TSTensorBlock', 'TorchDataset', 'NumpyDataset',
-           'TSDataset', 'NoTfmLists', 'TSTfmdLists', 'NumpyDatasets', 'tscoll_repr', 'TSDatasets', 'add_ds',
-           'NumpyDataLoader', 'TSDataLoader', 'NumpyDataLoaders', 'TSDataLoaders', 'StratifiedSampler', 'get_c',
-           'get_best_dl_params', 'get_best_dls_params', 'get_ts_dls', 'get_ts_dl', 'get_subset_dl',
-           'get_time_per_batch', 'get_dl_percent_per_epoch']
+           'TSToFloat', 'TSMultiLabelClassification', 'NumpyTensorBlock', 'TSTensorBlock', 'TorchDataset',
+           'NumpyDataset', 'TSDataset', 'TSRaggedArray', 'NoTfmLists', 'TSTfmdLists', 'NumpyDatasets', 'tscoll_repr',
+           'TSDatasets', 'add_ds', 'NumpyDataLoader', 'TSDataLoader', 'NumpyDataLoaders', 'TSDataLoaders',
+           'StratifiedSampler', 'LengthBucketSampler', 'get_c', 'get_best_dl_params', 'get_best_dls_params',
+           'get_ts_dls', 'get_ts_dl', 'get_subset_dl', 'get_time_per_batch', 'get_dl_percent_per_epoch']
 
 # %% ../../nbs/006_data.core.ipynb 3
 import warnings
@@ -161,30 +161,67 @@ class ToInt(Transform):
             return TitledTuple(o.cpu().numpy().tolist())
 
 
+def _get_vocab_lookup(vocab):
+    "Returns the sorted vocab keys and their ids, or None if keys can't be sorted"
+    keys = np.asarray(list(vocab.o2i.keys()))
+    ids = np.asarray(list(vocab.o2i.values()), dtype=np.int64)
+    try: order = np.argsort(keys, kind='stable')
+    except TypeError: return None
+    return keys[order], ids[order]
+
+
+def _kind(a): return 'num' if a.dtype.kind in 'biuf' else 'str' if a.dtype.kind in 'US' else a.dtype.kind
+
+
+def _setup_items(dset):
+    "Returns `dset` raw items if no other transform is applied before (faster than iterating the `TfmdLists`)"
+    tfms = getattr(dset, 'tfms', None)
+    if hasattr(dset, 'items') and tfms is not None and not len(tfms.fs): return dset.items
+    return dset
+
+
+def _encode_labels(o, o2i, lookup=None, raise_missing=True):
+    "Maps all labels in `o` to their vocab ids at once (using `np.searchsorted` on the sorted vocab)"
+    o = np.asarray(o)
+    flat = o.ravel()
+    ids = None
+    if lookup is not None and len(flat) and (_kind(flat) == _kind(lookup[0]) or flat.dtype.kind == 'O'):
+        keys, keys_ids = lookup
+        try:
+            pos = np.searchsorted(keys, flat).clip(max=len(keys) - 1)
+            missing = keys[pos] != flat
+            ids = keys_ids[pos]
+        except TypeError: pass
+    if ids is None: # labels that can't be compared to the vocab keys are mapped through the vocab dict
+        missing = np.array([oi not in o2i for oi in flat], dtype=bool)
+        ids = np.array([o2i.get(oi, 0) for oi in flat], dtype=np.int64)
+    if raise_missing and missing.any():
+        diff_str = "', '".join(map(str, np.unique(flat[missing].astype(str))))
+        raise KeyError(f"Labels '{diff_str}' were not included in the training dataset")
+    ids[missing] = 0
+    return ids.reshape(o.shape)
+
+
 class TSClassification(DisplayedTransform):
     "Vectorized, reversible transform of category string to `vocab` id"
     loss_func,order,vectorized=CrossEntropyLossFlat(),1,True
 
-    def __init__(self, vocab=None, sort=True):
+    def __init__(self, vocab=None, sort=True, raise_missing=False):
+        "Labels not in `vocab` are encoded as 0 unless `raise_missing=True` (then a KeyError is raised)"
         if vocab is not None: vocab = CategoryMap(vocab, sort=sort, add_na=False)
         store_attr()
 
     def setups(self, dset):
         if self.vocab is None and dset is not None:
-            dset = np.asarray(dset).flatten()
+            dset = np.asarray(_setup_items(dset)).flatten()
             self.vocab = CategoryMap(dset, sort=self.sort, add_na=False)
         self.c = len(self.vocab)
-        self.vocab_keys = np.array(list(self.vocab.o2i.keys()))[:, None]
+        self._lookup = _get_vocab_lookup(self.vocab)
 
     def encodes(self, o:torch.Tensor): return o
     def encodes(self, o):
-        try:
-            if not hasattr(o, "ndim") or o.ndim <= 1:
-                return TensorCategory((self.vocab_keys == o).argmax(axis=0))
-            else:
-                return TensorCategory((self.vocab_keys == o.flatten()).argmax(axis=0).reshape(*o.shape))
-        except KeyError as e:
-            raise KeyError(f"Label '{o}' was not included in the training dataset") from e
+        if not hasattr(self, '_lookup'): self._lookup = _get_vocab_lookup(self.vocab)
+        return TensorCategory(_encode_labels(np.atleast_1d(o), self.vocab.o2i, self._lookup, getattr(self, 'raise_missing', False)))
     def decodes(self, o):
         if not is_iter(o):
             return Category(self.vocab[o])
@@ -198,37 +235,57 @@ TSCategorize = TSClassification
 TSRegression = ToFloat
 TSForecasting = ToFloat
 
-# %% ../../nbs/006_data.core.ipynb 35
+# %% ../../nbs/006_data.core.ipynb 33
+class TSToFloat(Transform):
+    "Casts half precision (float16 or bfloat16) batches to float32, so that X can be stored in half precision"
+    order = -10 # it's applied before any other batch transform
+    def encodes(self, o:torch.Tensor): return o.float() if o.dtype in (torch.float16, torch.bfloat16) else o
+
+
+def _is_half(o): return str(getattr(o, 'dtype', '')) in ('float16', 'torch.float16', 'torch.bfloat16')
+
+# %% ../../nbs/006_data.core.ipynb 38
 class TSMultiLabelClassification(Categorize):
-    "Reversible combined transform of multi-category strings to one-hot encoded `vocab` id"
-    loss_func,order=BCEWithLogitsLossFlat(),1
+    "Vectorized, reversible combined transform of multi-category strings to one-hot encoded `vocab` id"
+    loss_func,order,vectorized=BCEWithLogitsLossFlat(),1,True
     def __init__(self, c=None, vocab=None, add_na=False, sort=True):
         super().__init__(vocab=vocab,add_na=add_na,sort=sort)
         self.c = c
 
     def setups(self, dsets):
-        if not dsets: return
+        if dsets is None or not len(dsets): return
         if self.vocab is None:
-            vals = set()
-            for b in dsets: vals = vals.union(set(b))
+            vals = set(itertools.chain.from_iterable(_setup_items(dsets)))
             self.vocab = CategoryMap(list(vals), add_na=self.add_na)
-            if self.c is None: self.c = len(self.vocab)
-            if not self.c: warn("Couldn't infer the number of classes, please pass a value for `c` at init")
+        if self.c is None: self.c = len(self.vocab)
+        if not self.c: warn("Couldn't infer the number of classes, please pass a value for `c` at init")
+        self._lookup = _get_vocab_lookup(self.vocab)
+
+    @staticmethod
+    def _is_batch(o):
+        return isinstance(o, np.ndarray) and (o.ndim == 2 or (o.ndim == 1 and o.dtype == object and len(o) > 0 and is_listy(o[0])))
 
     def encodes(self, o:torch.Tensor): return o
     def encodes(self, o):
-        if not all(elem in self.vocab.o2i.keys() for elem in o):
-            diff = [elem for elem in o if elem not in self.vocab.o2i.keys()]
-            diff_str = "', '".join(diff)
-            raise KeyError(f"Labels '{diff_str}' were not included in the training dataset")
-        return TensorMultiCategory(one_hot([self.vocab.o2i[o_] for o_ in o], self.c).float())
+        if not hasattr(self, '_lookup'): self._lookup = _get_vocab_lookup(self.vocab)
+        if not self._is_batch(o):
+            output = torch.zeros(self.c)
+            output[_encode_labels(list(o), self.vocab.o2i, self._lookup)] = 1
+            return TensorMultiCategory(output)
+        # a batch of label lists is encoded at once (CSR style: flat labels + row of each label)
+        lens = np.fromiter(map(len, o), dtype=np.int64, count=len(o)) if o.ndim == 1 else np.full(len(o), o.shape[1])
+        flat = np.array(list(itertools.chain.from_iterable(o)), dtype=object) if o.ndim == 1 else o.ravel()
+        output = torch.zeros(len(o), self.c)
+        if len(flat):
+            output[torch.from_numpy(np.repeat(np.arange(len(o)), lens)), torch.from_numpy(_encode_labels(flat, self.vocab.o2i, self._lookup))] = 1
+        return TensorMultiCategory(output)
     def decodes(self, o):
         if o.ndim == 2:
             return MultiCategory([self.vocab[o_] for o_ in o])
         else:
             return MultiCategory(self.vocab[o])
 
-# %% ../../nbs/006_data.core.ipynb 36
+# %% ../../nbs/006_data.core.ipynb 40
 class NumpyTensorBlock():
     def __init__(self, type_tfms=None, item_tfms=None, batch_tfms=None, dl_type=None, dls_kwargs=None):
         self.type_tfms  =                 L(type_tfms)
@@ -243,7 +300,7 @@ class TSTensorBlock():
         self.batch_tfms =              L(batch_tfms)
         self.dl_type,self.dls_kwargs = dl_type,({} if dls_kwargs is None else dls_kwargs)
 
-# %% ../../nbs/006_data.core.ipynb 38
+# %% ../../nbs/006_data.core.ipynb 42
 class TorchDataset():
     def __init__(self, X, y=None): self.X, self.y = X, y
     def __getitem__(self, idx): return (self.X[idx],) if self.y is None else (self.X[idx], self.y[idx])
@@ -290,10 +347,102 @@ class TSDataset():
         return (X, y)
     def __len__(self): return len(self.X) if self.split is None else len(self.split)
 
-# %% ../../nbs/006_data.core.ipynb 40
+# %% ../../nbs/006_data.core.ipynb 44
+class TSRaggedArray():
+    """Variable length time series stored as a single flat values buffer (total steps x n_vars) plus sample offsets.
+    Indexing returns samples padded to the max length in the selection (optionally with a padding mask as last variable)"""
+    ndim = 3
+    def __init__(self,
+        values:np.ndarray, # 2D array (or memmap) with the concatenated steps of all samples (total steps x n_vars)
+        offsets:np.ndarray, # 1D int array with the start of each sample in values (plus the end of the last one)
+        padding_value:float=np.nan, # Value used for padding.
+        padding:str='post', # 'pre' or 'post' pad either before or after each sequence.
+        padding_mask:bool=False, # If True, a padding mask (1 for padded steps, 0 otherwise) is added as the last variable.
+        ):
+        assert padding in ['pre', 'post']
+        assert values.ndim == 2, "values must be a 2D array (total steps x n_vars)"
+        offsets = np.asarray(offsets, dtype=np.int64)
+        assert offsets[0] == 0 and offsets[-1] == len(values), "offsets must start at 0 and end at len(values)"
+        self.values, self.offsets = values, offsets
+        self.padding_value, self.padding, self.padding_mask = padding_value, padding, padding_mask
+        self.lengths = np.diff(offsets)
+        self.max_len = int(self.lengths.max()) if len(self.lengths) else 0
+
+    @classmethod
+    def from_sequences(cls, o, dtype=None, **kwargs):
+        "Creates a `TSRaggedArray` from an iterable of sequences with shape [n_vars x seq_len] (or [seq_len])"
+        o = [to2darray(oi) for oi in o]
+        values = np.concatenate([oi.T for oi in o])
+        if dtype is not None: values = values.astype(dtype)
+        offsets = np.concatenate([[0], np.cumsum([oi.shape[-1] for oi in o])])
+        return cls(values, offsets, **kwargs)
+
+    def save(self, fname, path='./data', verbose=False):
+        "Saves values and offsets as npy files that can be memory-mapped"
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path/f'{fname}_values.npy', self.values)
+        np.save(path/f'{fname}_offsets.npy', self.offsets)
+        pv(f'ragged array saved to {path/fname}_values.npy and {path/fname}_offsets.npy', verbose)
+
+    @classmethod
+    def load(cls, fname, path='./data', mmap_mode='r', **kwargs):
+        "Loads a `TSRaggedArray` saved with `save` (values are memory-mapped unless mmap_mode=None)"
+        path = Path(path)
+        return cls(np.load(path/f'{fname}_values.npy', mmap_mode=mmap_mode), np.load(path/f'{fname}_offsets.npy'), **kwargs)
+
+    @property
+    def vars(self): return self.values.shape[1] + self.padding_mask
+    @property
+    def shape(self): return (len(self), self.vars, self.max_len)
+    @property
+    def dtype(self): return self.values.dtype
+    @property
+    def nbytes(self): return self.values.nbytes + self.offsets.nbytes
+    def __len__(self): return len(self.lengths)
+    def __array__(self, dtype=None): return self[:] if dtype is None else self[:].astype(dtype)
+    def __repr__(self):
+        return f'{self.__class__.__name__}(samples:{len(self)}, vars:{self.vars}, len:{self.lengths.min() if len(self) else 0}-{self.max_len}, dtype={self.dtype})'
+
+    def __getitem__(self, idx):
+        if isinstance(idx, tuple):
+            output = self[idx[0]]
+            return output[idx[1:]] if isinstance(idx[0], (int, np.integer)) else output[(slice(None),) + idx[1:]]
+        if isinstance(idx, (int, np.integer)): return self[[idx]][0]
+        idxs = np.arange(len(self))[idx]
+        starts, lengths = self.offsets[idxs], self.lengths[idxs]
+        bs, n_vars, max_len = len(idxs), self.values.shape[1], int(lengths.max()) if len(idxs) else 0
+
+        # all steps are gathered at once: row (sample) and step of each value in the output
+        rows = np.repeat(np.arange(bs), lengths)
+        steps = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        values = self.values[np.repeat(starts, lengths) + steps]
+        if self.padding == 'pre': steps += np.repeat(max_len - lengths, lengths)
+
+        output = np.full((bs, n_vars + self.padding_mask, max_len), self.padding_value, dtype=self.dtype)
+        output[rows, :n_vars, steps] = values
+        if self.padding_mask:
+            output[:, -1] = 1
+            output[rows, -1, steps] = 0
+        return output
+
+# %% ../../nbs/006_data.core.ipynb 46
+def _merge_ranges(lst):
+    "Merges a sequence of contiguous ranges into a single range (returns None if not possible)"
+    if not isinstance(lst, (tuple, list, L)) or not len(lst) or not all(isinstance(l, range) and l.step == 1 for l in lst):
+        return None
+    lst = [l for l in lst if len(l)]
+    if not lst: return range(0)
+    if any(l1.stop != l2.start for l1, l2 in zip(lst[:-1], lst[1:])): return None
+    return range(lst[0].start, lst[-1].stop)
+
 def _flatten_list(lst):
     "Flattens a list of lists with splits"
 
+    if isinstance(lst, range): return compact_idxs(lst)
+    merged = _merge_ranges(lst)
+    if merged is not None: return merged
+
     def __flatten_list(lst):
         if lst is None:
             return L([])
@@ -320,23 +469,23 @@ def _flatten_list(lst):
 
     output = __flatten_list(lst)
     if len(output) == 0: return output
-    dtype = smallest_dtype(np.max(output))
-    return np.asarray(output, dtype=dtype)
+    return compact_idxs(output)
 
 def _remove_brackets(l):
     return [li if (not li or not is_listy(li) or len(li) > 1) else li[0] for li in l]
 
 class NoTfmLists(TfmdLists):
     def __init__(self, items, tfms=None, splits=None, split_idx=None, types=None, do_setup=False, **kwargs):
-        self.splits = ifnone(splits, L(np.arange(len(items)).tolist(),[]))
+        self.splits = ifnone(splits, (range(len(items)), L()))
         self._splits = _flatten_list(self.splits)
         store_attr('items,types,split_idx')
         self.tfms = Pipeline(split_idx=split_idx)
     def subset(self, i, **kwargs): return type(self)(self.items, splits=self.splits[i], split_idx=i, do_setup=False, types=self.types,
                                                      **kwargs)
     def __getitem__(self, it):
-        if hasattr(self.items, 'oindex'): return self.items.oindex[self._splits[it]]
-        else: return self.items[self._splits[it]]
+        idxs = range2slice(take_idxs(self._splits, it))
+        if hasattr(self.items, 'oindex'): return self.items.oindex[idxs]
+        else: return self.items[idxs]
     def __len__(self): return len(self._splits)
     def __repr__(self):
         if hasattr(self.items, "shape"):
@@ -352,6 +501,18 @@ class NoTfmLists(TfmdLists):
 NoTfmLists.train, NoTfmLists.valid = add_props(lambda i,x: x.subset(i))
 
 class TSTfmdLists(TfmdLists):
+    def __init__(self, items, tfms, do_setup=True, train_setup=True, splits=None, verbose=False, **kwargs):
+        super().__init__(items, tfms, do_setup=False, train_setup=train_setup, verbose=verbose, **kwargs)
+        # compact splits (ranges and int arrays) are kept as they are instead of being converted to lists of ints
+        if splits is not None: self.splits = L([s if isinstance(s, (range, slice, np.ndarray)) else mask2idxs(s) for s in splits])
+        if do_setup:
+            pv(f"Setting up {self.tfms}", verbose)
+            self.setup(train_setup=train_setup)
+    def _get(self, i):
+        if isinstance(i, range): i = range2slice(i)
+        if isinstance(i, (slice, np.ndarray)) and hasattr(self.items, '__array__'):
+            return self.items.oindex[i] if hasattr(self.items, 'oindex') else self.items[i]
+        return super()._get(i)
     def __getitem__(self, it):
         # res = self._get(it)
         if hasattr(self.items, 'oindex'): res = self.items.oindex[it]
@@ -359,7 +520,7 @@ class TSTfmdLists(TfmdLists):
         if self._after_item is None: return res
         else: return self._after_item(res)
 
-# %% ../../nbs/006_data.core.ipynb 47
+# %% ../../nbs/006_data.core.ipynb 53
 @delegates(Datasets.__init__)
 class NumpyDatasets(Datasets):
     "A dataset that creates tuples from X (and y) and applies `tfms` of type item_tfms"
@@ -435,7 +596,7 @@ def tscoll_repr(c, max_n=10):
     if _len == 0: return coll_repr(c)
     return f'(#{_len}) {L(c[i] for i in range(min(len(c), max_n)))} ...]'
 
-# %% ../../nbs/006_data.core.ipynb 48
+# %% ../../nbs/006_data.core.ipynb 54
 @delegates(Datasets.__init__)
 class TSDatasets(Datasets):
     """A dataset that creates tuples from X (and optionally y) and applies `item_tfms`"""
@@ -448,6 +609,7 @@ class TSDatasets(Datasets):
             if not hasattr(X, '__array__'):
                 X = np.asarray(X)
             X = to3d(X)
+            if isinstance(X, (TSRaggedArray, ChunkedArray)): inplace = False # samples are padded/decompressed when each batch is created
         if y is not None:
             if not hasattr(y, '__array__'):
                 y = np.asarray(y)
@@ -546,7 +708,7 @@ class TSDatasets(Datasets):
 
     def __repr__(self): return tscoll_repr(self)
 
-# %% ../../nbs/006_data.core.ipynb 51
+# %% ../../nbs/006_data.core.ipynb 59
 def add_ds(dsets, X, y=None, inplace=True):
     "Create test datasets from X (and y) using validation transforms of `dsets`"
     items = tuple((X,)) if y is None else tuple((X, y))
@@ -593,7 +755,7 @@ def add_test(self:TSDatasets, X, y=None, inplace=True):
 def add_unlabeled(self:TSDatasets, X, inplace=True):
     return add_ds(self, X, y=None, inplace=inplace)
 
-# %% ../../nbs/006_data.core.ipynb 68
+# %% ../../nbs/006_data.core.ipynb 76
 @patch
 def _one_pass(self:TfmdDL):
     b = self.do_batch([self.do_item(0)])
@@ -602,13 +764,14 @@ def _one_pass(self:TfmdDL):
     self._n_inp = 1 if not isinstance(its, (list,tuple)) or len(its)==1 else len(its)-1
     self._types = explode_types(its)
 
-# %% ../../nbs/006_data.core.ipynb 69
+# %% ../../nbs/006_data.core.ipynb 77
 _batch_tfms = ('after_item','before_batch','after_batch')
 
 @delegates(TfmdDL.__init__)
 class NumpyDataLoader(TfmdDL):
     idxs = None
     do_item = noops # create batch returns indices
+    world_size, rank, dist_seed, dist_epoch = 1, 0, 0, 0 # used to shard the data across processes (see `fit_distributed`)
     def __init__(self, dataset, bs=64, shuffle=False, drop_last=False, num_workers=0, verbose=False, do_setup=True, vocab=None,
                  sort=False, weights=None, partial_n=None, sampler=None, **kwargs):
 
@@ -640,7 +803,7 @@ class NumpyDataLoader(TfmdDL):
         return self.new(ds, bs=min(bs, len(X)))
 
     def create_batch(self, b):
-        if self.shuffle or self.sampler is not None:
+        if self.shuffle or self.sampler is not None or self.world_size > 1:
             if self.sort and hasattr(b, 'sort'): b.sort()
             self.idxs = L(b)
         else:
@@ -651,7 +814,7 @@ class NumpyDataLoader(TfmdDL):
 
             self.idxs = b
         if hasattr(self, "split_idxs"):
-            self.input_idxs = self.split_idxs[b]
+            self.input_idxs = take_idxs(self.split_idxs, b)
         else: self.input_idxs = self.idxs
         return self.dataset[b]
 
@@ -661,6 +824,7 @@ class NumpyDataLoader(TfmdDL):
         else: raise IndexError("Cannot index an iterable dataset numerically - must use `None`.")
 
     def get_idxs(self):
+        if self.world_size > 1: return self._get_rank_idxs()
         if self.n==0: return []
         if self.partial_n is not None: n = min(self.partial_n, self.n)
         else: n = self.n
@@ -680,6 +844,26 @@ class NumpyDataLoader(TfmdDL):
         if self.shuffle: idxs = self.shuffle_fn(idxs)
         return idxs
 
+    def _get_rank_idxs(self):
+        "Returns this process' shard of the indices. All processes draw the same indices (respecting `weights` and `partial_n`)"
+        state = np.random.get_state()
+        np.random.seed((self.dist_seed + self.dist_epoch) % 2**32)
+        self.dist_epoch += 1
+        try:
+            world_size, rank = self.world_size, self.rank
+            self.world_size = 1
+            idxs = np.asarray(self.get_idxs())
+        finally:
+            self.world_size = world_size
+            np.random.set_state(state)
+        if self._pad_shards:
+            # all processes need the same number of training batches to keep gradients in sync
+            idxs = np.concatenate([idxs, idxs[:(-len(idxs)) % world_size]])
+        return idxs[rank::world_size]
+
+    @property
+    def _pad_shards(self): return self.shuffle or self.weights is not None or self.sampler is not None
+
     def shuffle_fn(self, idxs):
         return np.random.permutation(idxs)
 
@@ -705,8 +889,11 @@ class NumpyDataLoader(TfmdDL):
 
     def __len__(self):
         if self.n == 0: return 0
-        elif self.partial_n is None: return super().__len__()
-        return self.partial_n//self.bs + (0 if self.drop_last or self.partial_n%self.bs==0 else 1)
+        elif self.partial_n is None and self.world_size == 1: return super().__len__()
+        n = ifnone(self.partial_n, self.n)
+        if self.world_size > 1:
+            n = math.ceil(n / self.world_size) if self._pad_shards else len(range(self.rank, n, self.world_size))
+        return n//self.bs + (0 if self.drop_last or n%self.bs==0 else 1)
 
     @delegates(plt.subplots)
     def show_batch(self, b=None, ctxs=None, max_n=9, nrows=3, ncols=3, figsize=None, unique=False, sharex=True, sharey=False, decode=False,
@@ -852,7 +1039,7 @@ class TSDataLoader(NumpyDataLoader):
         if xb[0].ndim >= 4: return xb[0].shape[-2:]
         else: return xb[0].shape[-1]
 
-# %% ../../nbs/006_data.core.ipynb 70
+# %% ../../nbs/006_data.core.ipynb 78
 _batch_tfms = ('after_item','before_batch','after_batch')
 
 class NumpyDataLoaders(DataLoaders):
@@ -922,7 +1109,7 @@ class TSDataLoaders(NumpyDataLoaders):
     _xblock = TSTensorBlock
     _dl_type = TSDataLoader
 
-# %% ../../nbs/006_data.core.ipynb 71
+# %% ../../nbs/006_data.core.ipynb 79
 class StratifiedSampler:
     "Sampler where batches preserve the percentage of samples for each class"
 
@@ -949,7 +1136,38 @@ class StratifiedSampler:
     def __len__(self):
         return self.n
 
-# %% ../../nbs/006_data.core.ipynb 73
+# %% ../../nbs/006_data.core.ipynb 81
+class LengthBucketSampler:
+    "Sampler that groups samples of similar length in the same batch, so that each batch is padded only to its own max length"
+
+    def __init__(self,
+        lengths, # Length of each sample (ie. `TSRaggedArray.lengths` of the split).
+        bs : int = 64, # Batch size (must match the dataloader's).
+        shuffle : bool = True, # If True, samples are shuffled, then sorted by length within buckets of `bucket_size` batches, and batches are shuffled.
+        bucket_size : int = 50, # Number of batches per bucket. If shuffle=False all samples are sorted by length.
+        drop_last : bool = False # Flag to drop the last incomplete batch.
+        ):
+        self.lengths, self.bs, self.shuffle, self.bucket_size, self.drop_last = np.asarray(lengths), bs, shuffle, bucket_size, drop_last
+        self.n = len(self.lengths) // bs * bs if drop_last else len(self.lengths)
+
+    def __iter__(self):
+        n, bs = len(self.lengths), self.bs
+        if not self.shuffle:
+            idxs = np.argsort(self.lengths, kind='stable')
+        else:
+            idxs = np.random.permutation(n)
+            idxs = idxs[np.lexsort((self.lengths[idxs], np.arange(n) // (bs * self.bucket_size)))]
+        # full batches are shuffled. The incomplete batch (if any) stays last so that batches aren't misaligned.
+        n_full = n // bs * bs
+        batches = idxs[:n_full].reshape(-1, bs)
+        if self.shuffle: batches = batches[np.random.permutation(len(batches))]
+        idxs = np.concatenate([batches.ravel(), [] if self.drop_last else idxs[n_full:]]).astype(int)
+        yield from idxs.tolist()
+
+    def __len__(self):
+        return self.n
+
+# %% ../../nbs/006_data.core.ipynb 83
 def get_c(dls):
     if getattr(dls, 'c', False): return dls.c
     if getattr(getattr(dls.train, 'after_item', None), 'c', False): return dls.train.after_item.c
@@ -958,7 +1176,7 @@ def get_c(dls):
     if len(vocab) > 0 and is_listy(vocab[-1]): vocab = vocab[-1]
     return len(vocab)
 
-# %% ../../nbs/006_data.core.ipynb 74
+# %% ../../nbs/006_data.core.ipynb 84
 def get_best_dl_params(dl, n_iters=10, num_workers=[0, 1, 2, 4, 8], pin_memory=[True, False], prefetch_factor=[2, 4, 8], return_best=True,
                        verbose=True):
 
@@ -1067,17 +1285,12 @@ def get_best_dls_params(dls, n_iters=10, num_workers=[0, 1, 2, 4, 8], pin_memory
         except KeyboardInterrupt: pass
     return dls
 
-# %% ../../nbs/006_data.core.ipynb 75
+# %% ../../nbs/006_data.core.ipynb 85
 def _check_splits(X, splits):
     if splits is None:
-        _dtype = smallest_dtype(len(X))
-        if len(X) < 1e6:
-            splits = (L(np.arange(len(X), dtype=_dtype).tolist()), L())
-        else:
-            _dtype = smallest_dtype(len(X))
-            splits = (np.arange(len(X), dtype=_dtype), L())
-    elif isinstance(splits, (tuple, list, L, np.ndarray)):
-        if not isinstance(splits[0], (tuple, list, L, np.ndarray)):
+        splits = (range(len(X)), L())
+    elif isinstance(splits, (tuple, list, L, np.ndarray, range)):
+        if not isinstance(splits[0], (tuple, list, L, np.ndarray, range)):
             splits = (splits, L())
         elif len(splits) == 1:
             splits = (splits[0], L())
@@ -1092,11 +1305,12 @@ def get_ts_dls(X, y=None, splits=None, sel_vars=None, sel_steps=None, tfms=None,
                weights=None, partial_n=None, sampler=None, sort=False, **kwargs):
     splits = _check_splits(X, splits)
     create_dir(path, verbose=False)
+    if _is_half(X): batch_tfms = [TSToFloat()] + listify(batch_tfms) # X stored in half precision is cast to float32 once batched
     dsets = TSDatasets(X, y, splits=splits, sel_vars=sel_vars, sel_steps=sel_steps, tfms=tfms, inplace=inplace)
     dsets = [dsets.subset(i) for i in range(len(splits))]
     if weights is not None:
         assert len(X) == len(weights), 'len(X) != len(weights)'
-        weights = [weights[split] if i == 0 else None for i,split in enumerate(splits)] # weights only applied to train set
+        weights = [weights[range2slice(split)] if i == 0 else None for i,split in enumerate(splits)] # weights only applied to train set
     dls   = TSDataLoaders.from_dsets(*dsets, path=path, bs=bs, batch_tfms=batch_tfms, num_workers=num_workers,
                                      device=device, shuffle_train=shuffle_train, drop_last=drop_last, weights=weights,
                                      partial_n=partial_n, sampler=sampler, sort=sort, **kwargs)
@@ -1104,15 +1318,10 @@ def get_ts_dls(X, y=None, splits=None, sel_vars=None, sel_steps=None, tfms=None,
 
 get_tsimage_dls = get_ts_dls
 
-# %% ../../nbs/006_data.core.ipynb 77
+# %% ../../nbs/006_data.core.ipynb 89
 def _check_split(X, split):
     if split is None:
-        _dtype = smallest_dtype(len(X))
-        if len(X) < 1e6:
-            split = L(np.arange(len(X), dtype=_dtype).tolist())
-        else:
-            _dtype = smallest_dtype(len(X))
-            split = np.arange(len(X), dtype=_dtype)
+        split = range(len(X))
     return (split, L())
 
 def get_ts_dl(X, y=None, split=None, sel_vars=None, sel_steps=None, tfms=None, inplace=True,
@@ -1120,6 +1329,7 @@ def get_ts_dl(X, y=None, split=None, sel_vars=None, sel_steps=None, tfms=None, i
               partial_n=None, sampler=None, sort=False, **kwargs):
     splits = _check_split(X, split)
     create_dir(path, verbose=False)
+    if _is_half(X): batch_tfms = [TSToFloat()] + listify(batch_tfms)
     dsets = TSDatasets(X, y, splits=splits, sel_vars=sel_vars, sel_steps=sel_steps, tfms=tfms, inplace=inplace, **kwargs)
     if not is_listy(partial_n): partial_n = [partial_n]
     dls   = TSDataLoaders.from_dsets(dsets.train, path=path, bs=bs, batch_tfms=batch_tfms, num_workers=num_workers,
@@ -1131,7 +1341,7 @@ def get_ts_dl(X, y=None, split=None, sel_vars=None, sel_steps=None, tfms=None, i
 
 def get_subset_dl(dl, idxs): return dl.new(dl.dataset.subset(idxs))
 
-# %% ../../nbs/006_data.core.ipynb 116
+# %% ../../nbs/006_data.core.ipynb 129
 def get_time_per_batch(dl, model=None, n_batches=None):
     try:
         timer.start(False)
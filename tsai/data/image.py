@@ -115,6 +115,74 @@ class TSToMat(Transform):
         return TSImage(torch.cat(output)).to(device=device)
 
 # %% ../../nbs/012_data.image.ipynb 11
+def _cmap_lut(cmap):
+    "Returns a matplotlib colormap as a (N, 3) lookup table"
+    cmap = plt.get_cmap(cmap)
+    return torch.from_numpy(cmap(np.arange(cmap.N))[:, :3]).float()
+
+def _apply_cmap(o, lut):
+    "Maps values in [0, 1] of a (bs, 1, h, w) tensor to (bs, 3, h, w) colors using a lookup table (same as `plt.get_cmap(cmap)(o)`)"
+    lut = lut.to(device=o.device, dtype=o.dtype)
+    idx = (o[:, 0] * len(lut)).int().clamp_(0, len(lut) - 1)
+    return lut.index_select(0, idx.flatten()).reshape(*idx.shape, 3).permute(0, 3, 1, 2)
+
+def _gaf(o, sample_range=(-1, 1), method='s'):
+    "Gramian Angular Field of a (n_samples, n_timestamps) tensor (same as pyts `GramianAngularField`)"
+    if sample_range is None:
+        if o.min() < -1 or o.max() > 1:
+            raise ValueError("If 'sample_range' is None, all the values of X must be between -1 and 1.")
+        x_cos = o
+    else:
+        o_min, o_max = o.min(1, keepdim=True)[0], o.max(1, keepdim=True)[0]
+        o_range = o_max - o_min
+        o_range[o_range == 0] = 1
+        x_cos = (o - o_min) / o_range * (sample_range[1] - sample_range[0]) + sample_range[0]
+    x_sin = torch.sqrt(torch.clamp(1 - x_cos ** 2, 0, 1))
+    if method in ['s', 'summation']:
+        return x_cos[:, :, None] * x_cos[:, None] - x_sin[:, :, None] * x_sin[:, None]
+    return x_sin[:, :, None] * x_cos[:, None] - x_cos[:, :, None] * x_sin[:, None]
+
+def _kbins(o, n_bins=5, strategy='quantile'):
+    "Bins each sample of a (n_samples, n_timestamps) tensor (same as pyts `KBinsDiscretizer`)"
+    q = torch.linspace(0, 1, n_bins + 1, device=o.device, dtype=o.dtype)[1:-1]
+    if strategy == 'normal':
+        return torch.searchsorted(torch.special.ndtri(q), o)
+    if strategy == 'uniform':
+        o_min, o_max = o.min(1, keepdim=True)[0], o.max(1, keepdim=True)[0]
+        return torch.searchsorted((o_min + (o_max - o_min) * q).contiguous(), o.contiguous())
+    bin_edges = torch.quantile(o, q, dim=1).T
+    # equal quantiles are merged, reducing the number of bins for that sample
+    keep = torch.cat([~torch.isclose(torch.diff(bin_edges, dim=1), torch.zeros(1, device=o.device, dtype=o.dtype), rtol=0, atol=1e-8),
+                      torch.ones(len(o), 1, dtype=torch.bool, device=o.device)], 1)
+    return ((o[:, :, None] > bin_edges[:, None]) & keep[:, None]).sum(-1)
+
+def _mtf(o, n_bins=5, strategy='quantile'):
+    "Markov Transition Field of a (n_samples, n_timestamps) tensor (same as pyts `MarkovTransitionField` with image_size=1.)"
+    n_samples, n_timestamps = o.shape
+    o_binned = _kbins(o, n_bins=n_bins, strategy=strategy)
+    transitions = o_binned[:, :-1] * n_bins + o_binned[:, 1:]
+    mtm = torch.zeros(n_samples, n_bins * n_bins, device=o.device, dtype=o.dtype)
+    mtm.scatter_add_(1, transitions, torch.ones_like(transitions, dtype=o.dtype))
+    mtm = mtm.view(n_samples, n_bins, n_bins)
+    sum_mtm = mtm.sum(2, keepdim=True)
+    sum_mtm[sum_mtm == 0] = 1
+    mtm = (mtm / sum_mtm).view(n_samples, -1)
+    return mtm.gather(1, (o_binned[:, :, None] * n_bins + o_binned[:, None]).view(n_samples, -1)).view(n_samples, n_timestamps, n_timestamps)
+
+def _rp(o, dimension=1, time_delay=1, threshold=None, percentage=10):
+    "Recurrence Plot of a (n_samples, n_timestamps) tensor (same as pyts `RecurrencePlot`)"
+    n_samples, n_timestamps = o.shape
+    dimension, time_delay = RecurrencePlot(dimension, time_delay)._check_params(n_timestamps)
+    if dimension == 1: dist = (o[:, :, None] - o[:, None]).abs()
+    else:
+        traj = o.unfold(1, (dimension - 1) * time_delay + 1, 1)[..., ::time_delay]
+        dist = torch.cdist(traj, traj, compute_mode='donot_use_mm_for_euclid_dist')
+    if threshold is None: return dist
+    if threshold == 'point': threshold = torch.quantile(dist.reshape(n_samples, -1), percentage / 100, dim=1)[:, None, None]
+    elif threshold == 'distance': threshold = percentage / 100 * dist.amax((1, 2), keepdim=True)
+    return (dist < threshold).to(o.dtype)
+
+# %% ../../nbs/012_data.image.ipynb 12
 @delegates(GramianAngularField.__init__)
 class TSToGADF(Transform):
     r"""Transforms a time series batch to a 4d TSImage (bs, n_vars, size, size) by applying Gramian Angular Difference Field.
@@ -123,6 +191,7 @@ class TSToGADF(Transform):
 
     def __init__(self, size=224, cmap=None, range=None, **kwargs):
         self.size,self.cmap,self.range = size,cmap,range
+        self.cmap_lut = _cmap_lut(cmap) if cmap else None
         self.encoder = GramianAngularField(image_size=1., sample_range=self.range, method='d', **kwargs)
 
     def encodes(self, o: TSTensor):
@@ -132,11 +201,9 @@ class TSToGADF(Transform):
             o = F.interpolate(o.reshape(-1, 1, seq_len), size=size, mode='nearest', align_corners=None)[:, 0]
         else:
             o = o.reshape(-1, seq_len)
-        output = self.encoder.fit_transform(o.cpu().numpy()).reshape(bs, -1, size, size) / 2 + .5
-        if self.cmap and output.shape[1] == 1:
-            output = TSImage(plt.get_cmap(self.cmap)(output)[..., :3]).squeeze(1).permute(0,3,1,2)
-        else: output = TSImage(output)
-        return output.to(device=o.device)
+        output = _gaf(o, sample_range=self.range, method='d').reshape(bs, -1, size, size) / 2 + .5
+        if self.cmap_lut is not None and output.shape[1] == 1: output = _apply_cmap(output, self.cmap_lut)
+        return TSImage(output)
 
 
 @delegates(GramianAngularField.__init__)
@@ -147,6 +214,7 @@ class TSToGASF(Transform):
 
     def __init__(self, size=224, cmap=None, range=None, **kwargs):
         self.size,self.cmap,self.range = size,cmap,range
+        self.cmap_lut = _cmap_lut(cmap) if cmap else None
         self.encoder = GramianAngularField(image_size=1., sample_range=self.range, method='s', **kwargs)
 
     def encodes(self, o: TSTensor):
@@ -156,11 +224,9 @@ class TSToGASF(Transform):
             o = F.interpolate(o.reshape(-1, 1, seq_len), size=size, mode='nearest', align_corners=None)[:, 0]
         else:
             o = o.reshape(-1, seq_len)
-        output = self.encoder.fit_transform(o.cpu().numpy()).reshape(bs, -1, size, size) / 2 + .5
-        if self.cmap and output.shape[1] == 1:
-            output = TSImage(plt.get_cmap(self.cmap)(output)[..., :3]).squeeze(1).permute(0,3,1,2)
-        else: output = TSImage(output)
-        return output.to(device=o.device)
+        output = _gaf(o, sample_range=self.range, method='s').reshape(bs, -1, size, size) / 2 + .5
+        if self.cmap_lut is not None and output.shape[1] == 1: output = _apply_cmap(output, self.cmap_lut)
+        return TSImage(output)
 
 
 
@@ -171,6 +237,7 @@ class TSToMTF(Transform):
 
     def __init__(self, size=224, cmap=None, n_bins=5, **kwargs):
         self.size,self.cmap = size,cmap
+        self.cmap_lut = _cmap_lut(cmap) if cmap else None
         self.encoder = MarkovTransitionField(n_bins=n_bins, **kwargs)
 
     def encodes(self, o: TSTensor):
@@ -180,11 +247,13 @@ class TSToMTF(Transform):
             o = F.interpolate(o.reshape(-1, 1, seq_len), size=size, mode='nearest', align_corners=None)[:, 0]
         else:
             o = o.reshape(-1, seq_len)
-        output = self.encoder.fit_transform(o.cpu().numpy()).reshape(bs, -1, size, size)
-        if self.cmap and output.shape[1] == 1:
-            output = TSImage(plt.get_cmap(self.cmap)(output)[..., :3]).squeeze(1).permute(0,3,1,2)
-        else: output = TSImage(output)
-        return output.to(device=o.device)
+        if self.encoder._check_params(size) == size:
+            output = _mtf(o, n_bins=self.encoder.n_bins, strategy=self.encoder.strategy).reshape(bs, -1, size, size)
+        else: # aggregated MTF (image_size < seq_len)
+            output = self.encoder.fit_transform(o.cpu().numpy())
+            output = o.new_tensor(output).reshape(bs, -1, *output.shape[-2:])
+        if self.cmap_lut is not None and output.shape[1] == 1: output = _apply_cmap(output, self.cmap_lut)
+        return TSImage(output)
 
 
 @delegates(RecurrencePlot.__init__)
@@ -195,6 +264,7 @@ class TSToRP(Transform):
 
     def __init__(self, size=224, cmap=None, **kwargs):
         self.size,self.cmap = size,cmap
+        self.cmap_lut = _cmap_lut(cmap) if cmap else None
         self.encoder = RecurrencePlot(**kwargs)
 
     def encodes(self, o: TSTensor):
@@ -204,12 +274,11 @@ class TSToRP(Transform):
             o = F.interpolate(o.reshape(-1, 1, seq_len), size=size, mode='nearest', align_corners=None)[:, 0]
         else:
             o = o.reshape(-1, seq_len)
-        output = self.encoder.fit_transform(o.cpu().numpy()) / 2
-        output = output.reshape(bs, -1, size, size)
-        if self.cmap and output.shape[1] == 1:
-            output = TSImage(plt.get_cmap(self.cmap)(output)[..., :3]).squeeze(1).permute(0,3,1,2)
-        else: output = TSImage(output)
-        return output.to(device=o.device)
+        rp = self.encoder
+        output = _rp(o, dimension=rp.dimension, time_delay=rp.time_delay, threshold=rp.threshold, percentage=rp.percentage) / 2
+        output = output.reshape(bs, -1, *output.shape[-2:])
+        if self.cmap_lut is not None and output.shape[1] == 1: output = _apply_cmap(output, self.cmap_lut)
+        return TSImage(output)
 
 
 @delegates(JointRecurrencePlot.__init__)
@@ -219,6 +288,7 @@ class TSToJRP(Transform):
 
     def __init__(self, size=224, cmap=None, **kwargs):
         self.size,self.cmap = size,cmap
+        self.cmap_lut = _cmap_lut(cmap) if cmap else None
         self.encoder = JointRecurrencePlot(**kwargs)
 
     def encodes(self, o: TSTensor):
@@ -226,8 +296,10 @@ class TSToJRP(Transform):
         bs, *_, seq_len = o.shape
         size = ifnone(self.size, seq_len)
         if size != seq_len: o = F.interpolate(o, size=size, mode='nearest', align_corners=None)
-        output = self.encoder.fit_transform(o.cpu().numpy()).reshape(bs, -1, size, size)
-        if self.cmap and output.shape[1] == 1:
-            output = TSImage(plt.get_cmap(self.cmap)(output)[..., :3]).squeeze(1).permute(0,3,1,2)
-        else: output = TSImage(output)
-        return output.to(device=o.device)
+        jrp = self.encoder
+        thresholds, percentages = jrp._check_params(o.shape[1])
+        output = torch.stack([_rp(o[:, i], dimension=jrp.dimension, time_delay=jrp.time_delay, threshold=t, percentage=p)
+                              for i, (t, p) in enumerate(zip(thresholds, percentages))]).prod(0)
+        output = output.reshape(bs, -1, *output.shape[-2:])
+        if self.cmap_lut is not None and output.shape[1] == 1: output = _apply_cmap(output, self.cmap_lut)
+        return TSImage(output)
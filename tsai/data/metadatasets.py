@@ -17,7 +17,7 @@ class TSMetaDataset():
         if not is_listy(dataset_list): dataset_list = [dataset_list]
         self.datasets = dataset_list
         self.split = kwargs['split'] if 'split' in kwargs else None            
-        self.mapping = self._mapping()
+        self.offsets = self._offsets()
         if hasattr(dataset_list[0], 'loss_func'): 
             self.loss_func =  dataset_list[0].loss_func
         else: 
@@ -27,33 +27,51 @@ class TSMetaDataset():
         if self.split is not None: 
             return len(self.split)
         else:
-            return sum([len(ds) for ds in self.datasets])
+            return int(self.offsets[-1])
 
     def __getitem__(self, idx):
         if self.datasets:
-            if self.split is not None: idx = self.split[idx]
-            idx = listify(idx)
-            idxs = self.mapping[idx]
-            idxs = idxs[idxs[:, 0].argsort()]
-            self.mapping_idxs = idxs
-            ds = np.unique(idxs[:, 0])
-            b = [self.datasets[d][idxs[idxs[:, 0] == d, 1]] for d in ds]
-            output = tuple(map(torch.cat, zip(*b)))
-            output = self._type[0](output[0]), output[1]
+            if self.split is not None: idx = take_idxs(self.split, idx)
+            elif isinstance(idx, slice): idx = range(*idx.indices(len(self)))
+            idxs = self.map_idxs(listify(idx) if is_indexer(idx) else idx)
+            ds_idxs, ds_items = idxs[:, 0], idxs[:, 1]
+
+            # group items by dataset (keeping the requested order within each dataset)
+            order = None if len(ds_idxs) < 2 or (ds_idxs[1:] >= ds_idxs[:-1]).all() else np.argsort(ds_idxs, kind='stable')
+            if order is not None: ds_idxs, ds_items = ds_idxs[order], ds_items[order]
+            ds, starts = np.unique(ds_idxs, return_index=True)
+            ends = np.append(starts[1:], len(ds_idxs))
+
+            # a single vectorized call per dataset (contiguous items are retrieved using a slice)
+            b = [self.datasets[d][range2slice(compact_idxs(ds_items[start:end]))] for d, start, end in zip(ds, starts, ends)]
+            output = tuple(map(torch.cat, zip(*b))) if len(b) > 1 else b[0]
+
+            # restore the requested order
+            if order is not None:
+                inv_order = torch.from_numpy(np.argsort(order)).to(output[0].device)
+                output = tuple(o[inv_order] for o in output)
+            output = (self._type[0](output[0]), *output[1:])
             return output
         else:
             return
 
-    def _mapping(self):
-        lengths = [len(ds) for ds in self.datasets]
-        idx_pairs = np.zeros((np.sum(lengths), 2)).astype(np.int32)
-        start = 0
-        for i,length in enumerate(lengths):
-            if i > 0: 
-                idx_pairs[start:start+length, 0] = i
-            idx_pairs[start:start+length, 1] = np.arange(length)
-            start += length
-        return idx_pairs
+    def _offsets(self):
+        return np.cumsum([0] + [len(ds) for ds in self.datasets], dtype=np.int64)
+
+    def map_idxs(self, idxs):
+        "Returns an array with the dataset index and the index within that dataset for each of the `idxs`"
+        idxs = np.asarray(idxs, dtype=np.int64).reshape(-1)
+        ds_idxs = np.searchsorted(self.offsets, idxs, side='right') - 1
+        return np.stack([ds_idxs, idxs - self.offsets[ds_idxs]], -1)
+
+    @property
+    def mapping(self):
+        "(dataset index, index within dataset) pairs for all the items. It's calculated on the fly and not stored"
+        return self.map_idxs(np.arange(self.offsets[-1]))
+
+    @property
+    def split_idxs(self):
+        return range(len(self)) if self.split is None else self.split
 
     def new_empty(self): 
         new_dset = type(self)(self.datasets, split=self.split)
@@ -78,7 +96,7 @@ class TSMetaDataset():
 class TSMetaDatasets(FilteredBase):
     def __init__(self, metadataset, splits):
         store_attr()
-        self.mapping = metadataset.mapping
+        self.offsets = metadataset.offsets
         self.datasets = metadataset.datasets
     def subset(self, i):
         return type(self.metadataset)(self.metadataset.datasets, split=self.splits[i])
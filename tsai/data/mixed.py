@@ -4,21 +4,22 @@
 __all__ = ['MixedDataLoader', 'MixedDataLoaders', 'get_mixed_dls']
 
 # %% ../../nbs/015_data.mixed.ipynb 3
-from packaging import version
-from torch.utils.data.dataloader import _MultiProcessingDataLoaderIter, _SingleProcessDataLoaderIter, _DatasetKind
-from fastai.data.load import _FakeLoader
 from fastai.tabular.core import *
 from ..imports import *
+from ..utils import take_idxs
 
 # %% ../../nbs/015_data.mixed.ipynb 4
 # This implementation of a mixed dataloader is based on a great implementation created by Zach Mueller in this fastai thread:
 # https://forums.fast.ai/t/combining-tabular-images-in-fastai2-and-should-work-with-almost-any-other-type/73197
 
-_loaders = (_MultiProcessingDataLoaderIter, _SingleProcessDataLoaderIter)
+class _MixedBatches(torch.utils.data.Dataset):
+    "Gathers the same batch of indices from all `loaders` (it may run in worker processes)"
+    def __init__(self, loaders): self.loaders = loaders
+    def __getitem__(self, b): return tuple(dl.do_batch(b) for dl in self.loaders)
 
 
 class MixedDataLoader():
-    def __init__(self, *loaders, path='.', shuffle=False, device=None, bs=None):
+    def __init__(self, *loaders, path='.', shuffle=False, device=None, bs=None, num_workers=0):
         "Accepts any number of `DataLoader` and a device"
         self.path = path
         device = ifnone(device, default_device())
@@ -34,6 +35,7 @@ class MixedDataLoader():
             if hasattr(dl, 'split_idxs'):
                 self.split_idxs = dl.split_idxs
             dl.bs = self.bs
+            dl.shuffle = shuffle
             dl.shuffle_fn = self.shuffle_fn
             if self.c is None and hasattr(dl, "c"):
                 self.c = dl.c
@@ -43,60 +45,77 @@ class MixedDataLoader():
                 self.dataset = dl.dataset
             dl.to(device=device)
         self.shuffle = shuffle
-        if not self.shuffle:
-            self.rng = np.arange(len(self.dataset)).tolist()
         self.loaders = loaders
-        self.count = 0
-        self.fake_l = _FakeLoader(self, False, 0, 0, 0, "") if version.parse(fastai.__version__) >= version.parse("2.7") \
-            else _FakeLoader(self, False, 0, 0, 0) if version.parse(fastai.__version__) >= version.parse("2.1") \
-            else _FakeLoader(self, False, 0, 0)
+        self.num_workers = num_workers
         if sum([len(dl.dataset) for dl in loaders]) > 0:
             self._get_idxs()  # Do not apply on an empty dataset
 
     def new(self, *args, **kwargs):
         loaders = [dl.new(*args, **kwargs) for dl in self.loaders]
-        return type(self)(*loaders, path=self.path, device=self.device)
+        return type(self)(*loaders, path=self.path, device=self.device, shuffle=kwargs.get('shuffle', self.shuffle), 
+                          num_workers=self.num_workers)
 
 #     def __len__(self): return len(self.loaders[0])
     def __len__(self): return self.loaders[0].__len__()
 
-    def _get_vals(self, x):
-        "Checks for duplicates in batches"
-        idxs, new_x = [], []
-        for i, o in enumerate(x):
-            x[i] = o.cpu().numpy().flatten()
-        for idx, o in enumerate(x):
-            if not self._arrayisin(o, new_x):
-                idxs.append(idx)
-                new_x.append(o)
-        return idxs
+    def _get_targets(self, dl):
+        "Returns the objects `dl` reads its targets from"
+        ds = dl.dataset
+        if getattr(ds, 'ptls', None) is not None: return list(ds.ptls[dl.n_inp:])
+        if getattr(ds, 'ys', None) is not None: return [ds.ys]
+        if getattr(ds, 'tls', None) is not None: return [tl.items for tl in ds.tls[dl.n_inp:]]
+        return [None] * (len(getattr(ds, 'tls', [])) - dl.n_inp)
+
+    def _is_duplicate(self, o, targets):
+        "Checks if target `o` is already in `targets` (same object, or same values in the first batch as originally compared)"
+        for t in targets:
+            if o is t: return True
+            if o is None or t is None or len(o) != len(t): continue
+            a, b = [np.asarray(x[:self.bs].cpu() if isinstance(x, torch.Tensor) else x[:self.bs]).reshape(min(len(x), self.bs), -1) for x in (o, t)]
+            if a.shape == b.shape and np.array_equal(a, b): return True
+        return False
 
     def _get_idxs(self):
         "Get `x` and `y` indices for batches of data"
         self.n_inps = [dl.n_inp for dl in self.loaders]
         self.x_idxs = self._split_idxs(self.n_inps)
 
-        # Identify duplicate targets
-        dl_dict = dict(zip(range(0, len(self.loaders)), self.n_inps))
-        outs = L([])
-        for key, n_inp in dl_dict.items():
-            b = next(iter(self.loaders[key]))
-            outs += L(b[n_inp:])
-        self.y_idxs = self._get_vals(outs)
+        # Identify duplicate targets (once per dataset instead of comparing batches)
+        self.y_idxs, targets = [], []
+        for dl in self.loaders:
+            for o in self._get_targets(dl):
+                if not self._is_duplicate(o, targets): self.y_idxs.append(len(targets))
+                targets.append(o)
+
+    def _batch_idxs(self):
+        "Yields the index vector shared by all loaders in each batch"
+        dl = self.loaders[0]
+        idxs = dl.get_idxs()
+        if dl.n is not None: idxs = np.asarray(idxs)[:len(self) * self.bs]
+        for i in range(len(self)):
+            b = idxs[i * self.bs:(i + 1) * self.bs]
+            if self.shuffle: b = np.sort(b) # sorted batches are faster to read from disk
+            yield b
+
+    def _gathered_batches(self):
+        "Gathers batches from all loaders in a single pass (in `num_workers` processes if > 0)"
+        gather = _MixedBatches(self.loaders)
+        if not self.num_workers:
+            for b in self._batch_idxs(): yield b, gather[b]
+            return
+        idxs = list(self._batch_idxs())
+        dl = torch.utils.data.DataLoader(gather, batch_size=None, sampler=idxs, num_workers=self.num_workers, collate_fn=noop)
+        yield from zip(idxs, dl)
 
     def __iter__(self):
-        z = zip(*[_loaders[i.fake_l.num_workers == 0](i.fake_l)
-                for i in self.loaders])
-        for b in z:
+        for idxs, b in self._gathered_batches():
+            self.idxs = idxs
+            self.input_idxs = take_idxs(self.split_idxs, idxs) if hasattr(self, 'split_idxs') else idxs
             inps = []
             outs = []
             if self.device is not None:
                 b = to_device(b, self.device)
             for batch, dl in zip(b, self.loaders):
-                if hasattr(dl, 'idxs'):
-                    self.idxs = dl.idxs
-                if hasattr(dl, 'input_idxs'):
-                    self.input_idxs = dl.input_idxs
                 batch = dl.after_batch(batch)
                 inps += batch[:dl.n_inp]
                 outs += batch[dl.n_inp:]
@@ -105,30 +124,23 @@ class MixedDataLoader():
             # based on issue identified by @Wabinab https://github.com/timeseriesAI/tsai/pull/229
             if len(self.y_idxs) == 0:
                 yield tuple((inps,))
+                continue
             outs = tuple(L(outs)[self.y_idxs]) if len(
                 self.y_idxs) > 1 else L(outs)[self.y_idxs][0]
             yield inps, outs
 
     def one_batch(self):
         "Grab one batch of data"
-        with self.fake_l.no_multiproc():
-            res = first(self)
+        num_workers, self.num_workers = self.num_workers, 0
+        try: res = first(self)
+        finally: self.num_workers = num_workers
         if hasattr(self, 'it'):
             delattr(self, 'it')
         return res
 
     def shuffle_fn(self, idxs):
         "Generate the same idxs for all dls in each batch when shuffled"
-        if self.count == 0:
-            self.shuffled_idxs = np.random.permutation(idxs)
-        # sort each batch
-        for i in range(len(self.shuffled_idxs)//self.bs + 1):
-            self.shuffled_idxs[i*self.bs:(i+1)*self.bs] = np.sort(
-                self.shuffled_idxs[i*self.bs:(i+1)*self.bs])
-        self.count += 1
-        if self.count == len(self.loaders):
-            self.count = 0
-        return self.shuffled_idxs
+        return np.random.permutation(idxs)
 
     def show_batch(self):
         "Show a batch of data"
@@ -137,13 +149,6 @@ class MixedDataLoader():
 
     def to(self, device): self.device = device
 
-    def _arrayisin(self, arr, arr_list):
-        "Checks if `arr` is in `arr_list`"
-        for a in arr_list:
-            if np.array_equal(arr, a):
-                return True
-        return False
-
     def _split_idxs(self, a):
         a_cum = np.array(a).cumsum().tolist()
         b = np.arange(sum(a)).tolist()
@@ -193,8 +193,8 @@ def split_Xy(X, y=None, splits=None):
     if splits is None: 
         if y is not None: return X, y
         else: return X
-    if not is_listy(splits[0]): splits = [splits]
-    else: assert not is_listy(splits[0][0]), 'You must pass a single set of splits.'
+    if not isinstance(splits[0], (list, L, np.ndarray, range)): splits = [splits]
+    else: assert not isinstance(splits[0][0], (list, L, np.ndarray, range)), 'You must pass a single set of splits.'
     _X = []
     _y = []
     for split in splits:
@@ -207,13 +207,13 @@ def split_Xy(X, y=None, splits=None):
 df2xy = df2Xy
 split_xy = split_Xy
 
-# %% ../../nbs/004_data.preparation.ipynb 24
+# %% ../../nbs/004_data.preparation.ipynb 25
 def df2np3d(df, groupby, data_cols=None):
     """Transforms a df (with the same number of rows per group in groupby) to a 3d ndarray"""
     if data_cols is None: data_cols = df.columns
     return np.stack([x[data_cols].values for _, x in df.groupby(groupby)]).transpose(0, 2, 1)
 
-# %% ../../nbs/004_data.preparation.ipynb 26
+# %% ../../nbs/004_data.preparation.ipynb 27
 def add_missing_value_cols(df, cols=None, dtype=float, fill_value=None):
     if cols is None: cols = df.columns
     elif not is_listy(cols): cols = [cols]
@@ -223,7 +223,7 @@ def add_missing_value_cols(df, cols=None, dtype=float, fill_value=None):
             df[col].fillna(fill_value)
     return df
 
-# %% ../../nbs/004_data.preparation.ipynb 28
+# %% ../../nbs/004_data.preparation.ipynb 29
 def add_missing_timestamps(
     df, # pandas DataFrame
     datetime_col=None, # column that contains the datetime data (without duplicates within groups)
@@ -283,7 +283,7 @@ def add_missing_timestamps(
         df.set_index(datetime_col, inplace=True)
     return df
 
-# %% ../../nbs/004_data.preparation.ipynb 42
+# %% ../../nbs/004_data.preparation.ipynb 43
 def time_encoding(series, freq, max_val=None):
     """Transforms a pandas series of dtype datetime64 (of any freq) or DatetimeIndex into 2 float arrays
     
@@ -318,7 +318,7 @@ def time_encoding(series, freq, max_val=None):
     cos = np.cos(series.values / max_val * 2 * np.pi)
     return sin, cos
 
-# %% ../../nbs/004_data.preparation.ipynb 46
+# %% ../../nbs/004_data.preparation.ipynb 47
 def forward_gaps(o, normalize=True):
     """Number of sequence steps since previous real value along the last dimension of 3D arrays or tensors"""
 
@@ -386,7 +386,7 @@ def get_gaps(o : torch.Tensor, forward : bool = True, backward : bool = True,
         gaps = np.concatenate(_gaps, 1)
     return gaps
 
-# %% ../../nbs/004_data.preparation.ipynb 48
+# %% ../../nbs/004_data.preparation.ipynb 49
 def add_delta_timestamp_cols(df, cols=None, groupby=None, forward=True, backward=True, nearest=True, normalize=True):
     if cols is None: cols = df.columns
     elif not is_listy(cols): cols = [cols]
@@ -413,7 +413,7 @@ def add_delta_timestamp_cols(df, cols=None, groupby=None, forward=True, backward
         df[[f'{col}_dt_nearest' for col in cols]] = df[[f'{col}_dt_nearest' for col in cols]]
     return df
 
-# %% ../../nbs/004_data.preparation.ipynb 54
+# %% ../../nbs/004_data.preparation.ipynb 55
 # # SlidingWindow vectorization is based on "Fast and Robust Sliding Window Vectorization with NumPy" by Syafiq Kamarul Azman
 # # https://towardsdatascience.com/fast-and-robust-sliding-window-vectorization-with-numpy-3ad950ed62f5
 
@@ -560,7 +560,7 @@ def SlidingWindow(
 
 SlidingWindowSplitter = SlidingWindow
 
-# %% ../../nbs/004_data.preparation.ipynb 90
+# %% ../../nbs/004_data.preparation.ipynb 91
 def SlidingWindowPanel(window_len:int, unique_id_cols:list, stride:Union[None, int]=1, start:int=0,
                        pad_remainder:bool=False, padding:str="post", padding_value:float=np.nan, add_padding_feature:bool=True,
                        get_x:Union[None, int, list]=None,  get_y:Union[None, int, list]=None, y_func:Optional[callable]=None,
@@ -657,7 +657,7 @@ def SlidingWindowPanel(window_len:int, unique_id_cols:list, stride:Union[None, i
 
 SlidingWindowPanelSplitter = SlidingWindowPanel
 
-# %% ../../nbs/004_data.preparation.ipynb 97
+# %% ../../nbs/004_data.preparation.ipynb 98
 def identify_padding(float_mask, value=-1):
     """Identifies padded subsequences in a mask of type float
     
@@ -676,7 +676,7 @@ def identify_padding(float_mask, value=-1):
         for idx,pad in zip(padded_idxs, padding): float_mask[idx, :, -pad:] = value
     return float_mask
 
-# %% ../../nbs/004_data.preparation.ipynb 100
+# %% ../../nbs/004_data.preparation.ipynb 101
 def basic_data_preparation_fn(
     df, # dataframe to preprocess
     drop_duplicates=True, # flag to indicate if rows with duplicate datetime info should be removed
@@ -716,7 +716,7 @@ def basic_data_preparation_fn(
     
     return df[cols]
 
-# %% ../../nbs/004_data.preparation.ipynb 102
+# %% ../../nbs/004_data.preparation.ipynb 103
 def check_safe_conversion(o, dtype='float32', cols=None):
     "Checks if the conversion to float is safe"
     
@@ -760,7 +760,7 @@ def check_safe_conversion(o, dtype='float32', cols=None):
         return _check_safe_conversion(o, dtype=dtype)
     
 
-# %% ../../nbs/004_data.preparation.ipynb 104
+# %% ../../nbs/004_data.preparation.ipynb 105
 def prepare_forecasting_data(
     df:pd.DataFrame, # dataframe containing a sorted time series for a single entity or subject
     fcst_history:int, # # historical steps used as input.
@@ -809,11 +809,11 @@ def prepare_forecasting_data(
         y = None
     return X, y
 
-# %% ../../nbs/004_data.preparation.ipynb 110
+# %% ../../nbs/004_data.preparation.ipynb 111
 def get_today(datetime_format="%Y-%m-%d"):
     return dt.datetime.today().strftime(datetime_format)
 
-# %% ../../nbs/004_data.preparation.ipynb 112
+# %% ../../nbs/004_data.preparation.ipynb 113
 def split_fcst_datetime(
     fcst_datetime,  # str or list of str with datetime
 ):
@@ -823,7 +823,7 @@ def split_fcst_datetime(
     fcst_datetime_min, fcst_datetime_max = fcst_datetime[0], fcst_datetime[-1]
     return fcst_datetime_min, fcst_datetime_max
 
-# %% ../../nbs/004_data.preparation.ipynb 114
+# %% ../../nbs/004_data.preparation.ipynb 115
 def set_df_datetime(df, datetime_col=None, use_index=False):
     "Make sure datetime column or index is of the right date type."
 
@@ -843,7 +843,7 @@ def set_df_datetime(df, datetime_col=None, use_index=False):
         elif use_index:
             df.index = pd.to_datetime(df.index, infer_datetime_format=True)
 
-# %% ../../nbs/004_data.preparation.ipynb 116
+# %% ../../nbs/004_data.preparation.ipynb 117
 def get_df_datetime_bounds(
     df,  # dataframe containing forecasting data
     datetime_col=None,  # str data column containing the datetime
@@ -858,7 +858,7 @@ def get_df_datetime_bounds(
         min_datetime, max_datetime = df.index.min(), df.index.max()
     return min_datetime, max_datetime
 
-# %% ../../nbs/004_data.preparation.ipynb 118
+# %% ../../nbs/004_data.preparation.ipynb 119
 def get_fcst_bounds(
     df,  # dataframe containing forecasting data
     fcst_datetime,  # datetime for which a fcst is created. Optionally tuple of datatimes if the fcst is created for a range of dates.
@@ -906,7 +906,7 @@ def get_fcst_bounds(
     
     return start_datetime, end_datetime
 
-# %% ../../nbs/004_data.preparation.ipynb 121
+# %% ../../nbs/004_data.preparation.ipynb 122
 def filter_df_by_datetime(
     df,  # dataframe containing forecasting data
     start_datetime=None, # lower datetime bound
@@ -939,7 +939,7 @@ def filter_df_by_datetime(
             df.reset_index(drop=True, inplace=True)
     return df
 
-# %% ../../nbs/004_data.preparation.ipynb 123
+# %% ../../nbs/004_data.preparation.ipynb 124
 def get_fcst_data_from_df(
     df,  # dataframe containing forecasting data
     fcst_datetime,  # datetime for which a fcst is created. Optionally tuple of datatimes if the fcst is created for a range of dates.
@@ -27,6 +27,7 @@ def get_tabular_ds(df, procs=[Categorify, FillMissing, Normalize], cat_names=Non
         y_block = CategoryBlock() if any([True for n in y_names if n not in num_cols]) else RegressionBlock()
     else: y_block = None
     pd.options.mode.chained_assignment=None
+    if splits is not None: splits = [toL(split) for split in splits] # TabularPandas requires list-like splits
     to = TabularPandas(df[cols], procs=procs, cat_names=cat_names, cont_names=cont_names, y_names=y_names, y_block=y_block,
                        splits=splits, do_setup=do_setup, inplace=inplace, reduce_memory=reduce_memory, device=device)
     setattr(to, "groupby", groupby)
@@ -12,7 +12,8 @@ from .core import *
 # %% ../../nbs/007_data.unwindowed.ipynb 4
 class TSUnwindowedDataset():
     _types = TSTensor, TSLabelTensor
-    def __init__(self, X=None, y=None, y_func=None, window_size=1, stride=1, drop_start=0, drop_end=0, seq_first=True, **kwargs):
+    def __init__(self, X=None, y=None, y_func=None, window_size=1, stride=1, drop_start=0, drop_end=0, seq_first=True, offsets=None, horizon=0, 
+                 **kwargs):
         store_attr()
         if X is not None:
             if X.ndim == 1: X = np.expand_dims(X, 1)
@@ -22,10 +23,28 @@ class TSUnwindowedDataset():
                 seq_len = shape[0]
             else: 
                 seq_len = shape[-1]
-            max_time = seq_len - window_size + 1 - drop_end
-            assert max_time > 0, 'you need to modify either window_size or drop_end as they are larger than seq_len'
-            self.all_idxs = np.expand_dims(np.arange(drop_start, max_time, step=stride), 0).T
+                X = X.T
+            
+            # entity boundaries (a single entity if offsets is None). Windows (and their horizon) never cross them.
+            offsets = np.array([0] if offsets is None else offsets, dtype=np.int64).reshape(-1)
+            if offsets[-1] != seq_len: offsets = np.append(offsets, seq_len)
+            assert np.all(np.diff(offsets) >= 0) and offsets[-1] == seq_len, 'offsets must be sorted and within seq_len'
+            self.offsets = offsets
+            entity_starts = offsets[:-1] + drop_start
+            entity_ends = offsets[1:] - drop_end - window_size - horizon + 1
+            n_windows = np.maximum(0, -((entity_starts - entity_ends) // stride))
+            max_time = n_windows.sum()
+            assert max_time > 0, 'you need to modify either window_size, horizon or drop_end as they are larger than seq_len'
+            self.entity_idxs = np.repeat(np.arange(len(n_windows)), n_windows)
+            steps = np.arange(max_time) - np.repeat(np.cumsum(n_windows) - n_windows, n_windows)
+            self.all_idxs = np.expand_dims(np.repeat(entity_starts, n_windows) + steps * stride, 0).T
             self.window_idxs = np.expand_dims(np.arange(window_size), 0)
+            
+            # strided views: windows are only copied when a batch is indexed
+            self._X_windows = sliding_window_view(X, window_size, axis=0)
+            if horizon:
+                y_src = X if y is None else y
+                self._y_windows = sliding_window_view(y_src, horizon, axis=0)
             if 'split' in kwargs: self.split = kwargs['split']
             else: self.split = None
             self.n_inp = 1
@@ -47,20 +66,17 @@ class TSUnwindowedDataset():
     def __getitem__(self, idxs):
         if self.split is not None:
             idxs = self.split[idxs]
-        widxs = self.all_idxs[idxs] + self.window_idxs
-        if self.seq_first:
-            xb = self.X[widxs]
-            if xb.ndim == 3: xb = xb.transpose(0,2,1)
-            else: xb = np.expand_dims(xb, 1)
-        else:
-            xb = self.X[:, widxs].transpose(1,0,2)
-        if self.y is None:
+        starts = self.all_idxs[idxs].reshape(-1)
+        xb = self._X_windows[starts]
+        if self.horizon:
+            yb = self._y_windows[starts + self.window_size]
+        elif self.y is None:
             return (self._types[0](xb),)
         else:
-            yb = self.y[widxs]
-            if self.y_func is not None: 
-                yb = self.y_func(yb)
-            return (self._types[0](xb), self._types[1](yb))
+            yb = self.y[np.expand_dims(starts, 1) + self.window_idxs]
+        if self.y_func is not None: 
+            yb = self.y_func(yb)
+        return (self._types[0](xb), self._types[1](yb))
     
     def new_empty(self): 
         return type(self)(X=None, y=None)
@@ -81,7 +97,8 @@ class TSUnwindowedDatasets(FilteredBase):
     def subset(self, i):
         return type(self.dataset)(self.dataset.X, y=self.dataset.y, y_func=self.dataset.y_func, window_size=self.dataset.window_size,
                                   stride=self.dataset.stride, drop_start=self.dataset.drop_start, drop_end=self.dataset.drop_end, 
-                                  seq_first=self.dataset.seq_first, split=self.splits[i])
+                                  seq_first=self.dataset.seq_first, offsets=self.dataset.offsets, horizon=self.dataset.horizon, 
+                                  split=self.splits[i])
     @property
     def train(self): 
         return self.subset(0)
@@ -2,9 +2,9 @@
 
 # %% auto 0
 __all__ = ['TimeSplitter', 'RandomSplitter', 'check_overlap', 'check_splits_overlap', 'leakage_finder', 'balance_idx',
-           'TrainValidTestSplitter', 'plot_splits', 'get_splits', 'get_walk_forward_splits', 'TSSplitter',
-           'get_predefined_splits', 'combine_split_data', 'get_splits_len', 'get_usable_idxs', 'get_df_usable_idxs',
-           'calculate_fcst_stats', 'get_forecasting_splits', 'get_long_term_forecasting_splits']
+           'compact_splits', 'TrainValidTestSplitter', 'plot_splits', 'get_splits', 'get_walk_forward_splits',
+           'TSSplitter', 'get_predefined_splits', 'combine_split_data', 'get_splits_len', 'get_usable_idxs',
+           'get_df_usable_idxs', 'calculate_fcst_stats', 'get_forecasting_splits', 'get_long_term_forecasting_splits']
 
 # %% ../../nbs/003_data.validation.ipynb 3
 from ..imports import *
@@ -40,7 +40,7 @@ def check_overlap(a, b, c=None):
     return L(a[ab].tolist()), L(a[ac].tolist()), L(b[bc].tolist())
 
 def check_splits_overlap(splits):
-    return [check_overlap(*_splits) for _splits in splits] if is_listy(splits[0][0]) else check_overlap(*splits)
+    return [check_overlap(*_splits) for _splits in splits] if _is_nested_split(splits) else check_overlap(*splits)
 
 def leakage_finder(*splits, verbose=True):
     '''You can pass splits as a tuple, or train, valid, ...'''
@@ -68,6 +68,18 @@ def balance_idx(o, shuffle=False, strategy="oversample", random_state=None, verb
     return new_idx
 
 # %% ../../nbs/003_data.validation.ipynb 12
+def _is_idxs(o): return isinstance(o, (range, np.ndarray)) or is_listy(o)
+
+def _is_nested_split(splits):
+    "Checks if `splits` contains several folds, each of them with its own (train, valid, ...) splits"
+    return len(splits) > 0 and _is_idxs(splits[0]) and len(splits[0]) > 0 and _is_idxs(splits[0][0])
+
+def compact_splits(splits):
+    "Converts each split into a compact index: a `range` if contiguous and ascending or a smallest int dtype array otherwise"
+    if _is_nested_split(splits): return tuple(compact_splits(split) for split in splits)
+    return tuple(compact_idxs(split) for split in splits)
+
+# %% ../../nbs/003_data.validation.ipynb 14
 def TrainValidTestSplitter(n_splits:int=1, valid_size:Union[float, int]=0.2, test_size:Union[float, int]=0., train_only:bool=False,
                            stratify:bool=True, balance:bool=False, strategy:str="oversample", shuffle:bool=True, 
                            random_state:Union[None, int]=None, verbose:bool=False, **kwargs):
@@ -168,25 +180,19 @@ def TrainValidTestSplitter(n_splits:int=1, valid_size:Union[float, int]=0.2, tes
                 return train, valid
     return _inner
 
-# %% ../../nbs/003_data.validation.ipynb 13
+# %% ../../nbs/003_data.validation.ipynb 15
+def _split_max(split):
+    if not len(split): return -1
+    if isinstance(split, range): return max(split[0], split[-1])
+    return int(np.asarray(split).max())
+
 def plot_splits(splits):
-    _max = 0
-    _splits = 0
-    for i, split in enumerate(splits):
-        if is_listy(split[0]):
-            for j, s in enumerate(split):
-                _max = max(_max, array(s).max())
-                _splits += 1
-        else: 
-            _max = max(_max, array(split).max())
-            _splits += 1
-    _splits = [splits] if not is_listy(split[0]) else splits
+    _splits = splits if _is_nested_split(splits) else [splits]
+    _max = max([_split_max(s) for split in _splits for s in split])
     v = np.zeros((len(_splits), _max + 1))
     for i, split in enumerate(_splits):
-        if is_listy(split[0]):
-            for j, s in enumerate(split): 
-                v[i, s] = 1 + j
-        else: v[i, split] = 1 + i
+        for j, s in enumerate(split): 
+            v[i, range2slice(s) if isinstance(s, range) else np.asarray(s, dtype=int)] = 1 + j
     vals = np.unique(v)
     if 2 in vals and 3 not in vals:
         vals = [v + 1 if v == 2 else v for v in vals]
@@ -211,7 +217,7 @@ def plot_splits(splits):
     plt.gca().invert_yaxis()
     plt.show()
 
-# %% ../../nbs/003_data.validation.ipynb 14
+# %% ../../nbs/003_data.validation.ipynb 16
 def get_splits(o, n_splits:int=1, valid_size:float=0.2, test_size:float=0., train_only:bool=False, train_size:Union[None, float, int]=None, balance:bool=False,
                strategy:str="oversample", shuffle:bool=True, stratify:bool=True, check_splits:bool=True, random_state:Union[None, int]=None, 
                show_plot:bool=True, verbose:bool=False):
@@ -230,6 +236,8 @@ def get_splits(o, n_splits:int=1, valid_size:float=0.2, test_size:float=0., trai
         check_splits : whether to perform leakage and completion checks.
         random_state : when shuffle is True, random_state affects the ordering of the indices. Pass an int for reproducible output.
         show_plot    : plot the split distribution
+    Each split is returned as a compact index (a range or a smallest dtype int array, see `compact_splits`). Splits can't be joined 
+    with `splits[0] + splits[1]` (ranges can't be added and arrays are added elementwise). Use `np.concatenate(splits[:2])` instead.
     '''
     if n_splits == 1 and valid_size == 0. and  test_size == 0.: train_only = True
     if balance: stratify = True
@@ -276,10 +284,11 @@ def get_splits(o, n_splits:int=1, valid_size:float=0.2, test_size:float=0., trai
                 if valid_size != 0: splits[1] = splits[0]
                 if test_size != 0: splits[2] = splits[0]
             splits = tuple(splits)
+    splits = compact_splits(splits)
     if show_plot: plot_splits(splits)
     return splits
 
-# %% ../../nbs/003_data.validation.ipynb 17
+# %% ../../nbs/003_data.validation.ipynb 19
 def get_walk_forward_splits(
     o, # 3D object with shape [samples x features x steps] containing the time series we need to split
     n_splits=1, # # of splits
@@ -316,59 +325,58 @@ def get_walk_forward_splits(
     valid_idxs = []
     test_idxs = []
 
-    end = 0
-    all_idxs = np.arange(len(o))
+    all_idxs = range(len(o))
     for n in range(n_splits):
         if valid_size > 0 and test_size > 0:
             if test_after_valid:
-                test_idxs.append(L(all_idxs[-test_size:].tolist()))
+                test_idxs.append(all_idxs[-test_size:])
                 all_idxs = all_idxs[:-test_size]
-                valid_idxs.append(L(all_idxs[-valid_size:].tolist()))
+                valid_idxs.append(all_idxs[-valid_size:])
                 all_idxs = all_idxs[:-valid_size]
                 if gap > 0:
                     all_idxs = all_idxs[:-gap]
                 if anchored:
-                    train_idxs.append(L(all_idxs.tolist()))
+                    train_idxs.append(all_idxs)
                 else:
-                    train_idxs.append(L(all_idxs[-train_size:].tolist()))
+                    train_idxs.append(all_idxs[-train_size:])
             else:
                 valid_test_idxs = all_idxs[-test_size - valid_size:]
                 np.random.seed(random_state)
                 valid_test_idxs = np.random.permutation(valid_test_idxs)
-                valid_idxs.append(L(valid_test_idxs[:valid_size]))
-                test_idxs.append(L(valid_test_idxs[valid_size:]))
+                valid_idxs.append(compact_idxs(valid_test_idxs[:valid_size]))
+                test_idxs.append(compact_idxs(valid_test_idxs[valid_size:]))
                 all_idxs = all_idxs[:-test_size - valid_size]
                 if gap > 0:
                     all_idxs = all_idxs[:-gap]
                 if anchored:
-                    train_idxs.append(L(all_idxs.tolist()))
+                    train_idxs.append(all_idxs)
                 else:
-                    train_idxs.append(L(all_idxs[-train_size:].tolist()))
+                    train_idxs.append(all_idxs[-train_size:])
         elif valid_size > 0:
-            valid_idxs.append(L(all_idxs[-valid_size:].tolist()))
+            valid_idxs.append(all_idxs[-valid_size:])
             all_idxs = all_idxs[:-valid_size]
-            test_idxs.append(L([]))
+            test_idxs.append(range(0))
             if gap > 0:
                 all_idxs = all_idxs[:-gap]
             if anchored:
-                train_idxs.append(L(all_idxs.tolist()))
+                train_idxs.append(all_idxs)
             else:
-                train_idxs.append(L(all_idxs[-train_size:].tolist()))
+                train_idxs.append(all_idxs[-train_size:])
 
     splits = []
     for n in range(n_splits):
         if valid_size > 0 and test_size > 0:
-            splits.append((L(train_idxs[n]), L(valid_idxs[n]), L(test_idxs[n])))
+            splits.append((train_idxs[n], valid_idxs[n], test_idxs[n]))
         elif valid_size > 0:
-            splits.append((L(train_idxs[n]), L(valid_idxs[n])))
+            splits.append((train_idxs[n], valid_idxs[n]))
         else:
-            splits.append((L(train_idxs[n]),))
+            splits.append((train_idxs[n],))
     splits = tuple(splits)[::-1]
     if show_plot:
         plot_splits(splits)
     return splits
 
-# %% ../../nbs/003_data.validation.ipynb 19
+# %% ../../nbs/003_data.validation.ipynb 21
 def TSSplitter(
     valid_size=0.2, # int or float indicating the validation set size
     test_size=0., # int or float indicating the test set size
@@ -386,21 +394,13 @@ def TSSplitter(
             test_cut = test_size if isinstance(test_size, Integral) else round(test_size * len(o))
         else:
             test_cut = 0
-        idx = np.arange(len(o), dtype=smallest_dtype(len(o)))
+        idx = range(len(o))
         if test_size: 
-            if len(idx) < 1_000_000:
-                splits = (L(idx[:-valid_cut - test_cut - fcst_horizon].tolist()), 
-                          L(idx[-valid_cut - test_cut: - test_cut - fcst_horizon].tolist()),
-                          L(idx[-test_cut:].tolist()))
-            else:
-                splits = (idx[:-valid_cut - test_cut - fcst_horizon], 
-                          idx[-valid_cut - test_cut: - test_cut - fcst_horizon],
-                          idx[-test_cut:])
+            splits = (idx[:-valid_cut - test_cut - fcst_horizon], 
+                      idx[-valid_cut - test_cut: - test_cut - fcst_horizon],
+                      idx[-test_cut:])
         else: 
-            if len(idx) < 1_000_000:
-                splits = (L(idx[:-valid_cut - fcst_horizon].tolist()), L(idx[-valid_cut:].tolist()))
-            else:
-                splits = (idx[:-valid_cut - fcst_horizon], idx[-valid_cut:])
+            splits = (idx[:-valid_cut - fcst_horizon], idx[-valid_cut:])
         if show_plot: 
             if len(o) > 1_000_000:
                 warnings.warn('the splits are too large to be plotted')
@@ -411,13 +411,13 @@ def TSSplitter(
 
 TimeSplitter = TSSplitter
 
-# %% ../../nbs/003_data.validation.ipynb 36
+# %% ../../nbs/003_data.validation.ipynb 38
 def get_predefined_splits(*xs):
     '''xs is a list with X_train, X_valid, ...'''
     splits_ = []
     start = 0
     for x in xs: 
-        splits_.append(L(list(np.arange(start, start + len(x)))))
+        splits_.append(range(start, start + len(x)))
         start += len(x)
     return tuple(splits_)
 
@@ -428,15 +428,15 @@ def combine_split_data(xs, ys=None):
     if ys is None: return concat(*xs), None, splits
     else: return concat(*xs), concat(*ys), splits
 
-# %% ../../nbs/003_data.validation.ipynb 37
+# %% ../../nbs/003_data.validation.ipynb 39
 def get_splits_len(splits):
     _len = []
     for split in splits: 
-        if isinstance(split[0], (list, L, tuple)):  _len.append([len(s) for s in split])
+        if _is_idxs(split) and len(split) and _is_idxs(split[0]):  _len.append([len(s) for s in split])
         else: _len.append(len(split))
     return _len
 
-# %% ../../nbs/003_data.validation.ipynb 41
+# %% ../../nbs/003_data.validation.ipynb 43
 def get_usable_idxs(df, fcst_history, fcst_horizon, stride=1):
     if len(df) < fcst_history + fcst_horizon:
         return np.array([], dtype=int)
@@ -473,7 +473,7 @@ def get_df_usable_idxs(
     return usable_df_idxs
 
 
-# %% ../../nbs/003_data.validation.ipynb 42
+# %% ../../nbs/003_data.validation.ipynb 44
 def calculate_fcst_stats(
     df, # dataframe containing a sorted time series for a single entity or subject
     fcst_history, # # historical steps used as input.
@@ -486,7 +486,7 @@ def calculate_fcst_stats(
     "Calculates the training stats required in a forecasting task"
     x_vars = list(df.columns) if x_vars is None else feat2list(x_vars)
     y_vars = list(df.columns) if y_vars is None else feat2list(y_vars)
-    split = splits[0] if is_listy(splits[0]) else splits
+    split = splits[0] if _is_idxs(splits[0]) else splits
     if fcst_history == 1:
         train_idxs = split
     else:
@@ -495,7 +495,7 @@ def calculate_fcst_stats(
             idxs = split
         else:
             subset = int(subset_size) if isinstance(subset_size, Integral) else int(subset_size * len(split))
-            idxs = random_choice(idxs, subset, replace=False)
+            idxs = random_choice(split, subset, replace=False)
         dtype = smallest_dtype(max(split) + fcst_history)
         train_idxs = np.unique((np.asarray(idxs, dtype=dtype).reshape(-1,1) + np.arange(fcst_history, dtype=dtype).reshape(1, -1)).flatten())
     mean = df.reset_index().loc[train_idxs, x_vars].mean().values.reshape(1, -1, 1)
@@ -506,7 +506,7 @@ def calculate_fcst_stats(
     y_std  = df.reset_index().loc[train_idxs, y_vars].std().values.reshape(1, -1, 1)
     return (mean, std), (y_mean, y_std)
 
-# %% ../../nbs/003_data.validation.ipynb 43
+# %% ../../nbs/003_data.validation.ipynb 45
 def get_forecasting_splits(
     df,                         # dataframe containing a sorted time series
     fcst_history,               # # historical steps used as input (size of the sliding window for the input)
@@ -619,12 +619,11 @@ def get_forecasting_splits(
     train_size = len(train_idxs)
 
     
-    if len(df) < 1_000_000:
-        train_idxs = L(train_idxs.tolist())
-        if len(valid_idxs):
-            valid_idxs = L(valid_idxs.tolist())
-        if len(test_idxs):
-            test_idxs = L(test_idxs.tolist())
+    train_idxs = compact_idxs(train_idxs)
+    if len(valid_idxs):
+        valid_idxs = compact_idxs(valid_idxs)
+    if len(test_idxs):
+        test_idxs = compact_idxs(test_idxs)
 
     splits = (train_idxs,)
     if valid_size:
@@ -639,7 +638,7 @@ def get_forecasting_splits(
             plot_splits(splits)
     return tuple(splits)
 
-# %% ../../nbs/003_data.validation.ipynb 48
+# %% ../../nbs/003_data.validation.ipynb 51
 def get_long_term_forecasting_splits(
     df, # dataframe containing a sorted time series for a single entity or subject
     fcst_history,   # # historical steps used as input.
@@ -665,9 +664,9 @@ def get_long_term_forecasting_splits(
         border1s = [0, num_train - fcst_history, len(df) - num_test - fcst_history]
         border2s = [num_train, num_train + num_vali, len(df)]
 
-    train_split = L(np.arange(border1s[0], border2s[0] - fcst_horizon - fcst_history + 1).tolist())
-    valid_split = L(np.arange(border1s[1], border2s[1] - fcst_horizon - fcst_history + 1).tolist())
-    test_split = L(np.arange(border1s[2], border2s[2] - fcst_horizon - fcst_history + 1).tolist())   
+    train_split = range(border1s[0], border2s[0] - fcst_horizon - fcst_history + 1)
+    valid_split = range(border1s[1], border2s[1] - fcst_horizon - fcst_history + 1)
+    test_split = range(border1s[2], border2s[2] - fcst_horizon - fcst_history + 1)
     splits = train_split, valid_split, test_split
     if show_plot:
         plot_splits(splits)
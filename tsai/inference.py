@@ -1,11 +1,23 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/019_inference.ipynb.
 
 # %% auto 0
-__all__ = []
+__all__ = ['quantize', 'export_model', 'benchmark_export']
 
 # %% ../nbs/019_inference.ipynb 3
+import io
+import warnings
+from copy import copy, deepcopy
+from functools import partial
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import torch
+from torch import nn
 from fastai.learner import Learner, load_learner
-from fastcore.basics import patch
+from fastai.torch_core import to_device, trainable_params
+from fastcore.basics import patch, ifnone
+from .callback.core import AutocastMixedPrecision
+from .utils import time_fn
 
 # %% ../nbs/019_inference.ipynb 4
 @patch
@@ -17,12 +29,268 @@ def get_X_preds(self: Learner,
     with_decoded=True, # returns decoded predictions as well
     with_loss=False, # returns the loss per item as well
     act=None, # Apply activation to predictions, defaults to `self.loss_func`'s activation
+    precision=None, # 'fp32' or 'bf16' (bfloat16 autocast). Defaults to the precision used to train the learner
     ):
     if with_loss and y is None:
         print("with_loss set to False as y is None")
         with_loss = False
     dl = self.dls.valid.new_dl(X, y=y, bs=bs)
-    output = list(self.get_preds(dl=dl, with_input=with_input, with_decoded=with_decoded, with_loss=with_loss, reorder=False, act=act))
+    autocast_cbs = self.cbs.filter(lambda cb: isinstance(cb, AutocastMixedPrecision))
+    cbs = [AutocastMixedPrecision(torch.bfloat16)] if precision == 'bf16' and not autocast_cbs else None
+    with self.removed_cbs(autocast_cbs if precision == 'fp32' else []):
+        output = list(self.get_preds(dl=dl, with_input=with_input, with_decoded=with_decoded, with_loss=with_loss, reorder=False, act=act,
+                                     cbs=cbs))
     if with_decoded and len(self.dls.tls) >= 2 and hasattr(self.dls.tls[-1], "tfms") and hasattr(self.dls.tls[-1].tfms, "decodes"):
         output[2 + with_input] = self.dls.tls[-1].tfms.decode(output[2 + with_input])
     return tuple(output)
+
+# %% ../nbs/019_inference.ipynb 5
+def _quantizable_model(model):
+    "Replaces layers that compute their padding on the fly with traceable equivalents (same weights)"
+    # only SameConv1d and Conv2dSame are swapped. Other untraceable layers make static quantization fall back to dynamic
+    from tsai.models.layers import SameConv1d, Conv2dSame, Pad1d, Pad2d, same_padding1d, same_padding2d
+    for name, child in model.named_children():
+        if isinstance(child, SameConv1d):
+            # the padding depends on ks and dilation only (stride isn't used), so it can be fixed
+            setattr(model, name, nn.Sequential(Pad1d(same_padding1d(1, child.ks, dilation=child.dilation)), child.conv1d_same))
+        elif isinstance(child, Conv2dSame):
+            setattr(model, name, nn.Sequential(Pad2d(same_padding2d(1, 1, child.ks, dilation=child.dilation)), child.conv2d_same))
+        else: _quantizable_model(child)
+    return model
+
+
+def _load_scripted_model(buffer): return _QuantizedModel(torch.jit.load(io.BytesIO(buffer)))
+
+
+class _QuantizedModel(nn.Module):
+    "Wraps a quantized model so that it can be used, exported and loaded with a `Learner`"
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        # fastai finds the model device through its parameters, but a quantized model may not have any
+        self.device_param = nn.Parameter(torch.empty(0), requires_grad=False)
+    def forward(self, *x): return self.model(*x)
+    def __reduce_ex__(self, protocol):
+        # quantized fx models can't be unpickled, so they are scripted and saved with torch.jit
+        if not isinstance(self.model, torch.jit.ScriptModule): return super().__reduce_ex__(protocol)
+        buffer = io.BytesIO()
+        torch.jit.save(self.model, buffer)
+        return _load_scripted_model, (buffer.getvalue(),)
+
+
+def _quantized_splitter(model): return [trainable_params(model)] # a quantized model may have no trainable params
+
+
+def _validate_model(learn, model, dl):
+    old_model = learn.model
+    try:
+        learn.model = model
+        with learn.no_bar(), learn.no_logging(): return learn.validate(dl=dl)
+    finally: learn.model = old_model
+
+
+def quantize(
+    learn:Learner, # trained learner with a CPU model
+    calib_dl=None, # dataloader used to calibrate activations when mode='static'. Defaults to learn.dls.train
+    mode:str='dynamic', # 'dynamic' (int8 weights in linear and rnn layers) or 'static' (int8 weights and activations)
+    valid_dl=None, # dataloader used to report the metrics and speed change. Defaults to learn.dls.valid. False to skip it
+    n_batches:int=10, # maximum number of batches used to calibrate the model
+    backend:str=None, # quantized engine. Defaults to torch.backends.quantized.engine
+    verbose:bool=True, # prints the metrics and speed change
+)->Learner: # a copy of learn with the quantized model that can be saved with `export`
+    "Returns a copy of `learn` with its model quantized to int8 for CPU inference."
+    from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+    assert mode in ['dynamic', 'static'], "mode must be 'dynamic' or 'static'"
+    backend = backend or torch.backends.quantized.engine
+    torch.backends.quantized.engine = backend
+    n_inp = learn.dls.n_inp
+    model = deepcopy(learn.model).cpu().eval()
+    calib_dl = ifnone(calib_dl, learn.dls.train)
+    xb = to_device(tuple(calib_dl.one_batch()[:n_inp]), 'cpu')
+    qmodel = None
+    if mode == 'static':
+        try:
+            model = prepare_fx(_quantizable_model(model), get_default_qconfig_mapping(backend), xb)
+        except Exception as e:
+            warnings.warn(f"static quantization not supported by {learn.model.__class__.__name__} ({e}). Using mode='dynamic' instead.")
+            mode = 'dynamic'
+        else:
+            with torch.no_grad():
+                for i, b in enumerate(calib_dl):
+                    if i >= n_batches: break
+                    model(*to_device(tuple(b[:n_inp]), 'cpu'))
+            qmodel = convert_fx(model)
+            try: qmodel = torch.jit.script(qmodel)
+            except Exception: pass
+    if mode == 'dynamic':
+        qmodel = quantize_dynamic(deepcopy(learn.model).cpu().eval(), {nn.Linear, nn.LSTM, nn.GRU}, dtype=torch.qint8)
+    qmodel = _QuantizedModel(qmodel)
+    # a new learner (with its own callbacks) is created so that learn is not modified
+    qlearn = Learner(learn.dls, qmodel, loss_func=learn.loss_func, metrics=[copy(m) for m in learn.metrics], splitter=_quantized_splitter,
+                     path=learn.path, model_dir=learn.model_dir)
+    valid_dl = ifnone(valid_dl, learn.dls.valid)
+    if valid_dl:
+        model = deepcopy(learn.model).eval()
+        vals, qvals = _validate_model(qlearn, model, valid_dl), _validate_model(qlearn, qmodel, valid_dl)
+        with torch.no_grad(): t, qt = time_fn(lambda: model(*xb)), time_fn(lambda: qmodel(*xb))
+        qlearn.quantize_stats = {'mode': mode, 'values': vals, 'quantized_values': qvals, 'delta': [qv - v for v, qv in zip(vals, qvals)],
+                                 'speedup': t / qt}
+        if verbose:
+            names = ['valid_loss'] + [m.name for m in learn.metrics]
+            for n, v, qv in zip(names, vals, qvals): print(f"{n:>15}: {v:.6f} -> {qv:.6f} ({qv - v:+.6f})")
+            print(f"{'batch time':>15}: {t * 1000:.3f} ms -> {qt * 1000:.3f} ms (speedup: {t / qt:.2f}x)")
+    return qlearn
+
+# %% ../nbs/019_inference.ipynb 7
+class _ExportModel(nn.Module):
+    "Embeds the fitted input selection (`sel_vars`, `sel_steps`) and batch preprocessing in front of a model"
+    def __init__(self, model, tfms=None, sel_vars=None, sel_steps=None):
+        super().__init__()
+        self.model, self.tfms = model, tfms
+        self.sel_vars, self.sel_steps = [s if s is None or isinstance(s, slice) else torch.as_tensor(s) for s in (sel_vars, sel_steps)]
+        self.multi_idx = not (_is_all(sel_vars) and _is_all(sel_steps))
+    def forward(self, x):
+        from tsai.data.core import TSTensor
+        if self.multi_idx: x = x[..., ifnone(self.sel_vars, slice(None)), ifnone(self.sel_steps, slice(None))]
+        if self.tfms: x = self.tfms(TSTensor(x)).as_subclass(torch.Tensor)
+        return self.model(x)
+
+
+def _is_all(sel): return sel is None or (isinstance(sel, slice) and sel == slice(None))
+
+
+def _export_input(learn, X=None, bs=2):
+    "Returns a raw input batch (before `sel_vars`, `sel_steps` and batch tfms are applied)"
+    if X is None:
+        ds = learn.dls.valid.dataset
+        X = ds.tls[0].items if hasattr(ds, 'tls') else learn.dls.valid.one_batch()[0]
+    return torch.as_tensor(np.asarray(X[:bs]), dtype=torch.float32)
+
+
+def _check_outputs(model, exported, xb):
+    with torch.no_grad(): torch.testing.assert_close(exported(xb), model(xb), rtol=1e-4, atol=1e-4)
+
+
+def _to_torchscript(model, xb, dynamic_batch=True):
+    "Scripts `model` (or traces it when it can't be scripted) and returns the exported model and the method used"
+    model = model.eval()
+    try:
+        exported = torch.jit.script(model)
+        _check_outputs(model, exported, xb)
+        method = 'script'
+    except Exception:
+        with torch.no_grad(): exported = torch.jit.trace(model, xb, check_trace=False)
+        _check_outputs(model, exported, xb)
+        method = 'trace'
+    if dynamic_batch: _check_outputs(model, exported, torch.cat([xb, xb, xb]))
+    return exported, method
+
+
+def _to_onnx(model, xb, fname, dynamic_batch=True, opset_version=None):
+    with torch.no_grad():
+        torch.onnx.export(model.eval(), xb, str(fname), input_names=['input'], output_names=['output'], opset_version=opset_version,
+                          dynamic_axes={'input': {0: 'batch_size'}, 'output': {0: 'batch_size'}} if dynamic_batch else None)
+
+
+def export_model(
+    learn:Learner, # trained learner
+    fname:str='export', # file name without extension
+    path:str='.', # folder where the exported model will be saved
+    format:str='torchscript', # 'torchscript' (.pt) or 'onnx' (.onnx)
+    dynamic_batch:bool=True, # allows any batch size in the exported model
+    X=None, # raw input data (before `sel_vars`, `sel_steps` and batch tfms) used to export the model. Defaults to the dataset items
+    opset_version:int=None, # onnx opset version
+    verbose:bool=True, # prints the export method and path
+)->Path: # path to the exported model
+    "Exports `learn.model` with the fitted `sel_vars`, `sel_steps` and batch tfms (like `TSStandardize`) embedded in the graph."
+    assert format in ['torchscript', 'onnx'], "format must be 'torchscript' or 'onnx'"
+    ds = learn.dls.valid.dataset
+    model = deepcopy(learn.model).cpu().eval()
+    tfms = deepcopy(learn.dls.valid.after_batch) if len(learn.dls.valid.after_batch.fs) else None
+    xb = _export_input(learn, X)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    if format == 'torchscript':
+        # the model is scripted when possible (to keep any data-dependent control flow) and the preprocessing is traced around it
+        pre = _ExportModel(nn.Identity(), tfms, getattr(ds, 'sel_vars', None), getattr(ds, 'sel_steps', None))
+        exported, method = _to_torchscript(model, pre(xb), dynamic_batch=dynamic_batch)
+        if pre.multi_idx or pre.tfms:
+            pre.model = exported
+            with torch.no_grad(): exported = torch.jit.trace(pre, xb, check_trace=False)
+            pre.model = model
+            _check_outputs(pre, exported, xb)
+        fname = path/f'{fname}.pt'
+        torch.jit.save(exported, fname)
+    else:
+        method = 'onnx'
+        fname = path/f'{fname}.onnx'
+        _to_onnx(_ExportModel(model, tfms, getattr(ds, 'sel_vars', None), getattr(ds, 'sel_steps', None)), xb, fname,
+                 dynamic_batch=dynamic_batch, opset_version=opset_version)
+    if verbose: print(f"{learn.model.__class__.__name__} exported ({method}) to {fname}")
+    return fname
+
+
+def _time_exported(f, n_iters=10):
+    "Average latency of `f` (ms), or nan if it fails"
+    try:
+        with torch.no_grad(): return time_fn(f, n_iters) * 1000
+    except Exception: return np.nan
+
+
+def benchmark_export(
+    archs:list=None, # architecture names (or classes). Defaults to all architectures in `tsai.learner.all_arch_names`
+    c_in:int=3, # number of input variables
+    c_out:int=2, # number of outputs
+    seq_len:int=64, # input sequence length
+    bss:tuple=(1, 16, 64), # batch sizes used to measure latency
+    onnx:bool=None, # also exports to onnx. Defaults to True if onnxruntime is installed
+    n_iters:int=10, # number of iterations used to measure latency
+    verbose:bool=False, # prints the result of each architecture
+)->pd.DataFrame: # one row per architecture with the export method and eager vs exported latency (ms) per batch size
+    "Exports each architecture to torchscript (and onnx) and compares eager vs exported CPU inference latency at several batch sizes."
+    import tempfile
+    import warnings
+    from tsai.models.utils import _arch_name, _bench_archs, _build_bench_model
+    if onnx is None:
+        try:
+            import onnxruntime
+            onnx = True
+        except ImportError: onnx = False
+    if onnx: import onnxruntime as ort
+    archs = _bench_archs(archs)
+    rows = []
+    for arch in archs:
+        name = _arch_name(arch)
+        row = {'arch': name, 'torchscript': None}
+        if onnx: row['onnx'] = None
+        try:
+            model = _build_bench_model(arch, c_in, c_out, seq_len).eval()
+            xb = torch.randn(max(bss), c_in, seq_len)
+            with torch.no_grad(): model(xb[:2])
+        except Exception:
+            row['torchscript'] = 'not buildable'
+            rows.append(row)
+            if verbose: print(f"{name:>25}: not buildable")
+            continue
+        try: exported, row['torchscript'] = _to_torchscript(model, xb[:2])
+        except Exception: exported, row['torchscript'] = None, 'failed'
+        sess = None
+        if onnx:
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        _to_onnx(model, xb[:2], f'{tmp}/model.onnx')
+                    sess = ort.InferenceSession(f'{tmp}/model.onnx')
+                    row['onnx'] = 'ok'
+                except Exception: row['onnx'] = 'failed'
+        for bs in bss:
+            row[f'eager_{bs}'] = _time_exported(partial(model, xb[:bs]), n_iters)
+            row[f'torchscript_{bs}'] = _time_exported(partial(exported, xb[:bs]), n_iters) if exported is not None else np.nan
+            if onnx:
+                inp = {'input': xb[:bs].numpy()}
+                row[f'onnx_{bs}'] = _time_exported(partial(sess.run, None, inp), n_iters) if sess is not None else np.nan
+        if verbose: print(f"{name:>25}: {row['torchscript']}" + (f" onnx: {row['onnx']}" if onnx else ''))
+        rows.append(row)
+    return pd.DataFrame(rows)
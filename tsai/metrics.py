@@ -2,8 +2,10 @@
 
 # %% auto 0
 __all__ = ['recall_at_specificity', 'lift', 'lift_at_specificity', 'top_k_lift', 'mean_per_class_accuracy', 'mAP',
-           'MatthewsCorrCoefBinary', 'get_task_metrics', 'accuracy_multi', 'metrics_multi_common', 'precision_multi',
-           'recall_multi', 'specificity_multi', 'balanced_accuracy_multi', 'Fbeta_multi', 'F1_multi', 'mae', 'mape']
+           'approx_recall_at_specificity', 'approx_lift', 'approx_lift_at_specificity', 'approx_top_k_lift',
+           'approx_mAP', 'MatthewsCorrCoefBinary', 'get_task_metrics', 'accuracy_multi', 'metrics_multi_common',
+           'precision_multi', 'recall_multi', 'specificity_multi', 'balanced_accuracy_multi', 'Fbeta_multi', 'F1_multi',
+           'mae', 'mape', 'HistogramMetric']
 
 # %% ../nbs/017_metrics.ipynb 3
 import sklearn.metrics as skm
@@ -210,3 +212,92 @@ def _mAP(inp, targ):
     return skm.average_precision_score(targ[:, mask], inp[:, mask])
 
 mAP = AccumMetric(_mAP, dim_argmax=-1, activation=ActivationType.Softmax, flatten=False, name='mAP')
+
+# %% ../nbs/017_metrics.ipynb 15
+class HistogramMetric(AccumMetric):
+    """Accumulates fixed-bin histograms of the predicted probabilities of positive and negative targets (per class) on the device,
+    instead of storing all predictions, and calculates `func(hist_pos, hist_neg, **kwargs)` at the end of the epoch.
+    Scores are quantized to `n_bins` uniform bins in [0, 1], which bounds the approximation error. 
+    Use the `AccumMetric` versions for exact results."""
+    def __init__(self, func, n_bins=1000, activation=ActivationType.BinarySoftmax, name=None, **kwargs):
+        super().__init__(func, dim_argmax=-1, activation=activation, flatten=False, name=name, **kwargs)
+        self.n_bins = n_bins
+
+    def reset(self): self.hist_pos, self.hist_neg = None, None
+
+    def accum_values(self, preds, targs, learn=None):
+        preds, targs = preds.detach().as_subclass(Tensor), targs.detach().as_subclass(Tensor)
+        if preds.ndim == 1: preds, targs = preds[:, None], (targs.reshape(-1, 1) == 1)
+        else:
+            n_classes = preds.shape[-1]
+            preds = preds.reshape(-1, n_classes)
+            if targs.numel() != preds.numel(): targs = F.one_hot(targs.flatten().long(), n_classes)
+            targs = targs.reshape(-1, n_classes).bool()
+        n_classes = preds.shape[-1]
+        if self.hist_pos is None:
+            self.hist_pos, self.hist_neg = [torch.zeros(n_classes, self.n_bins, dtype=torch.long, device=preds.device) for _ in range(2)]
+        # bin i contains scores in (i/n_bins, (i+1)/n_bins]
+        bins = ((preds.float() * self.n_bins).ceil().long() - 1).clamp(0, self.n_bins - 1) + torch.arange(n_classes, device=preds.device) * self.n_bins
+        self.hist_pos += torch.bincount(bins[targs], minlength=n_classes * self.n_bins).view(n_classes, -1)
+        self.hist_neg += torch.bincount(bins[~targs], minlength=n_classes * self.n_bins).view(n_classes, -1)
+
+    @property
+    def value(self):
+        if self.hist_pos is None: return
+        return self.func(self.hist_pos.cpu().double(), self.hist_neg.cpu().double(), **self.kwargs)
+
+
+def _hist_above(h, k):
+    "Returns the mass of each histogram in `h` above the score of its k-th largest element (linear interpolation within a bin)"
+    above = h.flip(-1).cumsum(-1).flip(-1)
+    above_next = torch.cat([above[..., 1:], torch.zeros_like(above[..., :1])], -1)
+    b = ((above >= k).sum(-1) - 1).clamp(min=0) # bin that contains the k-th largest element
+    frac = ((k - above_next.gather(-1, b[..., None])) / h.gather(-1, b[..., None]).clamp(min=1)).clamp(0, 1)
+    return b[..., None], frac, above_next.gather(-1, b[..., None])
+
+def _hist_recall_at_specificity(hist_pos, hist_neg, specificity=.95):
+    hp, hn = hist_pos[0], hist_neg[0]
+    k = max(1, int(hn.sum() * (1 - specificity)))
+    b, frac, _ = _hist_above(hn, k)
+    pos_above = hp[b[0] + 1:].sum() + frac[0] * hp[b[0]]
+    return (pos_above / hp.sum()).item()
+
+def _hist_lift(hist_pos, hist_neg):
+    hp, hn = hist_pos[0], hist_neg[0]
+    n_bins = len(hp)
+    # argmax == 1 when the probability of the positive class is > 0.5
+    half = n_bins / 2
+    b, frac = int(half), 1 - (half - int(half))
+    pos_sel = hp[b + 1:].sum() + frac * hp[b] if b < n_bins else 0
+    all_sel = pos_sel + (hn[b + 1:].sum() + frac * hn[b] if b < n_bins else 0)
+    return (pos_sel / all_sel / (hp.sum() / (hp.sum() + hn.sum()))).item()
+
+def _hist_lift_at_specificity(hist_pos, hist_neg, specificity=.95):
+    hp, hn = hist_pos[0], hist_neg[0]
+    k = max(1, int(hn.sum() * (1 - specificity)))
+    b, frac, _ = _hist_above(hn, k)
+    pos_sel = hp[b[0] + 1:].sum() + frac[0] * hp[b[0]]
+    return (pos_sel / (pos_sel + k) / (hp.sum() / (hp.sum() + hn.sum()))).item()
+
+def _hist_top_k_lift(hist_pos, hist_neg, k=.01):
+    hp, hn = hist_pos[0], hist_neg[0]
+    h = hp + hn
+    top_k = max(1, int(k * h.sum()))
+    b, frac, _ = _hist_above(h, top_k)
+    pos_sel = hp[b[0] + 1:].sum() + frac[0] * hp[b[0]]
+    return (pos_sel / top_k / (hp.sum() / h.sum())).item()
+
+def _hist_mAP(hist_pos, hist_neg):
+    "Mean average precision calculated from histograms (all scores in a bin are treated as ties, as sklearn does)"
+    tp, fp = hist_pos.flip(-1).cumsum(-1), hist_neg.flip(-1).cumsum(-1)
+    n_pos = tp[:, -1:]
+    precision = tp / (tp + fp).clamp(min=1)
+    recall_delta = hist_pos.flip(-1) / n_pos.clamp(min=1)
+    mask = n_pos[:, 0] > 0 # this avoid nan when a class is not present in the target
+    return (recall_delta * precision).sum(-1)[mask].mean().item()
+
+approx_recall_at_specificity = HistogramMetric(_hist_recall_at_specificity, specificity=.95, name='approx_recall_at_specificity')
+approx_lift = HistogramMetric(_hist_lift, name='approx_lift')
+approx_lift_at_specificity = HistogramMetric(_hist_lift_at_specificity, specificity=.95, name='approx_lift_at_specificity')
+approx_top_k_lift = HistogramMetric(_hist_top_k_lift, k=.01, name='approx_top_k_lift')
+approx_mAP = HistogramMetric(_hist_mAP, activation=ActivationType.Softmax, name='approx_mAP')
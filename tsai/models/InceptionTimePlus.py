@@ -64,8 +64,8 @@ class InceptionModulePlus(Module):
 @delegates(InceptionModulePlus.__init__)
 class InceptionBlockPlus(Module):
     def __init__(self, ni, nf, residual=True, depth=6, coord=False, norm='Batch', zero_norm=False, act=nn.ReLU, act_kwargs={}, sa=False, se=None, 
-                 stoch_depth=1., **kwargs):
-        self.residual, self.depth = residual, depth
+                 stoch_depth=1., checkpoint_layers=False, **kwargs):
+        self.residual, self.depth, self.checkpoint_layers = residual, depth, checkpoint_layers
         self.inception, self.shortcut, self.act = nn.ModuleList(), nn.ModuleList(), nn.ModuleList()
         for d in range(depth):
             self.inception.append(InceptionModulePlus(ni if d == 0 else nf * 4, nf, coord=coord, norm=norm, 
@@ -87,7 +87,7 @@ class InceptionBlockPlus(Module):
         res = x
         for i in range(self.depth):
             if self.keep_prob[i] > random.random() or not self.training:
-                x = self.inception[i](x)
+                x = checkpoint_layer(self.inception[i], x) if self.checkpoint_layers else self.inception[i](x)
             if self.residual and i % 3 == 2: 
                 res = x = self.act[i//3](self.add(x, self.shortcut[i//3](res)))
         return x
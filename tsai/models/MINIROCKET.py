@@ -6,6 +6,7 @@ __all__ = ['MiniRocketClassifier', 'load_minirocket', 'MiniRocketRegressor', 'Mi
 
 # %% ../../nbs/055_models.MINIROCKET.ipynb 3
 import sklearn
+from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import VotingClassifier, VotingRegressor
 from sklearn.linear_model import RidgeClassifierCV, RidgeCV
 from sklearn.metrics import make_scorer
@@ -115,21 +116,70 @@ def load_minirocket(fname, path='./models'):
 class MiniRocketVotingClassifier(VotingClassifier):
     """Time series classification ensemble using MINIROCKET features, a linear classifier and majority voting"""
     def __init__(self, n_estimators=5, weights=None, n_jobs=-1, num_features=10_000, max_dilations_per_kernel=32, random_state=None, 
-                 alphas=np.logspace(-3, 3, 7), normalize_features=True, memory=None, verbose=False, scoring=None, class_weight=None, **kwargs):
+                 alphas=np.logspace(-3, 3, 7), normalize_features=True, memory=None, verbose=False, scoring=None, class_weight=None, 
+                 shared_features=False, max_features=.5, **kwargs):
+        """ shared_features = False --> each estimator is a MiniRocketClassifier that calculates its own MINIROCKET features.
+        
+        shared_features = True --> a single MINIROCKET transform (num_features) is fitted and applied once to the data, and each 
+        estimator fits a linear classifier on a random subset (max_features) of those features. Use a larger num_features to draw 
+        different subsets from a wider transform. max_features=1. uses all features in all estimators (identical estimators).
+        """
         store_attr()
+        self.kwargs = kwargs
         
         try: 
             import sktime
         except ImportError: 
             raise ImportError("You need to install sktime to be able to use MiniRocketVotingClassifier")
             
-        estimators = [(f'est_{i}', MiniRocketClassifier(num_features=num_features, max_dilations_per_kernel=max_dilations_per_kernel, 
-                                                       random_state=random_state, alphas=alphas, normalize_features=normalize_features, memory=memory, 
-                                                       verbose=verbose, scoring=scoring, class_weight=class_weight, **kwargs)) 
-                    for i in range(n_estimators)]
+        if shared_features:
+            estimators = [(f'est_{i}', self._get_head()) for i in range(n_estimators)]
+        else:
+            estimators = [(f'est_{i}', MiniRocketClassifier(num_features=num_features, max_dilations_per_kernel=max_dilations_per_kernel, 
+                                                           random_state=random_state, alphas=alphas, normalize_features=normalize_features, 
+                                                           memory=memory, verbose=verbose, scoring=scoring, class_weight=class_weight, **kwargs)) 
+                          for i in range(n_estimators)]
         super().__init__(estimators, voting='hard', weights=weights, n_jobs=n_jobs, verbose=verbose)
 
+    def _get_head(self, feature_idxs=slice(None)):
+        "Linear classifier fitted on (a subset of) the shared MINIROCKET features"
+        steps = [('features', ColumnTransformer([('features', 'passthrough', feature_idxs)]))]
+        if self.normalize_features:
+            steps += [('scalar', StandardScaler(with_mean=False))]
+        steps += [('ridgeclassifiercv', RidgeClassifierCV(alphas=self.alphas, scoring=self.scoring, class_weight=self.class_weight, **self.kwargs))]
+        return sklearn.pipeline.Pipeline(steps, memory=self.memory)
+
+    def transform_features(self, X):
+        "Calculates the shared MINIROCKET features once for all estimators"
+        return np.asarray(self.minirocketmultivariate_.transform(X))
+
+    def fit(self, X, y, *args, **kwargs):
+        if not self.shared_features: return super().fit(X, y, *args, **kwargs)
+        from sktime.transformations.panel.rocket._minirocket_multivariate import MiniRocketMultivariate
+        self.minirocketmultivariate_ = MiniRocketMultivariate(num_kernels=self.num_features, 
+                                                              max_dilations_per_kernel=self.max_dilations_per_kernel,
+                                                              random_state=self.random_state)
+        self.minirocketmultivariate_.fit(X)
+        X_feat = self.transform_features(X)
+        n_features = X_feat.shape[1]
+        n_subset = min(n_features, max(1, int(round(self.max_features * n_features))))
+        rng = np.random.default_rng(self.random_state)
+        self.estimators = [(name, self._get_head(np.sort(rng.choice(n_features, n_subset, replace=False)) if n_subset < n_features else slice(None)))
+                           for name, _ in self.estimators]
+        return super().fit(X_feat, y, *args, **kwargs)
+
+    def predict(self, X):
+        if not self.shared_features: return super().predict(X)
+        return super().predict(self.transform_features(X))
+
+    def transform(self, X):
+        if not self.shared_features: return super().transform(X)
+        return super().transform(self.transform_features(X))
+
     def __repr__(self):   
+        if self.shared_features:
+            return (f'MiniRocketVotingClassifier(n_estimators={self.n_estimators}, shared_features=True, num_features={self.num_features}, '
+                    f'max_features={self.max_features}, \nsteps={self.estimators[0][1].steps})')
         return f'MiniRocketVotingClassifier(n_estimators={self.n_estimators}, \nsteps={self.estimators[0][1].steps})'
 
     def save(self, fname=None, path='./models'):
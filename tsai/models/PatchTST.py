@@ -10,7 +10,7 @@ import torch
 from torch import nn
 import torch.nn.functional as F
 from torch import Tensor
-from .layers import Transpose, get_act_fn, RevIN
+from .layers import Transpose, get_act_fn, RevIN, checkpoint_layer
 warnings.filterwarnings("ignore", category=UserWarning)
 
 # %% ../../nbs/050b_models.PatchTST.ipynb 4
@@ -246,7 +246,7 @@ class _TSTiEncoderLayer(nn.Module):
         else:
             src2, attn = self.self_attn(src, src, src)
         if self.store_attn:
-            self.attn = attn
+            self.attn = attn.detach() # only used to visualize attention. Not keeping the graph alive saves memory
         ## Add & Norm
         src = src + self.dropout_attn(src2) # Add: residual connection with residual dropout
         if not self.pre_norm:
@@ -271,7 +271,7 @@ class _TSTiEncoderLayer(nn.Module):
 class _TSTiEncoder(nn.Module):  #i means channel-independent
     def __init__(self, c_in, patch_num, patch_len, n_layers=3, d_model=128, n_heads=16, d_k=None, d_v=None, 
                  d_ff=256, norm='BatchNorm', attn_dropout=0., dropout=0., act="gelu", store_attn=False, 
-                 res_attention=True, pre_norm=False):
+                 res_attention=True, pre_norm=False, checkpoint_layers=False):
         
         super().__init__()
         
@@ -297,6 +297,7 @@ class _TSTiEncoder(nn.Module):  #i means channel-independent
                                                       activation=act, res_attention=res_attention,
                                                       pre_norm=pre_norm, store_attn=store_attn) for i in range(n_layers)])
         self.res_attention = res_attention
+        self.checkpoint_layers = checkpoint_layers
 
         
     def forward(self, x:Tensor):
@@ -314,12 +315,13 @@ class _TSTiEncoder(nn.Module):  #i means channel-independent
         x = self.dropout(x + self.W_pos)                                         # x: [bs * nvars x patch_num x d_model]
 
         # Encoder
+        layer = checkpoint_layer if self.checkpoint_layers else lambda mod, *args, **kwargs: mod(*args, **kwargs)
         if self.res_attention:
             scores = None
             for mod in self.layers: 
-                x, scores = mod(x, prev=scores)
+                x, scores = layer(mod, x, prev=scores)
         else:
-            for mod in self.layers: x = mod(x)
+            for mod in self.layers: x = layer(mod, x)
         x = torch.reshape(x, (-1,n_vars,x.shape[-2],x.shape[-1]))                # x: [bs x nvars x patch_num x d_model]
         x = x.permute(0,1,3,2)                                                   # x: [bs x nvars x d_model x patch_num]
         
@@ -332,7 +334,7 @@ class _PatchTST_backbone(nn.Module):
                  d_ff=256, norm='BatchNorm', attn_dropout=0., dropout=0., 
                  act="gelu", res_attention=True, pre_norm=False, store_attn=False,
                  padding_patch=True, individual=False, 
-                 revin=True, affine=True, subtract_last=False):
+                 revin=True, affine=True, subtract_last=False, checkpoint_layers=False):
         
         super().__init__()
         
@@ -356,7 +358,8 @@ class _PatchTST_backbone(nn.Module):
         self.backbone = _TSTiEncoder(c_in, patch_num=patch_num, patch_len=patch_len,
                                      n_layers=n_layers, d_model=d_model, n_heads=n_heads, d_k=d_k, d_v=d_v, d_ff=d_ff,
                                      attn_dropout=attn_dropout, dropout=dropout, act=act,
-                                     res_attention=res_attention, pre_norm=pre_norm, store_attn=store_attn)
+                                     res_attention=res_attention, pre_norm=pre_norm, store_attn=store_attn, 
+                                     checkpoint_layers=checkpoint_layers)
 
         # Head
         self.head_nf = d_model * patch_num
@@ -418,6 +421,7 @@ class PatchTST(nn.Module):
          pre_norm=False, # flag to indicate if normalization is applied as the first step in the sublayers
          res_attention=True,  # flag to indicate if Residual MultiheadAttention should be used
          store_attn=False,  # can be used to visualize attention weights
+         checkpoint_layers=False,  # recompute encoder layer activations in the backward pass to reduce memory use
          ):
 
         super().__init__()
@@ -434,13 +438,15 @@ class PatchTST(nn.Module):
                                                   n_heads=n_heads, d_ff=d_ff, norm=norm, attn_dropout=attn_dropout,
                                                   dropout=dropout, act=activation, res_attention=res_attention, pre_norm=pre_norm, 
                                                   store_attn=store_attn, padding_patch=padding_patch, 
-                                                  individual=individual, revin=revin, affine=affine, subtract_last=subtract_last)
+                                                  individual=individual, revin=revin, affine=affine, subtract_last=subtract_last, 
+                                                  checkpoint_layers=checkpoint_layers)
             self.model_res = _PatchTST_backbone(c_in=c_in, seq_len=seq_len, pred_dim=pred_dim, 
                                                 patch_len=patch_len, stride=stride, n_layers=n_layers, d_model=d_model,
                                                 n_heads=n_heads, d_ff=d_ff, norm=norm, attn_dropout=attn_dropout,
                                                 dropout=dropout, act=activation, res_attention=res_attention, pre_norm=pre_norm, 
                                                 store_attn=store_attn, padding_patch=padding_patch, 
-                                                individual=individual, revin=revin, affine=affine, subtract_last=subtract_last)
+                                                individual=individual, revin=revin, affine=affine, subtract_last=subtract_last, 
+                                                checkpoint_layers=checkpoint_layers)
             self.patch_num = self.model_trend.patch_num
         else:
             self.model = _PatchTST_backbone(c_in=c_in, seq_len=seq_len, pred_dim=pred_dim, 
@@ -448,7 +454,8 @@ class PatchTST(nn.Module):
                                             n_heads=n_heads, d_ff=d_ff, norm=norm, attn_dropout=attn_dropout,
                                             dropout=dropout, act=activation, res_attention=res_attention, pre_norm=pre_norm, 
                                             store_attn=store_attn, padding_patch=padding_patch, 
-                                            individual=individual, revin=revin, affine=affine, subtract_last=subtract_last)
+                                            individual=individual, revin=revin, affine=affine, subtract_last=subtract_last, 
+                                            checkpoint_layers=checkpoint_layers)
             self.patch_num = self.model.patch_num
 
     def forward(self, x):
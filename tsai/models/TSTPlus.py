@@ -59,7 +59,7 @@ class _TSTEncoderLayer(Module):
         else:
             src2, attn = self.self_attn(src, src, src, key_padding_mask=key_padding_mask, attn_mask=attn_mask)
         if self.store_attn: 
-            self.attn = attn
+            self.attn = attn.detach() # only used to visualize attention. Not keeping the graph alive saves memory
         ## Add & Norm
         src = src + self.dropout_attn(src2) # Add: residual connection with residual dropout
         if not self.pre_norm:
@@ -83,21 +83,23 @@ class _TSTEncoderLayer(Module):
 # %% ../../nbs/050_models.TSTPlus.ipynb 9
 class _TSTEncoder(Module):
     def __init__(self, q_len, d_model, n_heads, d_k=None, d_v=None, d_ff=None, norm='BatchNorm', attn_dropout=0., dropout=0., activation='gelu', 
-                 res_attention=False, n_layers=1, pre_norm=False, store_attn=False):
+                 res_attention=False, n_layers=1, pre_norm=False, store_attn=False, checkpoint_layers=False):
         self.layers = nn.ModuleList([_TSTEncoderLayer(q_len, d_model, n_heads=n_heads, d_k=d_k, d_v=d_v, d_ff=d_ff, norm=norm, 
                                                       attn_dropout=attn_dropout, dropout=dropout, 
                                                       activation=activation, res_attention=res_attention, 
                                                       pre_norm=pre_norm, store_attn=store_attn) for i in range(n_layers)])
         self.res_attention = res_attention
+        self.checkpoint_layers = checkpoint_layers
 
     def forward(self, src:Tensor, key_padding_mask:Optional[Tensor]=None, attn_mask:Optional[Tensor]=None):
         output = src
         scores = None
+        layer = checkpoint_layer if self.checkpoint_layers else lambda mod, *args, **kwargs: mod(*args, **kwargs)
         if self.res_attention:
-            for mod in self.layers: output, scores = mod(output, prev=scores, key_padding_mask=key_padding_mask, attn_mask=attn_mask)
+            for mod in self.layers: output, scores = layer(mod, output, prev=scores, key_padding_mask=key_padding_mask, attn_mask=attn_mask)
             return output
         else:
-            for mod in self.layers: output = mod(output, key_padding_mask=key_padding_mask, attn_mask=attn_mask)
+            for mod in self.layers: output = layer(mod, output, key_padding_mask=key_padding_mask, attn_mask=attn_mask)
             return output
 
 # %% ../../nbs/050_models.TSTPlus.ipynb 10
@@ -106,7 +108,7 @@ class _TSTBackbone(Module):
                  n_layers=3, d_model=128, n_heads=16, d_k=None, d_v=None,
                  d_ff=256, norm='BatchNorm', attn_dropout=0., dropout=0., act="gelu", store_attn=False,
                  key_padding_mask='auto', padding_var=None, attn_mask=None, res_attention=True, pre_norm=False,
-                 pe='zeros', learn_pe=True, verbose=False, **kwargs):
+                 pe='zeros', learn_pe=True, checkpoint_layers=False, verbose=False, **kwargs):
 
         # Input encoding
         q_len = seq_len
@@ -137,7 +139,8 @@ class _TSTBackbone(Module):
 
         # Encoder
         self.encoder = _TSTEncoder(q_len, d_model, n_heads, d_k=d_k, d_v=d_v, d_ff=d_ff, norm=norm, attn_dropout=attn_dropout, dropout=dropout, 
-                                   pre_norm=pre_norm, activation=act, res_attention=res_attention, n_layers=n_layers, store_attn=store_attn)
+                                   pre_norm=pre_norm, activation=act, res_attention=res_attention, n_layers=n_layers, store_attn=store_attn, 
+                                   checkpoint_layers=checkpoint_layers)
         self.transpose = Transpose(-1, -2, contiguous=True)
         self.key_padding_mask, self.padding_var, self.attn_mask = key_padding_mask, padding_var, attn_mask
 
@@ -221,7 +224,7 @@ class TSTPlus(nn.Sequential):
                  padding_var:Optional[int]=None, attn_mask:Optional[Tensor]=None, res_attention:bool=True, pre_norm:bool=False, store_attn:bool=False,
                  pe:str='zeros', learn_pe:bool=True, flatten:bool=True, fc_dropout:float=0.,
                  concat_pool:bool=False, bn:bool=False, custom_head:Optional[Callable]=None,
-                 y_range:Optional[tuple]=None, verbose:bool=False, **kwargs):
+                 y_range:Optional[tuple]=None, checkpoint_layers:bool=False, verbose:bool=False, **kwargs):
         """
         Args:
             c_in: the number of features (aka variables, dimensions, channels) in the time series dataset.
@@ -255,6 +258,9 @@ class TSTPlus(nn.Sequential):
             bn: indicates if batchnorm will be applied to the head.
             custom_head: custom head that will be applied to the network. It must contain all kwargs (pass a partial function)
             y_range: range of possible y values (used in regression tasks).
+            checkpoint_layers: if True the activations of each encoder layer are recomputed during the backward pass instead of stored, 
+                               which reduces memory use with long sequences at the cost of extra compute. Setting res_attention=False 
+                               also avoids keeping the attention scores of every layer.
             kwargs: nn.Conv1d kwargs. If not {}, a nn.Conv1d with those kwargs will be applied to original time series.
         Input shape:
             x: bs (batch size) x nvars (aka features, variables, dimensions, channels) x seq_len (aka time steps)
@@ -266,7 +272,7 @@ class TSTPlus(nn.Sequential):
                                 n_layers=n_layers, d_model=d_model, n_heads=n_heads, d_k=d_k, d_v=d_v, d_ff=d_ff, 
                                 attn_dropout=attn_dropout, dropout=dropout, act=act, key_padding_mask=key_padding_mask, padding_var=padding_var,
                                 attn_mask=attn_mask, res_attention=res_attention, pre_norm=pre_norm, store_attn=store_attn, 
-                                pe=pe, learn_pe=learn_pe, verbose=verbose, **kwargs)
+                                pe=pe, learn_pe=learn_pe, checkpoint_layers=checkpoint_layers, verbose=verbose, **kwargs)
 
         # Head
         self.head_nf = d_model
@@ -43,7 +43,7 @@ class _TSiTEncoderLayer(nn.Module):
 # %% ../../nbs/068_models.TSiTPlus.ipynb 5
 class _TSiTEncoder(nn.Module):
     def __init__(self, d_model, n_heads, depth:int=6, q_len:int=None, attn_dropout:float=0., dropout:float=0, drop_path_rate:float=0., 
-                 mlp_ratio:int=1, lsa:bool=False, qkv_bias:bool=True, act:str='gelu', pre_norm:bool=False):
+                 mlp_ratio:int=1, lsa:bool=False, qkv_bias:bool=True, act:str='gelu', pre_norm:bool=False, checkpoint_layers:bool=False):
         super().__init__()
         dpr = [x.item() for x in torch.linspace(0, drop_path_rate, depth)]
         layers = []
@@ -53,9 +53,12 @@ class _TSiTEncoder(nn.Module):
             layers.append(layer)
         self.encoder = nn.Sequential(*layers)
         self.norm = nn.LayerNorm(d_model) if pre_norm else nn.Identity()
+        self.checkpoint_layers = checkpoint_layers
 
     def forward(self, x):
-        x = self.encoder(x)
+        if self.checkpoint_layers:
+            for layer in self.encoder: x = checkpoint_layer(layer, x)
+        else: x = self.encoder(x)
         x = self.norm(x)
         return x
 
@@ -65,7 +68,7 @@ class _TSiTBackbone(Module):
                  lsa:bool=False, qkv_bias:bool=True, attn_dropout:float=0., dropout:float=0., drop_path_rate:float=0., mlp_ratio:int=1, 
                  pre_norm:bool=False, use_token:bool=True,  use_pe:bool=True, n_cat_embeds:Optional[list]=None, cat_embed_dims:Optional[list]=None, 
                  cat_padding_idxs:Optional[list]=None, cat_pos:Optional[list]=None, feature_extractor:Optional[Callable]=None, 
-                 token_size:int=None, tokenizer:Optional[Callable]=None):
+                 token_size:int=None, tokenizer:Optional[Callable]=None, checkpoint_layers:bool=False):
 
         # Categorical embeddings
         if n_cat_embeds is not None:
@@ -114,7 +117,8 @@ class _TSiTBackbone(Module):
 
         # Encoder
         self.encoder = _TSiTEncoder(d_model, n_heads, depth=depth, q_len=seq_len + use_token, qkv_bias=qkv_bias, lsa=lsa, dropout=dropout,
-                                    mlp_ratio=mlp_ratio, drop_path_rate=drop_path_rate, act=act, pre_norm=pre_norm)
+                                    mlp_ratio=mlp_ratio, drop_path_rate=drop_path_rate, act=act, pre_norm=pre_norm, 
+                                    checkpoint_layers=checkpoint_layers)
 
     def forward(self, x):
 
@@ -192,6 +196,8 @@ class TSiTPlus(nn.Sequential):
         bias_init:          values used to initialized the output layer.
         y_range:            range of possible y values (used in regression tasks).        
         custom_head:        custom head that will be applied to the network. It must contain all kwargs (pass a partial function)
+        checkpoint_layers:  if True the activations of each encoder layer are recomputed during the backward pass instead of stored 
+                            to reduce memory use with long sequences.
         verbose:            flag to control verbosity of the model.
 
     Input:
@@ -204,7 +210,8 @@ class TSiTPlus(nn.Sequential):
                  cat_pos:Optional[list]=None, n_cat_embeds:Optional[list]=None, cat_embed_dims:Optional[list]=None, cat_padding_idxs:Optional[list]=None,
                  token_size:int=None, tokenizer:Optional[Callable]=None, feature_extractor:Optional[Callable]=None, 
                  flatten:bool=False, concat_pool:bool=True, fc_dropout:float=0., use_bn:bool=False, 
-                 bias_init:Optional[Union[float, list]]=None, y_range:Optional[tuple]=None, custom_head:Optional[Callable]=None, verbose:bool=True, **kwargs):
+                 bias_init:Optional[Union[float, list]]=None, y_range:Optional[tuple]=None, custom_head:Optional[Callable]=None, 
+                 checkpoint_layers:bool=False, verbose:bool=True, **kwargs):
 
         if use_token and c_out == 1: 
             use_token = False
@@ -213,7 +220,8 @@ class TSiTPlus(nn.Sequential):
                                  lsa=lsa, attn_dropout=attn_dropout, dropout=dropout, drop_path_rate=drop_path_rate, 
                                  pre_norm=pre_norm, mlp_ratio=mlp_ratio, use_pe=use_pe, use_token=use_token, 
                                  n_cat_embeds=n_cat_embeds, cat_embed_dims=cat_embed_dims, cat_padding_idxs=cat_padding_idxs, cat_pos=cat_pos, 
-                                 feature_extractor=feature_extractor, token_size=token_size, tokenizer=tokenizer)
+                                 feature_extractor=feature_extractor, token_size=token_size, tokenizer=tokenizer, 
+                                 checkpoint_layers=checkpoint_layers)
 
         self.head_nf = d_model
         self.c_out = c_out
@@ -1,7 +1,7 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../../nbs/032_models.explainability.ipynb.
 
 # %% auto 0
-__all__ = ['get_acts_and_grads', 'get_attribution_map']
+__all__ = ['get_acts_and_grads', 'get_attribution_map', 'get_attribution_maps']
 
 # %% ../../nbs/032_models.explainability.ipynb 3
 from fastai.callback.hook import *
@@ -48,3 +48,73 @@ def get_attribution_map(model, modules, x, y=None, detach=True, cpu=False, apply
     A_k, w_ck = get_acts_and_grads(model, modules, x, y, detach=detach, cpu=cpu)
     if is_listy(A_k): return [_get_attribution_map(A_k[i], w_ck[i]) for i in range(len(A_k))]
     else: return _get_attribution_map(A_k, w_ck)
+
+# %% ../../nbs/032_models.explainability.ipynb 5
+def get_attribution_maps(model, dl, modules=None, method='gradcam', use_y=False, apply_relu=True, by_class=False, return_maps=True, 
+                         fname=None, path='./data'):
+    r"""Computes per-sample attribution maps for all samples in a dataloader, batch by batch.
+
+    Hooks are registered once and only hold the current batch. Maps are written to a preallocated array (a memmap saved as
+    `{path}/{fname}.npy` if fname is provided). If by_class=True, per-class mean maps are also accumulated on the fly and
+    (maps, class_maps) is returned (maps is None when return_maps=False).
+
+    method: 'gradcam' (requires modules) or 'saliency' (absolute input gradients).
+    use_y: use the dataloader's targets instead of the predicted classes to select the output used for the gradients.
+
+    Unlike `get_attribution_map`, GradCAM weights are calculated per sample, so results don't depend on the batch."""
+    assert method in ['gradcam', 'saliency'], "method must be 'gradcam' or 'saliency'"
+    if method == 'gradcam':
+        assert modules is not None, "you must pass the module(s) used to calculate gradcam maps"
+        if not is_listy(modules): modules = [modules]
+    else: modules = []
+    dl = dl.new(shuffle=False, drop_last=False)
+    n_outputs = max(1, len(modules))
+    maps, class_sums, class_counts = [None] * n_outputs, [None] * n_outputs, None
+    training = model.training
+    model.eval()
+    start = 0
+    try:
+        with hook_outputs(modules, detach=False) as h_act:
+            for b in dl:
+                x = b[0].detach()
+                if method == 'saliency': x.requires_grad_(True)
+                with torch.enable_grad():
+                    preds = model(x).as_subclass(Tensor)
+                    if preds.ndim == 1: preds = preds[:, None]
+                    target = b[1].as_subclass(Tensor).long().reshape(-1) if use_y and len(b) > 1 else preds.argmax(-1)
+                    score = preds.gather(1, target[:, None]).sum()
+                    grads = torch.autograd.grad(score, [x] if method == 'saliency' else h_act.stored)
+                if method == 'saliency': batch_maps = [grads[0].abs()]
+                else:
+                    batch_maps = []
+                    for A_k, w_ck in zip(h_act.stored, grads):
+                        dim = tuple(range(2, A_k.ndim))
+                        L_c = (w_ck.mean(dim, keepdim=True) * A_k.detach()).sum(1)
+                        if apply_relu: L_c = F.relu(L_c)
+                        if L_c.ndim == 2: L_c = L_c.unsqueeze(1).repeat(1, x.shape[1], 1)
+                        batch_maps.append(L_c)
+                bs = len(x)
+                if by_class:
+                    counts = torch.bincount(target, minlength=preds.shape[-1]).cpu()
+                    class_counts = counts if class_counts is None else class_counts + counts
+                for i, bm in enumerate(batch_maps):
+                    if return_maps:
+                        if maps[i] is None:
+                            shape = (dl.n, *bm.shape[1:])
+                            if fname is None: maps[i] = np.empty(shape, dtype='float32')
+                            else: maps[i] = create_empty_array(shape, fname if n_outputs == 1 else f'{fname}_{i}', path=path, verbose=False)
+                        maps[i][start:start + bs] = bm.detach().cpu().numpy()
+                    if by_class:
+                        if class_sums[i] is None: class_sums[i] = torch.zeros((preds.shape[-1], *bm.shape[1:]), device=bm.device)
+                        class_sums[i].index_add_(0, target, bm.detach())
+                for h in h_act.hooks: h.stored = None
+                start += bs
+    finally:
+        model.train(training)
+    for m in maps:
+        if isinstance(m, np.memmap): m.flush()
+    maps = maps[0] if n_outputs == 1 else maps
+    if not return_maps: maps = None
+    if not by_class: return maps
+    class_maps = [(cs / class_counts.to(cs.device).clamp(min=1).view(-1, *[1] * (cs.ndim - 1))).cpu() for cs in class_sums]
+    return maps, class_maps[0] if n_outputs == 1 else class_maps
@@ -10,13 +10,13 @@ __all__ = ['lin_zero_init', 'Conv', 'ConvBN', 'CoordConv', 'SepConv', 'BN1d', 'I
            'SeparableConv1d', 'AddCoords1d', 'ConvBlock', 'ResBlock1dPlus', 'SEModule1d', 'Norm', 'LinLnDrop',
            'LambdaPlus', 'Squeeze', 'Unsqueeze', 'Add', 'Concat', 'Unfold', 'Permute', 'Transpose', 'View', 'Reshape',
            'Max', 'LastStep', 'SoftMax', 'Clamp', 'Clip', 'ReZero', 'DropPath', 'Sharpen', 'Sequential',
-           'TimeDistributed', 'Temp_Scale', 'Vector_Scale', 'Matrix_Scale', 'get_calibrator', 'LogitAdjustmentLayer',
-           'PPV', 'PPAuc', 'MaxPPVPool1d', 'AdaptiveWeightedAvgPool1d', 'GAP1d', 'GACP1d', 'GAWP1d',
-           'GlobalWeightedAveragePool1d', 'gwa_pool_head', 'AttentionalPool1d', 'GAttP1d', 'attentional_pool_head',
-           'PoolingLayer', 'GEGLU', 'ReGLU', 'get_act_fn', 'RevIN', 'create_pool_head', 'max_pool_head',
-           'create_pool_plus_head', 'create_conv_head', 'create_mlp_head', 'create_fc_head', 'create_rnn_head',
-           'imputation_head', 'create_conv_lin_nd_head', 'lin_nd_head', 'rocket_nd_head', 'xresnet1d_nd_head',
-           'create_conv_3d_head', 'universal_pool_head', 'SqueezeExciteBlock', 'GaussianNoise',
+           'checkpoint_layer', 'CheckpointLayer', 'TimeDistributed', 'Temp_Scale', 'Vector_Scale', 'Matrix_Scale',
+           'get_calibrator', 'LogitAdjustmentLayer', 'PPV', 'PPAuc', 'MaxPPVPool1d', 'AdaptiveWeightedAvgPool1d',
+           'GAP1d', 'GACP1d', 'GAWP1d', 'GlobalWeightedAveragePool1d', 'gwa_pool_head', 'AttentionalPool1d', 'GAttP1d',
+           'attentional_pool_head', 'PoolingLayer', 'GEGLU', 'ReGLU', 'get_act_fn', 'RevIN', 'create_pool_head',
+           'max_pool_head', 'create_pool_plus_head', 'create_conv_head', 'create_mlp_head', 'create_fc_head',
+           'create_rnn_head', 'imputation_head', 'create_conv_lin_nd_head', 'lin_nd_head', 'rocket_nd_head',
+           'xresnet1d_nd_head', 'create_conv_3d_head', 'universal_pool_head', 'SqueezeExciteBlock', 'GaussianNoise',
            'PositionwiseFeedForward', 'TokenLayer', 'ScaledDotProductAttention', 'MultiheadAttention', 'MultiConv1d',
            'LSTMOutput', 'emb_sz_rule', 'TSEmbedding', 'MultiEmbedding']
 
@@ -519,6 +519,43 @@ class Sequential(nn.Sequential):
         return x
 
 # %% ../../nbs/029_models.layers.ipynb 43
+import torch.utils.checkpoint
+from contextlib import contextmanager
+
+@contextmanager
+def _frozen_bn_stats(module):
+    "Prevents batchnorm layers in `module` from updating their running stats"
+    bns = [m for m in module.modules() if isinstance(m, nn.modules.batchnorm._BatchNorm) and m.training and m.track_running_stats]
+    state = [(m.momentum, m.num_batches_tracked.clone()) for m in bns]
+    for m in bns: m.momentum = 0.
+    try: yield
+    finally:
+        for m, (momentum, num_batches_tracked) in zip(bns, state):
+            m.momentum = momentum
+            m.num_batches_tracked.copy_(num_batches_tracked)
+
+
+def checkpoint_layer(module, *args, **kwargs):
+    "Calls `module` recomputing its activations during the backward pass instead of storing them (only when training)"
+    if not (module.training and torch.is_grad_enabled()): return module(*args, **kwargs)
+    recomputing = False
+    def _forward(*args, **kwargs):
+        nonlocal recomputing
+        if not recomputing:
+            recomputing = True
+            return module(*args, **kwargs)
+        # running stats have already been updated in the forward pass
+        with _frozen_bn_stats(module): return module(*args, **kwargs)
+    return torch.utils.checkpoint.checkpoint(_forward, *args, use_reentrant=False, **kwargs)
+
+
+class CheckpointLayer(Module):
+    "Wrapper that recomputes `module`'s activations during the backward pass to reduce memory use when training"
+    def __init__(self, module): self.module = module
+    def forward(self, *args, **kwargs): return checkpoint_layer(self.module, *args, **kwargs)
+    def __repr__(self): return f'{self.__class__.__name__}({self.module})'
+
+# %% ../../nbs/029_models.layers.ipynb 45
 class TimeDistributed(nn.Module):
     def __init__(self, module, batch_first=False):
         super(TimeDistributed, self).__init__()
@@ -543,7 +580,7 @@ class TimeDistributed(nn.Module):
 
         return y
 
-# %% ../../nbs/029_models.layers.ipynb 44
+# %% ../../nbs/029_models.layers.ipynb 46
 class Temp_Scale(Module):
     "Used to perform Temperature Scaling (dirichlet=False) or Single-parameter Dirichlet calibration (dirichlet=True)"
     def __init__(self, temp=1., dirichlet=False):
@@ -593,7 +630,7 @@ def get_calibrator(calibrator=None, n_classes=1, **kwargs):
     elif calibrator.lower() == 'dmatrix': return Matrix_Scale(n_classes=n_classes, dirichlet=True, **kwargs)
     else: assert False, f'please, select a correct calibrator instead of {calibrator}'
 
-# %% ../../nbs/029_models.layers.ipynb 49
+# %% ../../nbs/029_models.layers.ipynb 51
 class LogitAdjustmentLayer(Module):
     "Logit Adjustment for imbalanced datasets"
     def __init__(self, class_priors):
@@ -603,7 +640,7 @@ class LogitAdjustmentLayer(Module):
     
 LogitAdjLayer = LogitAdjustmentLayer
 
-# %% ../../nbs/029_models.layers.ipynb 51
+# %% ../../nbs/029_models.layers.ipynb 53
 class PPV(Module):
     def __init__(self, dim=-1): 
         self.dim = dim
@@ -628,7 +665,7 @@ class MaxPPVPool1d(Module):
         _ppv = torch.gt(x, 0).sum(dim=-1).float() / x.shape[-1]
         return torch.cat((_max, _ppv), dim=-1).unsqueeze(2)
 
-# %% ../../nbs/029_models.layers.ipynb 53
+# %% ../../nbs/029_models.layers.ipynb 55
 class AdaptiveWeightedAvgPool1d(Module):
     '''Global Pooling layer that performs a weighted average along the temporal axis
     
@@ -653,7 +690,7 @@ class AdaptiveWeightedAvgPool1d(Module):
         wap = self.softmax(wap)
         return torch.mul(x, wap).sum(-1)
 
-# %% ../../nbs/029_models.layers.ipynb 54
+# %% ../../nbs/029_models.layers.ipynb 56
 class GAP1d(Module):
     "Global Adaptive Pooling + Flatten"
     def __init__(self, output_size=1):
@@ -680,7 +717,7 @@ class GAWP1d(Module):
     def forward(self, x):
         return self.flatten(self.gacp(x))
 
-# %% ../../nbs/029_models.layers.ipynb 55
+# %% ../../nbs/029_models.layers.ipynb 57
 class GlobalWeightedAveragePool1d(Module):
     """ Global Weighted Average Pooling layer 
     
@@ -701,7 +738,7 @@ GWAP1d = GlobalWeightedAveragePool1d
 def gwa_pool_head(n_in, c_out, seq_len, bn=True, fc_dropout=0.):
     return nn.Sequential(GlobalWeightedAveragePool1d(n_in, seq_len), Reshape(), LinBnDrop(n_in, c_out, p=fc_dropout, bn=bn))
 
-# %% ../../nbs/029_models.layers.ipynb 57
+# %% ../../nbs/029_models.layers.ipynb 59
 class AttentionalPool1d(Module):
     """Global Adaptive Pooling layer inspired by Attentional Pooling for Action Recognition https://arxiv.org/abs/1711.01467"""
     def __init__(self, n_in, c_out, bn=False): 
@@ -721,7 +758,7 @@ class GAttP1d(nn.Sequential):
 def attentional_pool_head(n_in, c_out, seq_len=None, bn=True, **kwargs):
     return nn.Sequential(AttentionalPool1d(n_in, c_out, bn=bn, **kwargs), Reshape())
 
-# %% ../../nbs/029_models.layers.ipynb 60
+# %% ../../nbs/029_models.layers.ipynb 62
 class PoolingLayer(Module):
     def __init__(self, method='cls', seq_len=None, token=True, seq_last=True): 
         method = method.lower()
@@ -752,7 +789,7 @@ class PoolingLayer(Module):
     
     def __repr__(self): return f"{self.__class__.__name__}(method={self.method}, token={self.token}, seq_last={self.seq_last})"
 
-# %% ../../nbs/029_models.layers.ipynb 63
+# %% ../../nbs/029_models.layers.ipynb 65
 class GEGLU(Module):
     def forward(self, x):
         x, gates = x.chunk(2, dim=-1)
@@ -763,7 +800,7 @@ class ReGLU(Module):
         x, gates = x.chunk(2, dim=-1)
         return x * F.relu(gates)
 
-# %% ../../nbs/029_models.layers.ipynb 64
+# %% ../../nbs/029_models.layers.ipynb 66
 pytorch_acts = [nn.ELU, nn.LeakyReLU, nn.PReLU, nn.ReLU, nn.ReLU6, nn.SELU, nn.CELU, nn.GELU, nn.Sigmoid, Mish, nn.Softplus,
 nn.Tanh, nn.Softmax, GEGLU, ReGLU, SmeLU]
 pytorch_act_names = [a.__name__.lower() for a in pytorch_acts]
@@ -775,7 +812,7 @@ def get_act_fn(act, **act_kwargs):
     idx = pytorch_act_names.index(act.lower())
     return pytorch_acts[idx](**act_kwargs)
 
-# %% ../../nbs/029_models.layers.ipynb 66
+# %% ../../nbs/029_models.layers.ipynb 68
 class RevIN(nn.Module):
     """ Reversible Instance Normalization layer adapted from
 
@@ -840,7 +877,7 @@ class RevIN(nn.Module):
             x = x.add(self.sub)
             return x
 
-# %% ../../nbs/029_models.layers.ipynb 67
+# %% ../../nbs/029_models.layers.ipynb 69
 class RevIN(nn.Module):
     """ Reversible Instance Normalization layer adapted from
 
@@ -901,7 +938,7 @@ class RevIN(nn.Module):
                 x = x.add(self.sub)
                 return x
 
-# %% ../../nbs/029_models.layers.ipynb 70
+# %% ../../nbs/029_models.layers.ipynb 72
 def create_pool_head(n_in, c_out, seq_len=None, concat_pool=False, fc_dropout=0., bn=False, y_range=None, **kwargs):
     if kwargs: print(f'{kwargs}  not being used')
     if concat_pool: n_in*=2
@@ -916,7 +953,7 @@ setattr(average_pool_head, "__name__", "average_pool_head")
 concat_pool_head = partial(pool_head, concat_pool=True)
 setattr(concat_pool_head, "__name__", "concat_pool_head")
 
-# %% ../../nbs/029_models.layers.ipynb 72
+# %% ../../nbs/029_models.layers.ipynb 74
 def max_pool_head(n_in, c_out, seq_len, fc_dropout=0., bn=False, y_range=None, **kwargs):
     if kwargs: print(f'{kwargs}  not being used')
     layers = [nn.MaxPool1d(seq_len, **kwargs), Reshape()]
@@ -924,7 +961,7 @@ def max_pool_head(n_in, c_out, seq_len, fc_dropout=0., bn=False, y_range=None, *
     if y_range: layers += [SigmoidRange(*y_range)]
     return nn.Sequential(*layers)
 
-# %% ../../nbs/029_models.layers.ipynb 74
+# %% ../../nbs/029_models.layers.ipynb 76
 def create_pool_plus_head(*args, lin_ftrs=None, fc_dropout=0., concat_pool=True, bn_final=False, lin_first=False, y_range=None):
     nf = args[0]
     c_out = args[1]
@@ -945,7 +982,7 @@ def create_pool_plus_head(*args, lin_ftrs=None, fc_dropout=0., concat_pool=True,
 
 pool_plus_head = create_pool_plus_head
 
-# %% ../../nbs/029_models.layers.ipynb 76
+# %% ../../nbs/029_models.layers.ipynb 78
 def create_conv_head(*args, adaptive_size=None, y_range=None):
     nf = args[0]
     c_out = args[1]
@@ -961,7 +998,7 @@ def create_conv_head(*args, adaptive_size=None, y_range=None):
 
 conv_head = create_conv_head
 
-# %% ../../nbs/029_models.layers.ipynb 78
+# %% ../../nbs/029_models.layers.ipynb 80
 def create_mlp_head(nf, c_out, seq_len=None, flatten=True, fc_dropout=0., bn=False, lin_first=False, y_range=None):
     if flatten: nf *= seq_len
     layers = [Reshape()] if flatten else []
@@ -971,7 +1008,7 @@ def create_mlp_head(nf, c_out, seq_len=None, flatten=True, fc_dropout=0., bn=Fal
 
 mlp_head = create_mlp_head
 
-# %% ../../nbs/029_models.layers.ipynb 80
+# %% ../../nbs/029_models.layers.ipynb 82
 def create_fc_head(nf, c_out, seq_len=None, flatten=True, lin_ftrs=None, y_range=None, fc_dropout=0., bn=False, bn_final=False, act=nn.ReLU(inplace=True)):
     if flatten: nf *= seq_len
     layers = [Reshape()] if flatten else []
@@ -984,7 +1021,7 @@ def create_fc_head(nf, c_out, seq_len=None, flatten=True, lin_ftrs=None, y_range
 
 fc_head = create_fc_head
 
-# %% ../../nbs/029_models.layers.ipynb 82
+# %% ../../nbs/029_models.layers.ipynb 84
 def create_rnn_head(*args, fc_dropout=0., bn=False, y_range=None):
     nf = args[0]
     c_out = args[1]
@@ -995,7 +1032,7 @@ def create_rnn_head(*args, fc_dropout=0., bn=False, y_range=None):
 
 rnn_head = create_rnn_head
 
-# %% ../../nbs/029_models.layers.ipynb 84
+# %% ../../nbs/029_models.layers.ipynb 86
 def imputation_head(c_in, c_out, seq_len=None, ks=1, y_range=None, fc_dropout=0.):
     layers = [nn.Dropout(fc_dropout), nn.Conv1d(c_in, c_out, ks)]
     if y_range is not None: 
@@ -1003,7 +1040,7 @@ def imputation_head(c_in, c_out, seq_len=None, ks=1, y_range=None, fc_dropout=0.
         layers += [SigmoidRange(*y_range)]
     return nn.Sequential(*layers)
 
-# %% ../../nbs/029_models.layers.ipynb 86
+# %% ../../nbs/029_models.layers.ipynb 88
 class create_conv_lin_nd_head(nn.Sequential):
     "Module to create a nd output head"
 
@@ -1037,7 +1074,7 @@ conv_lin_nd_head = create_conv_lin_nd_head
 conv_lin_3d_head = create_conv_lin_nd_head # included for compatibility
 create_conv_lin_3d_head = create_conv_lin_nd_head # included for compatibility
 
-# %% ../../nbs/029_models.layers.ipynb 91
+# %% ../../nbs/029_models.layers.ipynb 93
 class lin_nd_head(nn.Sequential):
     "Module to create a nd output head with linear layers"
 
@@ -1088,7 +1125,7 @@ create_lin_nd_head = lin_nd_head
 lin_3d_head = lin_nd_head # included for backwards compatiblity
 create_lin_3d_head = lin_nd_head # included for backwards compatiblity
 
-# %% ../../nbs/029_models.layers.ipynb 97
+# %% ../../nbs/029_models.layers.ipynb 99
 class rocket_nd_head(nn.Sequential):
     "Module to create a nd output head with linear layers for the rocket family of models"
 
@@ -1125,7 +1162,7 @@ class rocket_nd_head(nn.Sequential):
 
         super().__init__(*layers)
 
-# %% ../../nbs/029_models.layers.ipynb 99
+# %% ../../nbs/029_models.layers.ipynb 101
 class xresnet1d_nd_head(nn.Sequential):
     "Module to create a nd output head with linear layers for the xresnet family of models"
 
@@ -1162,7 +1199,7 @@ class xresnet1d_nd_head(nn.Sequential):
 
         super().__init__(*layers)
 
-# %% ../../nbs/029_models.layers.ipynb 101
+# %% ../../nbs/029_models.layers.ipynb 103
 class create_conv_3d_head(nn.Sequential):
     "Module to create a nd output head with a convolutional layer"
     def __init__(self, n_in, n_out, seq_len, d, use_bn=False, **kwargs):
@@ -1175,17 +1212,17 @@ class create_conv_3d_head(nn.Sequential):
         
 conv_3d_head = create_conv_3d_head
 
-# %% ../../nbs/029_models.layers.ipynb 104
+# %% ../../nbs/029_models.layers.ipynb 106
 def universal_pool_head(n_in, c_out, seq_len, mult=2, pool_n_layers=2, pool_ln=True, pool_dropout=0.5, pool_act=nn.ReLU(),
                         zero_init=True, bn=True, fc_dropout=0.):
     return nn.Sequential(AdaptiveWeightedAvgPool1d(n_in, seq_len, n_layers=pool_n_layers, mult=mult, ln=pool_ln, dropout=pool_dropout, act=pool_act), 
                          Reshape(), LinBnDrop(n_in, c_out, p=fc_dropout, bn=bn))
 
-# %% ../../nbs/029_models.layers.ipynb 106
+# %% ../../nbs/029_models.layers.ipynb 108
 heads = [mlp_head, fc_head, average_pool_head, max_pool_head, concat_pool_head, pool_plus_head, conv_head, rnn_head, 
          conv_lin_nd_head, lin_nd_head, conv_3d_head, attentional_pool_head, universal_pool_head, gwa_pool_head]
 
-# %% ../../nbs/029_models.layers.ipynb 108
+# %% ../../nbs/029_models.layers.ipynb 110
 class SqueezeExciteBlock(Module):
     def __init__(self, ni, reduction=16):
         self.avg_pool = GAP1d(1)
@@ -1196,7 +1233,7 @@ class SqueezeExciteBlock(Module):
         y = self.fc(y).unsqueeze(2)
         return x * y.expand_as(x)
 
-# %% ../../nbs/029_models.layers.ipynb 110
+# %% ../../nbs/029_models.layers.ipynb 112
 class GaussianNoise(Module):
     """Gaussian noise regularizer.
 
@@ -1221,7 +1258,7 @@ class GaussianNoise(Module):
             x = x + sampled_noise
         return x 
 
-# %% ../../nbs/029_models.layers.ipynb 114
+# %% ../../nbs/029_models.layers.ipynb 116
 class PositionwiseFeedForward(nn.Sequential):
     def __init__(self, dim, dropout=0., act='reglu', mlp_ratio=1):
         act_mult = 2 if act.lower() in ["geglu", "reglu"] else 1
@@ -1236,7 +1273,7 @@ class TokenLayer(Module):
     def forward(self, x): return x[..., 0] if self.token is not None else x.mean(-1)
     def __repr__(self): return f"{self.__class__.__name__}()"
 
-# %% ../../nbs/029_models.layers.ipynb 116
+# %% ../../nbs/029_models.layers.ipynb 118
 class ScaledDotProductAttention(Module):
     r"""Scaled Dot-Product Attention module (Attention is all you need by Vaswani et al., 2017) with optional residual attention from previous layer 
     (Realformer: Transformer likes residual attention by He et al, 2020) and locality self sttention (Vision Transformer for Small-Size Datasets 
@@ -1292,7 +1329,7 @@ class ScaledDotProductAttention(Module):
         if self.res_attention: return output, attn_weights, attn_scores
         else: return output, attn_weights
 
-# %% ../../nbs/029_models.layers.ipynb 118
+# %% ../../nbs/029_models.layers.ipynb 120
 class MultiheadAttention(Module):
     def __init__(self, d_model, n_heads, d_k=None, d_v=None, res_attention=False, attn_dropout=0., proj_dropout=0., qkv_bias=True, lsa=False):
         """Multi Head Attention Layer
@@ -1346,7 +1383,7 @@ class MultiheadAttention(Module):
         if self.res_attention: return output, attn_weights, attn_scores
         else: return output, attn_weights 
 
-# %% ../../nbs/029_models.layers.ipynb 125
+# %% ../../nbs/029_models.layers.ipynb 127
 class MultiConv1d(Module):
     """Module that applies multiple convolutions with different kernel sizes"""
 
@@ -1374,17 +1411,17 @@ class MultiConv1d(Module):
         x = torch.cat(output, dim=self.dim)
         return x
 
-# %% ../../nbs/029_models.layers.ipynb 127
+# %% ../../nbs/029_models.layers.ipynb 129
 class LSTMOutput(Module):
     def forward(self, x): return x[0]
     def __repr__(self): return f'{self.__class__.__name__}()'
 
-# %% ../../nbs/029_models.layers.ipynb 129
+# %% ../../nbs/029_models.layers.ipynb 131
 def emb_sz_rule(n_cat):
     "Rule of thumb to pick embedding size corresponding to `n_cat` (original from fastai)"
     return min(600, round(1.6 * n_cat**0.56))
 
-# %% ../../nbs/029_models.layers.ipynb 131
+# %% ../../nbs/029_models.layers.ipynb 133
 class TSEmbedding(nn.Embedding):
     "Embedding layer with truncated normal initialization adapted from fastai"
     def __init__(self, ni, nf, std=0.01, padding_idx=None):
@@ -1393,7 +1430,7 @@ class TSEmbedding(nn.Embedding):
         if padding_idx is not None:
             nn.init.zeros_(self.weight.data[padding_idx])
 
-# %% ../../nbs/029_models.layers.ipynb 132
+# %% ../../nbs/029_models.layers.ipynb 134
 class MultiEmbedding(Module):
     def __init__(self, c_in, n_cat_embeds, cat_embed_dims=None, cat_pos=None, std=0.01, cat_padding_idxs=None):
         cat_n_embeds = listify(n_cat_embeds)
@@ -17,7 +17,8 @@ from .utils import build_model
 
 
 class WaveBlock(Module):
-    def __init__(self, c_in, c_out, seq_len, wavelet=None):
+    "Wavelet block. Filters are applied with a conv1d shared by all channels or with the original seq_len x seq_len linear layers (dense=True)"
+    def __init__(self, c_in, c_out, seq_len, wavelet=None, dense=False):
         if wavelet is None:
             self.h_filter = [-0.2304,0.7148,-0.6309,-0.028,0.187,0.0308,-0.0329,-0.0106]
             self.l_filter = [-0.0106,0.0329,0.0308,-0.187,-0.028,0.6309,0.7148,0.2304]
@@ -30,16 +31,34 @@ class WaveBlock(Module):
             self.h_filter = w.dec_hi
             self.l_filter = w.dec_lo
 
-        self.mWDN_H = nn.Linear(seq_len,seq_len)
-        self.mWDN_L = nn.Linear(seq_len,seq_len)
-        self.mWDN_H.weight = nn.Parameter(self.create_W(seq_len,False))
-        self.mWDN_L.weight = nn.Parameter(self.create_W(seq_len,True))
+        self.dense = dense
+        if dense:
+            self.mWDN_H = nn.Linear(seq_len,seq_len)
+            self.mWDN_L = nn.Linear(seq_len,seq_len)
+            self.mWDN_H.weight = nn.Parameter(self.create_W(seq_len,False))
+            self.mWDN_L.weight = nn.Parameter(self.create_W(seq_len,True))
+        else:
+            # out[i] = sum_k filter[k] * x[i+k], which is what the band matrices created by create_W compute
+            ks = len(self.h_filter)
+            self.pad = Pad1d((0, ks - 1))
+            self.mWDN_H = nn.Conv1d(1, 1, ks)
+            self.mWDN_L = nn.Conv1d(1, 1, ks)
+            self.mWDN_H.weight = nn.Parameter(tensor(self.h_filter).float().reshape(1, 1, -1))
+            self.mWDN_L.weight = nn.Parameter(tensor(self.l_filter).float().reshape(1, 1, -1))
         self.sigmoid = nn.Sigmoid()
         self.pool = nn.AvgPool1d(2)
 
     def forward(self, x):
-        hp_1 = self.sigmoid(self.mWDN_H(x))
-        lp_1 = self.sigmoid(self.mWDN_L(x))
+        if self.dense:
+            hp_1 = self.sigmoid(self.mWDN_H(x))
+            lp_1 = self.sigmoid(self.mWDN_L(x))
+        else:
+            # the same filters are applied to all channels. Both filters are applied in a single conv
+            bs, c_in, seq_len = x.shape
+            x = self.pad(x.reshape(bs * c_in, 1, seq_len))
+            weight = torch.cat([self.mWDN_H.weight, self.mWDN_L.weight])
+            bias = torch.cat([self.mWDN_H.bias, self.mWDN_L.bias])
+            hp_1, lp_1 = self.sigmoid(F.conv1d(x, weight, bias)).reshape(bs, c_in, 2, seq_len).unbind(2)
         hp_out = self.pool(hp_1)
         lp_out = self.pool(lp_1)
         all_out = torch.cat((hp_out, lp_out), dim=-1)
@@ -52,20 +71,16 @@ class WaveBlock(Module):
         max_epsilon = np.min(np.abs(filter_list))
         if is_comp: weight_np = np.zeros((P, P))
         else: weight_np = np.random.randn(P, P) * 0.1 * max_epsilon
-        for i in range(0, P):
-            filter_index = 0
-            for j in range(i, P):
-                if filter_index < len(filter_list):
-                    weight_np[i][j] = filter_list[filter_index]
-                    filter_index += 1
+        for k, f in enumerate(filter_list[:P]):
+            weight_np[np.arange(P - k), np.arange(k, P)] = f
         return tensor(weight_np)
 
 # %% ../../nbs/052_models.mWDN.ipynb 5
 class mWDN(Module):
-    def __init__(self, c_in, c_out, seq_len, levels=3, wavelet=None, base_arch=InceptionTimePlus, **kwargs):
+    def __init__(self, c_in, c_out, seq_len, levels=3, wavelet=None, dense=False, base_arch=InceptionTimePlus, **kwargs):
         self.levels=levels
         self.blocks = nn.ModuleList()
-        for i in range(levels): self.blocks.append(WaveBlock(c_in, c_out, seq_len // 2 ** i, wavelet=wavelet))
+        for i in range(levels): self.blocks.append(WaveBlock(c_in, c_out, seq_len // 2 ** i, wavelet=wavelet, dense=dense))
         self._model = build_model(base_arch, c_in, c_out, seq_len=seq_len, **kwargs)
 
     def forward(self, x):
@@ -77,10 +92,10 @@ class mWDN(Module):
     
 
 class mWDNBlocks(Module):
-    def __init__(self, c_in, c_out, seq_len, levels=3, wavelet=None):
+    def __init__(self, c_in, c_out, seq_len, levels=3, wavelet=None, dense=False):
         self.levels=levels
         self.blocks = nn.ModuleList()
-        for i in range(levels): self.blocks.append(WaveBlock(c_in, c_out, seq_len // 2 ** i, wavelet=wavelet))
+        for i in range(levels): self.blocks.append(WaveBlock(c_in, c_out, seq_len // 2 ** i, wavelet=wavelet, dense=dense))
 
     def forward(self, x):
         for i in range(self.levels):
@@ -90,11 +105,11 @@ class mWDNBlocks(Module):
     
 
 class mWDNPlus(nn.Sequential):
-    def __init__(self, c_in, c_out, seq_len, d=None, levels=3, wavelet=None, base_model=None, base_arch=InceptionTimePlus, **kwargs):
+    def __init__(self, c_in, c_out, seq_len, d=None, levels=3, wavelet=None, dense=False, base_model=None, base_arch=InceptionTimePlus, **kwargs):
 
         if base_model is None:
             base_model = build_model(base_arch, c_in, c_out, d=d, seq_len=seq_len, **kwargs)
-        blocks = mWDNBlocks(c_in, c_out, seq_len, levels=levels, wavelet=wavelet)
+        blocks = mWDNBlocks(c_in, c_out, seq_len, levels=levels, wavelet=wavelet, dense=dense)
         backbone = nn.Sequential(blocks, base_model.backbone)
         super().__init__(OrderedDict([('backbone', backbone), ('head', base_model.head)]))
         self.head_nf = base_model.head_nf
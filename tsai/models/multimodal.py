@@ -79,6 +79,12 @@ class TensorSplitter(nn.Module):
         self._check_overlap()
         self.horizon = horizon
 
+        # index tensors are precomputed (and moved with the module) so that forward doesn't allocate any python objects
+        # they are not persistent to keep state_dicts compatible with models trained before they were added
+        for name in ['s_cat', 's_cont', 'o_cat', 'o_cont', 'k_cat', 'k_cont']:
+            self.register_buffer(f'{name}_index', torch.tensor(getattr(self, f'{name}_idxs'), dtype=torch.long), persistent=False)
+        self.n_known = horizon or 0
+
     def _check_overlap(self):
         indices = []
         for idx in self.idx_list:
@@ -96,34 +102,29 @@ class TensorSplitter(nn.Module):
             return idx
 
     def forward(self, input_tensor):
-        slices = []
-        for idx, idxs in enumerate(self.idx_list):
-        # for idx, idxs in enumerate([self.s_cat_idxs, self.s_cont_idxs, self.o_cat_idxs, self.o_cont_idxs, self.k_cat_idxs, self.k_cont_idxs]):
-            if idxs:
-                if idx < 2:  # s_cat_idxs or s_cont_idxs
-                    slices.append(input_tensor[:, idxs, 0].long())
-                elif idx < 4 and self.horizon is not None:  # o_cat_idxs or o_cont_idxs and horizon is not None
-                    slices.append(input_tensor[:, idxs, :-self.horizon])
-                else:  # k_cat_idxs or k_cont_idxs or o_cat_idxs or o_cont_idxs and horizon is None
-                    slices.append(input_tensor[:, idxs, :])
-            else:
-                if idx < 2:  # s_cat_idxs or s_cont_idxs
-                    slices.append(torch.empty((input_tensor.size(0), 0), device=input_tensor.device))  # return 2D empty tensor
-                elif idx < 4 and self.horizon is not None: # o_cat_idxs or o_cont_idxs and horizon is not None
-                        slices.append(torch.empty((input_tensor.size(0), 0, input_tensor.size(2)-self.horizon), device=input_tensor.device))
-                else:   # k_cat_idxs or k_cont_idxs or o_cat_idxs or o_cont_idxs and horizon is None
-                    slices.append(torch.empty((input_tensor.size(0), 0, input_tensor.size(2)), device=input_tensor.device))
+        # static features are taken from the first time step. Observed features exclude the horizon (if any).
+        # Empty groups return empty tensors with the right shape.
+        x_static = input_tensor[:, :, 0]
+        x_observed = input_tensor[:, :, :input_tensor.shape[2] - self.n_known]
+        slices = [x_static.index_select(1, self.s_cat_index).long(),
+                  x_static.index_select(1, self.s_cont_index).long(),
+                  x_observed.index_select(1, self.o_cat_index),
+                  x_observed.index_select(1, self.o_cont_index)]
+        if self.n_known:
+            slices += [input_tensor.index_select(1, self.k_cat_index), input_tensor.index_select(1, self.k_cont_index)]
         return slices
 
-
-# %% ../../nbs/077_models.multimodal.ipynb 9
+# %% ../../nbs/077_models.multimodal.ipynb 10
 class Embeddings(nn.Module):
     "Embedding layers for each categorical variable in a 2D or 3D tensor"
+    __constants__ = ['fused']
+
     def __init__(self,
         n_embeddings:list, # List of num_embeddings for each categorical variable
         embedding_dims:list=None, # List of embedding dimensions for each categorical variable
         padding_idx:int=0, # Embedding padding_idx
         embed_dropout:float=0., # Dropout probability for `Embedding` layer
+        fused:bool=True, # Use a single concatenated embedding table (one lookup for all variables). Ignored if kwargs are passed.
         **kwargs
         ):
         super().__init__()
@@ -134,16 +135,65 @@ class Embeddings(nn.Module):
         embedding_dims = [emb_sz_rule(s) if s is None else s for s in n_embeddings]
         assert len(n_embeddings) == len(embedding_dims)
         self.embedding_dims = sum(embedding_dims)
-        self.embedding_layers = nn.ModuleList([nn.Sequential(nn.Embedding(n,d,padding_idx=padding_idx, **kwargs),
-                                                             nn.Dropout(embed_dropout)) for n,d in zip(n_embeddings, embedding_dims)])
+        self.fused = fused and not kwargs
+        if not self.fused:
+            self.embedding_layers = nn.ModuleList([nn.Sequential(nn.Embedding(n,d,padding_idx=padding_idx, **kwargs),
+                                                                 nn.Dropout(embed_dropout)) for n,d in zip(n_embeddings, embedding_dims)])
+            return
+
+        # All tables are stored in a single flat weight. Output channel j gathers weight[base_j + x[:, var_j] * stride_j]
+        self.n_embeddings, self.dims, self.padding_idx = n_embeddings, embedding_dims, padding_idx
+        var_idxs, bases, strides, pad_idxs, max_idxs = [], [], [], [], []
+        offset = 0
+        for i,(n,d) in enumerate(zip(n_embeddings, embedding_dims)):
+            var_idxs += [i] * d
+            bases += [offset + j for j in range(d)]
+            strides += [d] * d
+            pad_idxs += [-1 if padding_idx is None else padding_idx % n] * d
+            max_idxs += [n - 1] * d
+            offset += n * d
+        for name, v in zip(['var_idxs', 'bases', 'strides', 'pad_idxs', 'max_idxs'], [var_idxs, bases, strides, pad_idxs, max_idxs]):
+            self.register_buffer(name, torch.tensor(v, dtype=torch.long), persistent=False)
+        self.weight = nn.Parameter(torch.empty(offset))
+        self.dropout = nn.Dropout(embed_dropout)
+        self.reset_parameters()
+
+    def reset_parameters(self):
+        if not self.fused: return
+        nn.init.normal_(self.weight)
+        if self.padding_idx is None: return
+        with torch.no_grad():
+            for w,n,d in zip(self.weight.split([n * d for n,d in zip(self.n_embeddings, self.dims)]), self.n_embeddings, self.dims):
+                w.view(n, d)[self.padding_idx % n].zero_()
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # load weights saved with separate embedding layers into the fused table
+        if self.fused and f'{prefix}embedding_layers.0.0.weight' in state_dict:
+            weights = [state_dict.pop(f'{prefix}embedding_layers.{i}.0.weight').flatten() for i in range(len(self.dims))]
+            state_dict[f'{prefix}weight'] = torch.cat(weights)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     def forward(self, x):
-        if x.ndim == 2:
-            return torch.cat([e(x[:,i].long()) for i,e in enumerate(self.embedding_layers)],1)
-        elif x.ndim == 3:
-            return torch.cat([e(x[:,i].long()).transpose(1,2) for i,e in enumerate(self.embedding_layers)],1)
-
-# %% ../../nbs/077_models.multimodal.ipynb 13
+        if not self.fused:
+            if x.ndim == 2:
+                return torch.cat([e(x[:,i].long()) for i,e in enumerate(self.embedding_layers)],1)
+            else:
+                return torch.cat([e(x[:,i].long()).transpose(1,2) for i,e in enumerate(self.embedding_layers)],1)
+        shape = [1, -1] + [1] * (x.ndim - 2)
+        x = x.long().index_select(1, self.var_idxs)
+        if self.training:
+            # an out of range id would silently read the next variable's table
+            if bool(((x < 0) | (x > self.max_idxs.view(shape))).any()): raise IndexError('Embeddings: index out of range')
+        else:
+            # clamped to each variable's table (no sync with the device at inference)
+            x = x.clamp(min=0).minimum(self.max_idxs.view(shape))
+        output = self.weight.take(torch.addcmul(self.bases.view(shape), x, self.strides.view(shape)))
+        if self.training:
+            # padding embeddings (zero initialized) don't receive gradients
+            output = output * (x != self.pad_idxs.view(shape))
+        return self.dropout(output)
+
+# %% ../../nbs/077_models.multimodal.ipynb 15
 class StaticBackbone(nn.Module):
     "Static backbone model to embed static features"
     def __init__(self, c_in, c_out, seq_len, d=None, layers=[200, 100], dropouts=[0.1, 0.2], act=nn.ReLU(inplace=True), use_bn=False, lin_first=False):
@@ -162,7 +212,7 @@ class StaticBackbone(nn.Module):
         for mlp in self.mlp: x = mlp(x)
         return x
 
-# %% ../../nbs/077_models.multimodal.ipynb 18
+# %% ../../nbs/077_models.multimodal.ipynb 20
 class FusionMLP(nn.Module):
     def __init__(self, comb_dim, layers, act='relu', dropout=0., use_bn=True):
         super().__init__()
@@ -189,7 +239,7 @@ class FusionMLP(nn.Module):
         output = self.mlp(output)
         return output
 
-# %% ../../nbs/077_models.multimodal.ipynb 21
+# %% ../../nbs/077_models.multimodal.ipynb 23
 class MultInputBackboneWrapper(nn.Module):
     "Model backbone wrapper for input tensors with static and/ or observed, categorical and/ or numerical features."
 
@@ -286,7 +336,7 @@ class MultInputBackboneWrapper(nn.Module):
 
         return x
 
-# %% ../../nbs/077_models.multimodal.ipynb 22
+# %% ../../nbs/077_models.multimodal.ipynb 24
 class MultInputWrapper(nn.Sequential):
     def __init__(self,
         arch,
@@ -6,7 +6,7 @@ __all__ = ['SeqEmbed', 'build_model', 'create_model', 'create_tabular_model', 'a
            'has_weight', 'has_weight_or_bias', 'check_bias', 'check_weight', 'get_nf', 'ts_splitter',
            'transfer_weights', 'build_ts_model', 'count_parameters', 'build_tsimage_model', 'build_tabular_model',
            'get_clones', 'split_model', 'output_size_calculator', 'change_model_head', 'naive_forecaster',
-           'true_forecaster']
+           'true_forecaster', 'fuse_for_inference', 'benchmark_models', 'compare_benchmarks']
 
 # %% ../../nbs/030_models.utils.ipynb 3
 from ..imports import *
@@ -18,6 +18,7 @@ from fastai.tabular.model import *
 from fastai.callback.schedule import *
 from fastai.vision.models.xresnet import *
 from .layers import *
+from ..utils import time_fn
 
 # %% ../../nbs/030_models.utils.ipynb 4
 def apply_idxs(o, idxs):
@@ -324,3 +325,262 @@ def true_forecaster(o, split, horizon=1):
     if is_listy(horizon):
         o_true = o_true[np.newaxis].repeat(len(horizon), 0)
     return o_true
+
+# %% ../../nbs/030_models.utils.ipynb 27
+def _fusable_conv(m):
+    "Returns the conv/linear layer that produces `m`'s output if BatchNorm can be folded into it"
+    if isinstance(m, SameConv1d): return m.conv1d_same
+    if isinstance(m, SeparableConv1d): return m.pointwise_conv
+    if isinstance(m, (nn.Conv1d, nn.Conv2d, nn.Conv3d, nn.Linear)): return m
+    if isinstance(m, nn.Sequential) and len(m) > 0: return _fusable_conv(m[-1])
+    return None
+
+def _bn_scale_shift(bn):
+    "Returns the per channel scale and shift applied by a BatchNorm layer in eval mode"
+    scale = torch.rsqrt(bn.running_var + bn.eps)
+    if bn.affine: scale = scale * bn.weight
+    shift = -bn.running_mean * scale
+    if bn.affine: shift = shift + bn.bias
+    return scale, shift
+
+def _set_weight_bias(conv, weight, bias):
+    conv.weight.data.copy_(weight)
+    if conv.bias is None: conv.bias = nn.Parameter(bias)
+    else: conv.bias.data.copy_(bias)
+
+@torch.no_grad()
+def _fold_bn(conv, bn, chans=slice(None)):
+    "Folds `bn` (channels `chans`) into the preceding `conv` layer"
+    scale, shift = [o[chans] for o in _bn_scale_shift(bn)]
+    bias = conv.bias if conv.bias is not None else torch.zeros_like(scale)
+    _set_weight_bias(conv, conv.weight * scale.reshape(-1, *[1] * (conv.weight.ndim - 1)), bias * scale + shift)
+
+@torch.no_grad()
+def _fold_bn_into_next_linear(bn, lin):
+    "Folds `bn` into the following linear layer"
+    scale, shift = _bn_scale_shift(bn)
+    bias = lin.bias if lin.bias is not None else torch.zeros(lin.out_features, device=lin.weight.device)
+    _set_weight_bias(lin, lin.weight * scale, bias + lin.weight @ shift)
+
+def _is_bn_eval(m):
+    return is_bn(m) and m.track_running_stats and m.running_mean is not None
+
+def _is_noop(m):
+    return isinstance(m, (nn.Identity, nn.Dropout, nn.Dropout1d, nn.Dropout2d, nn.AlphaDropout)) or (type(m) == nn.Sequential and len(m) == 0)
+
+def _fuse_sequential(seq, linear_2d=()):
+    "Folds BatchNorm layers into adjacent conv/linear layers and removes no-op layers of a `nn.Sequential`"
+    layers = [(name, l) for name, l in seq._modules.items() if not _is_noop(l)] # layers keep their names (and state_dict keys)
+    i = 0
+    while i < len(layers) - 1:
+        (_, l), (_, nxt) = layers[i], layers[i + 1]
+        conv = _fusable_conv(l)
+        if isinstance(conv, nn.Linear) and conv not in linear_2d: conv = None # BatchNorm1d normalizes dim 1, which are features for 2d inputs only
+        if conv is not None and _is_bn_eval(nxt) and conv.weight.shape[0] == nxt.num_features:
+            _fold_bn(conv, nxt)
+            layers.pop(i + 1)
+            continue
+        if isinstance(l, nn.BatchNorm1d) and _is_bn_eval(l) and nxt in linear_2d and nxt.in_features == l.num_features:
+            _fold_bn_into_next_linear(l, nxt)
+            layers.pop(i)
+            continue
+        i += 1
+    for k in list(seq._modules): del seq._modules[k]
+    for name, l in layers: seq.add_module(name, l)
+
+def _single_conv(m):
+    "Returns `m` if it's (or only contains) a plain zero-padded nn.Conv1d"
+    while isinstance(m, nn.Sequential) and len(m) == 1: m = m[0]
+    if type(m) == nn.Conv1d and m.padding_mode == 'zeros' and not isinstance(m.padding, str): return m
+    return None
+
+@torch.no_grad()
+def _merge_convs(convs):
+    "Merges parallel nn.Conv1d layers with the same input into a single conv with zero padded kernels"
+    ks = [c.kernel_size[0] for c in convs]
+    c0, max_ks = convs[0], max(ks)
+    if not all(c.in_channels == c0.in_channels and c.stride == c0.stride and c.dilation == c0.dilation and c.groups == 1 and k % 2 == 1
+               and c.padding[0] == k // 2 * c.dilation[0] for c, k in zip(convs, ks)): return None
+    merged = nn.Conv1d(c0.in_channels, sum(c.out_channels for c in convs), max_ks, stride=c0.stride, padding=max_ks // 2 * c0.dilation[0],
+                       dilation=c0.dilation, bias=any(c.bias is not None for c in convs)).to(c0.weight.device, c0.weight.dtype)
+    merged.weight.zero_()
+    if merged.bias is not None: merged.bias.zero_()
+    start = 0
+    for c, k in zip(convs, ks):
+        end = start + c.out_channels
+        offset = (max_ks - k) // 2
+        merged.weight[start:end, :, offset:offset + k] = c.weight
+        if c.bias is not None: merged.bias[start:end] = c.bias
+        start = end
+    return merged
+
+@torch.no_grad()
+def _fuse_inception_module(m, merge_convs=True):
+    "Folds the norm of an `InceptionModulePlus` into its branches and merges its parallel convs into a single conv"
+    convs = [_single_conv(c) for c in m.convs]
+    mp_conv = _single_conv(m.mp_conv[-1])
+    if _is_bn_eval(m.norm) and all(c is not None for c in convs + [mp_conv]):
+        start = 0
+        for c in convs + [mp_conv]:
+            _fold_bn(c, m.norm, slice(start, start + c.out_channels))
+            start += c.out_channels
+        m.norm = nn.Identity()
+    if not merge_convs or any(c is None for c in convs): return
+    merged = _merge_convs(convs)
+    if merged is None: return
+    bottleneck = _single_conv(m.bottleneck) if isinstance(m.bottleneck, nn.Module) else None
+    if (bottleneck is not None and bottleneck.kernel_size[0] == 1 and bottleneck.bias is None and bottleneck.stride[0] == 1 
+        and bottleneck.padding[0] == 0 and bottleneck.groups == 1 and bottleneck.in_channels <= bottleneck.out_channels):
+        # a 1x1 conv without bias maps zero padding to zero, so it can be merged into the following conv (fewer input channels)
+        weight = torch.einsum('omk,mi->oik', merged.weight, bottleneck.weight[..., 0])
+        merged.in_channels = bottleneck.in_channels
+        merged.weight = nn.Parameter(weight)
+        del m._modules['bottleneck']
+        m.bottleneck = noop
+    m.convs = nn.ModuleList([merged])
+
+def fuse_for_inference(model, xb=None, merge_convs=True, inplace=False, atol=1e-4, rtol=1e-4, verbose=False):
+    r"""Returns a model optimized for inference with the same outputs.
+
+    It folds BatchNorm layers into the conv/linear layers next to them, merges the parallel convs of `InceptionModulePlus` into a single conv 
+    (if `merge_convs`), and removes Identity and Dropout layers from `nn.Sequential` containers. Layers keep their names, so `state_dict` keys 
+    only change where BatchNorm layers are removed (or a bias is added) and where convs are merged. If a sample batch `xb` is passed, outputs are 
+    checked to be the same.
+    """
+    from tsai.models.InceptionTimePlus import InceptionModulePlus
+    if isinstance(model, Learner): model = model.model
+    fused = model if inplace else deepcopy(model)
+    fused.eval()
+    n_params = count_parameters(fused, trainable=False)
+    linear_2d = set()
+    if xb is not None: # BatchNorm layers can only be folded into linear layers applied to 2d inputs
+        hooks = [l.register_forward_hook(lambda l, i, o: linear_2d.add(l) if i[0].ndim == 2 else None) for l in fused.modules() if is_linear(l)]
+        with torch.no_grad(): expected = fused(xb)
+        for h in hooks: h.remove()
+    for m in list(fused.modules()):
+        if isinstance(m, InceptionModulePlus): _fuse_inception_module(m, merge_convs=merge_convs)
+        if isinstance(m, nn.Sequential): _fuse_sequential(m, linear_2d)
+    pv(f'parameters: {n_params:,} -> {count_parameters(fused, trainable=False):,}', verbose)
+    if xb is not None:
+        with torch.no_grad(): output = fused(xb)
+        max_diff = (output - expected).abs().max().item()
+        pv(f'max abs diff: {max_diff:.2e}', verbose)
+        assert torch.allclose(output, expected, atol=atol, rtol=rtol), f"fused model outputs differ from the original ones (max abs diff: {max_diff:.2e})"
+    return fused
+
+# %% ../../nbs/030_models.utils.ipynb 30
+def _peak_memory(f):
+    "Peak memory (bytes) allocated by tensors while running `f` on CPU"
+    import itertools
+    from torch.profiler import profile, ProfilerActivity
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof: f()
+    mem = [e.self_cpu_memory_usage for e in sorted(prof.events(), key=lambda e: e.time_range.start)]
+    return max(itertools.accumulate(mem, initial=0))
+
+
+def _bench_archs(archs=None):
+    "Returns `archs`, or all architecture names (without duplicates) if None"
+    from tsai.learner import all_arch_names
+    return ifnone(archs, list(dict.fromkeys(all_arch_names)))
+
+
+def _arch_name(arch): return arch if isinstance(arch, str) else arch.__name__
+
+
+def _build_bench_model(arch, c_in, c_out, seq_len, **kwargs):
+    "Builds architecture `arch` on CPU to be benchmarked (warnings are ignored)"
+    import warnings
+    from tsai.learner import get_arch
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = build_ts_model(get_arch(arch), c_in=c_in, c_out=c_out, seq_len=seq_len, device='cpu', **kwargs)
+    assert isinstance(model, nn.Module), f"{_arch_name(arch)} is not a pytorch model"
+    return model
+
+
+def benchmark_models(
+    archs:list=None, # architecture names or classes. Defaults to all architectures in `tsai.learner.all_arch_names`
+    c_ins:tuple=(3,), # number of input variables
+    seq_lens:tuple=(128,), # input sequence lengths
+    bss:tuple=(16,), # batch sizes
+    c_out:int=2, # number of outputs
+    n_iters:int=10, # timed iterations per measurement
+    n_warmup:int=2, # untimed iterations run before each measurement
+    n_threads:int=1, # number of torch threads used during the benchmark (fixed to make runs comparable)
+    backward:bool=True, # also measures forward+backward
+    memory:bool=True, # measures peak tensor memory (with the torch profiler)
+    fname:str=None, # saves the results as csv (or json if the file extension is .json)
+    verbose:bool=False, # prints each result
+    **kwargs, # additional arguments passed to `build_ts_model`
+)->pd.DataFrame: # one row per architecture and (c_in, seq_len, bs)
+    "Measures CPU forward and forward+backward latency, samples/sec, peak memory and parameter count of each architecture"
+    import itertools
+    import platform
+    archs = _bench_archs(archs)
+    old_n_threads = torch.get_num_threads()
+    torch.set_num_threads(n_threads)
+    rows = []
+    try:
+        for arch in archs:
+            name = _arch_name(arch)
+            for c_in, seq_len, bs in itertools.product(c_ins, seq_lens, bss):
+                row = dict(arch=name, c_in=c_in, seq_len=seq_len, bs=bs, n_threads=n_threads, params=np.nan, fwd_ms=np.nan,
+                           fwd_samples_s=np.nan, fwd_bwd_ms=np.nan, fwd_bwd_samples_s=np.nan, fwd_peak_mb=np.nan, fwd_bwd_peak_mb=np.nan,
+                           error=None)
+                try:
+                    model = _build_bench_model(arch, c_in, c_out, seq_len, **kwargs)
+                    row['params'] = count_parameters(model, trainable=False)
+                    xb = torch.randn(bs, c_in, seq_len)
+
+                    def fwd():
+                        with torch.no_grad(): model(xb)
+
+                    def fwd_bwd():
+                        model.zero_grad(set_to_none=True)
+                        model(xb).float().mean().backward()
+
+                    model.eval()
+                    row['fwd_ms'] = time_fn(fwd, n_iters, n_warmup) * 1000
+                    row['fwd_samples_s'] = bs / row['fwd_ms'] * 1000
+                    if memory: row['fwd_peak_mb'] = _peak_memory(fwd) / 2**20
+                    if backward and count_parameters(model):
+                        model.train()
+                        row['fwd_bwd_ms'] = time_fn(fwd_bwd, n_iters, n_warmup) * 1000
+                        row['fwd_bwd_samples_s'] = bs / row['fwd_bwd_ms'] * 1000
+                        if memory: row['fwd_bwd_peak_mb'] = _peak_memory(fwd_bwd) / 2**20
+                except Exception as e:
+                    row['error'] = f"{type(e).__name__}: {e}"[:200]
+                pv(f"{name:>25} c_in={c_in} seq_len={seq_len} bs={bs}: " + (row['error'] or 
+                   f"fwd {row['fwd_ms']:.2f} ms  fwd+bwd {row['fwd_bwd_ms']:.2f} ms  params {row['params']:,}"), verbose)
+                rows.append(row)
+    finally: torch.set_num_threads(old_n_threads)
+    df = pd.DataFrame(rows)
+    df.attrs.update(torch=torch.__version__, platform=platform.platform(), processor=platform.processor())
+    if fname is not None:
+        fname = Path(fname)
+        fname.parent.mkdir(parents=True, exist_ok=True)
+        if fname.suffix == '.json': df.to_json(fname, orient='records', indent=1)
+        else: df.to_csv(fname, index=False)
+    return df
+
+
+def compare_benchmarks(
+    base, # results of `benchmark_models` (a DataFrame or a path to a csv/json file) used as reference
+    new, # results of `benchmark_models` (a DataFrame or a path to a csv/json file) to be compared
+    metrics:tuple=('fwd_ms', 'fwd_bwd_ms', 'fwd_peak_mb', 'fwd_bwd_peak_mb', 'params'), # metrics to compare (lower is better)
+    tolerance:float=0.1, # relative increase above which a metric is flagged as a regression
+)->pd.DataFrame: # ratio new/base per metric and a `regression` column
+    "Compares two `benchmark_models` runs and flags the configurations where any metric increased more than `tolerance`"
+    def _load(o):
+        if isinstance(o, pd.DataFrame): return o
+        return pd.read_json(o, orient='records') if str(o).endswith('.json') else pd.read_csv(o)
+    keys = ['arch', 'c_in', 'seq_len', 'bs']
+    base, new = _load(base), _load(new)
+    metrics = [m for m in metrics if m in base.columns and m in new.columns]
+    df = base[keys + metrics].merge(new[keys + metrics], on=keys, suffixes=('_base', '_new'))
+    regression = pd.Series(False, index=df.index)
+    for m in metrics:
+        df[f'{m}_ratio'] = df[f'{m}_new'] / df[f'{m}_base']
+        regression |= df[f'{m}_ratio'] > 1 + tolerance
+    df['regression'] = regression
+    return df
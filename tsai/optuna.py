@@ -1,21 +1,137 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/072_optuna.ipynb.
 
 # %% auto 0
-__all__ = ['run_optuna_study']
+__all__ = ['optuna_cache', 'OptunaPruningCallback', 'run_optuna_study']
 
 # %% ../nbs/072_optuna.ipynb 3
 from .imports import *
 from pathlib import Path
 from fastcore.script import *
 import joblib
+import tempfile
+import shutil
+import multiprocessing as mp
 from importlib import import_module
 import warnings
 warnings.filterwarnings("ignore")
 
 # %% ../nbs/072_optuna.ipynb 4
+_optuna_cache = {}
+_optuna_cache_path = None
+
+def optuna_cache(key, func, *args, **kwargs):
+    r"""Returns `func(*args, **kwargs)`, computed once per `key` and reused by all trials in a study (including trials run in other processes).
+
+    Use it within an objective to avoid re-doing work that doesn't depend on the trial's hyperparameters, like:
+        splits = optuna_cache('splits', get_splits, y, valid_size=.2, show_plot=False)
+        tfm = optuna_cache('standardize', lambda: TSStandardize(by_var=True).setup(...))
+    """
+    if key in _optuna_cache: return _optuna_cache[key]
+    fn = Path(_optuna_cache_path)/(re.sub(r'[^\w.-]', '_', str(key)) + '.pkl') if _optuna_cache_path is not None else None
+    if fn is not None and fn.exists():
+        out = joblib.load(fn)
+    else:
+        out = func(*args, **kwargs)
+        if fn is not None: # atomic write so that other processes never read a partial file
+            tmp_fn = fn.with_suffix(f'.{os.getpid()}.tmp')
+            joblib.dump(out, tmp_fn)
+            os.replace(tmp_fn, fn)
+    _optuna_cache[key] = out
+    return out
+
+
+class OptunaPruningCallback(Callback):
+    "Reports `monitor` to an optuna `trial` at the end of each epoch and stops training if the trial should be pruned"
+    order = Recorder.order + 1 # runs once the recorder has the epoch values
+    def __init__(self, trial, monitor='valid_loss'):
+        self.trial, self.monitor = trial, monitor
+
+    def before_fit(self):
+        self.run = not hasattr(self, "gather_preds") and hasattr(self.learn, "recorder")
+        if not self.run: return
+        names = [n for n in self.recorder.metric_names[1:] if n != 'time']
+        assert self.monitor in names, f"monitor must be one of {names}"
+        self.idx = names.index(self.monitor)
+
+    def after_epoch(self):
+        if not self.run: return
+        import optuna
+        self.trial.report(float(self.recorder.values[-1][self.idx]), self.epoch)
+        if self.trial.should_prune(): raise optuna.TrialPruned(f"Trial was pruned at epoch {self.epoch}.")
+
+
+def _share_arrays(arrays, path):
+    "Saves `arrays` to `path` as .npy files (memmaps are reused) and returns a dict with their paths"
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for k, v in arrays.items():
+        if isinstance(v, np.memmap) and getattr(v, 'filename', None) is not None and v.offset == 0 and str(v.filename).endswith('.npy'):
+            paths[k] = v.filename
+        else:
+            paths[k] = path/f'{k}.npy'
+            np.save(paths[k], np.asarray(v))
+    return paths
+
+
+def _optuna_worker(objective, rank, study_name, storage, sampler, pruner, n_trials, timeout, gc_after_trial, shared_paths=None,
+                   cache_path=None, n_threads=1, seed=None):
+    "Runs `n_trials` of a study stored in `storage` in a worker process"
+    global _optuna_cache_path
+    import optuna
+    _optuna_cache_path = cache_path
+    torch.set_num_threads(n_threads)
+    set_seed(seed + rank if seed is not None else int.from_bytes(os.urandom(4), 'little'))
+    sampler.reseed_rng() # each worker must suggest different hyperparameters
+    if shared_paths: objective = partial(objective, **{k: np.load(v, mmap_mode='r') for k, v in shared_paths.items()})
+    study = optuna.load_study(study_name=study_name, storage=storage, sampler=sampler, pruner=pruner)
+    study.optimize(objective, n_trials=n_trials, timeout=timeout, gc_after_trial=gc_after_trial, show_progress_bar=False)
+
+def _run_optuna_parallel(study, objective, n_jobs, evaluate=None, n_trials=None, timeout=None, gc_after_trial=False, shared_data=None,
+                         path='optuna', seed=None):
+    "Runs `study` in `n_jobs` processes that share a journal storage, shared data and cache, and returns an in-memory copy of the study"
+    import optuna
+    try: from optuna.storages.journal import JournalFileBackend
+    except ImportError: from optuna.storages import JournalFileStorage as JournalFileBackend
+    global _optuna_cache_path
+
+    Path(path).mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix='.tmp_', dir=path))
+    (tmp_dir/'cache').mkdir()
+    storage = optuna.storages.JournalStorage(JournalFileBackend(str(tmp_dir/'journal.log')))
+    sampler, pruner = study.sampler, study.pruner
+    _study = optuna.create_study(storage=storage, sampler=sampler, pruner=pruner, study_name=study.study_name, directions=study.directions)
+    _study.add_trials(study.trials)
+    if evaluate: _study.enqueue_trial(evaluate)
+    shared_paths = _share_arrays(shared_data, tmp_dir/'data') if shared_data else None
+    _optuna_cache_path = tmp_dir/'cache'
+
+    n_worker_trials = [None] * n_jobs if n_trials is None else [n_trials // n_jobs + (i < n_trials % n_jobs) for i in range(n_jobs)]
+    ctx = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+    procs = [ctx.Process(target=_optuna_worker, args=(objective, i, study.study_name, storage, sampler, pruner, n, timeout, gc_after_trial),
+                         kwargs=dict(shared_paths=shared_paths, cache_path=_optuna_cache_path, n_threads=max(1, defaults.cpus // n_jobs), seed=seed))
+             for i, n in enumerate(n_worker_trials) if n != 0]
+    try:
+        for p in procs: p.start()
+        for p in procs: p.join()
+        if any(p.exitcode != 0 for p in procs): print("Some optuna worker processes didn't finish successfully.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in procs:
+            if p.is_alive(): p.terminate()
+        _optuna_cache.clear()
+        _optuna_cache_path = None
+        memory_storage = optuna.storages.InMemoryStorage()
+        optuna.copy_study(from_study_name=study.study_name, from_storage=storage, to_storage=memory_storage)
+        study = optuna.load_study(study_name=study.study_name, storage=memory_storage, sampler=sampler, pruner=pruner)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return study
+
+# %% ../nbs/072_optuna.ipynb 5
 def run_optuna_study(objective, resume=None, study_type=None, multivariate=True, search_space=None, evaluate=None, seed=None, sampler=None, pruner=None, 
                      study_name=None, direction='maximize', n_trials=None, timeout=None, gc_after_trial=False, show_progress_bar=True, 
-                     save_study=True, path='optuna', show_plots=True):
+                     save_study=True, path='optuna', show_plots=True, n_jobs=1, shared_data=None):
     r"""Creates and runs an optuna study.
 
     Args: 
@@ -45,6 +161,9 @@ def run_optuna_study(objective, resume=None, study_type=None, multivariate=True,
         save_study:         Save your study when finished/ interrupted.
         path:               Folder where the study will be saved.
         show_plots:         Flag to control whether plots are shown at the end of the study.
+        n_jobs:             Number of processes used to run trials in parallel (-1 to use all cpus). Torch threads are split among processes.
+        shared_data:        Dict of arrays passed to the objective as keyword arguments (`objective(trial, **shared_data)`). When n_jobs > 1 they are 
+                            stored once as .npy files and shared by all processes as read-only memmaps instead of being copied.
     """
     
     try: import optuna
@@ -75,11 +194,21 @@ def run_optuna_study(objective, resume=None, study_type=None, multivariate=True,
             print(f"    {key}: {value}")
     else: 
         study = optuna.create_study(sampler=sampler, pruner=pruner, study_name=study_name, direction=direction)
-    if evaluate: study.enqueue_trial(evaluate)
-    try:
-        study.optimize(objective, n_trials=n_trials, timeout=timeout, gc_after_trial=gc_after_trial, show_progress_bar=show_progress_bar)
-    except KeyboardInterrupt:
-        pass
+    if n_jobs is not None and n_jobs < 0: n_jobs = defaults.cpus
+    n_jobs = max(1, n_jobs or 1)
+    _optuna_cache.clear()
+    if n_jobs == 1:
+        if evaluate: study.enqueue_trial(evaluate)
+        try:
+            _objective = partial(objective, **shared_data) if shared_data else objective
+            study.optimize(_objective, n_trials=n_trials, timeout=timeout, gc_after_trial=gc_after_trial, show_progress_bar=show_progress_bar)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            _optuna_cache.clear()
+    else:
+        study = _run_optuna_parallel(study, objective, n_jobs=n_jobs, evaluate=evaluate, n_trials=n_trials, timeout=timeout, 
+                                     gc_after_trial=gc_after_trial, shared_data=shared_data, path=path, seed=seed)
 
     # Save
     if save_study:
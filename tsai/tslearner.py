@@ -1,10 +1,12 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/022_tslearner.ipynb.
 
 # %% auto 0
-__all__ = ['TSClassifier', 'TSRegressor', 'TSForecaster']
+__all__ = ['TSClassifier', 'TSRegressor', 'TSForecaster', 'fit_distributed']
 
 # %% ../nbs/022_tslearner.ipynb 3
-from fastai.learner import Learner
+from fastai.learner import Learner, Recorder
+from fastai.callback.core import Callback
+from fastai.callback.progress import ProgressCallback
 from fastai.optimizer import Adam
 from fastai.metrics import accuracy
 from fastai.losses import *
@@ -15,6 +17,7 @@ from .data.core import *
 from .models.InceptionTimePlus import *
 from .models.utils import *
 from .metrics import *
+from .callback.core import AutocastMixedPrecision
 
 # %% ../nbs/022_tslearner.ipynb 5
 class TSClassifier(Learner):
@@ -27,7 +30,7 @@ class TSClassifier(Learner):
                  shuffle_train=True, drop_last=True, num_workers=0, do_setup=True, device=None, seed=None,
                  arch=None, arch_config={}, pretrained=False, weights_path=None, exclude_head=True, cut=-1, init=None,
                  loss_func=None, opt_func=Adam, lr=0.001, metrics=accuracy, cbs=None, wd=None, wd_bn_bias=False,
-                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, verbose=False):
+                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, precision=None, verbose=False):
 
         # Seed
         if seed is not None:
@@ -87,6 +90,11 @@ class TSClassifier(Learner):
             pipelines = listify(pipelines)
         setattr(self, "pipelines", pipelines)
 
+        # Precision
+        if precision is not None and precision != 'fp32':
+            assert precision == 'bf16', "precision must be 'fp32' or 'bf16'"
+            cbs = L(cbs) + [AutocastMixedPrecision(torch.bfloat16)]
+
         super().__init__(dls, model, loss_func=loss_func, opt_func=opt_func, lr=lr, cbs=cbs, metrics=metrics, path=path, splitter=splitter,
                          model_dir=model_dir, wd=wd, wd_bn_bias=wd_bn_bias, train_bn=train_bn, moms=moms)
 
@@ -109,7 +117,7 @@ class TSRegressor(Learner):
                  shuffle_train=True, drop_last=True, num_workers=0, do_setup=True, device=None, seed=None,
                  arch=None, arch_config={}, pretrained=False, weights_path=None, exclude_head=True, cut=-1, init=None,
                  loss_func=None, opt_func=Adam, lr=0.001, metrics=None, cbs=None, wd=None, wd_bn_bias=False,
-                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, verbose=False):
+                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, precision=None, verbose=False):
 
         # Seed
         if seed is not None:
@@ -170,6 +178,11 @@ class TSRegressor(Learner):
             pipelines = listify(pipelines)
         setattr(self, "pipelines", pipelines)
 
+        # Precision
+        if precision is not None and precision != 'fp32':
+            assert precision == 'bf16', "precision must be 'fp32' or 'bf16'"
+            cbs = L(cbs) + [AutocastMixedPrecision(torch.bfloat16)]
+
         super().__init__(dls, model, loss_func=loss_func, opt_func=opt_func, lr=lr, cbs=cbs, metrics=metrics, path=path, splitter=splitter,
                          model_dir=model_dir, wd=wd, wd_bn_bias=wd_bn_bias, train_bn=train_bn, moms=moms)
 
@@ -192,7 +205,7 @@ class TSForecaster(Learner):
                  shuffle_train=True, drop_last=True, num_workers=0, do_setup=True, device=None, seed=None,
                  arch=None, arch_config={}, pretrained=False, weights_path=None, exclude_head=True, cut=-1, init=None,
                  loss_func=None, opt_func=Adam, lr=0.001, metrics=None, cbs=None, wd=None, wd_bn_bias=False,
-                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, verbose=False):
+                 train_bn=True, moms=(0.95, 0.85, 0.95),  path='.', model_dir='models', splitter=trainable_params, precision=None, verbose=False):
 
         # Seed
         if seed is not None:
@@ -252,6 +265,11 @@ class TSForecaster(Learner):
             pipelines = listify(pipelines)
         setattr(self, "pipelines", pipelines)
 
+        # Precision
+        if precision is not None and precision != 'fp32':
+            assert precision == 'bf16', "precision must be 'fp32' or 'bf16'"
+            cbs = L(cbs) + [AutocastMixedPrecision(torch.bfloat16)]
+
         super().__init__(dls, model, loss_func=loss_func, opt_func=opt_func, lr=lr, cbs=cbs, metrics=metrics, path=path, splitter=splitter,
                          model_dir=model_dir, wd=wd, wd_bn_bias=wd_bn_bias, train_bn=train_bn, moms=moms)
 
@@ -262,3 +280,173 @@ class TSForecaster(Learner):
                 self.recorder.valid_metrics = False
             else:
                 self.recorder.valid_metrics = valid_metrics
+
+# %% ../nbs/022_tslearner.ipynb 19
+class _AllReduceSum(torch.autograd.Function):
+    "Sums a tensor across processes (gradients are summed as well)"
+    @staticmethod
+    def forward(ctx, x):
+        x = x.clone()
+        torch.distributed.all_reduce(x)
+        return x
+
+    @staticmethod
+    def backward(ctx, grad):
+        grad = grad.clone()
+        torch.distributed.all_reduce(grad)
+        return grad
+
+
+class _SyncBatchNorm(nn.modules.batchnorm._BatchNorm):
+    "BatchNorm that computes the batch statistics across processes (`nn.SyncBatchNorm` only supports GPUs)"
+    def _check_input_dim(self, input): pass
+
+    def forward(self, x):
+        if not (self.training and torch.distributed.is_available() and torch.distributed.is_initialized()): return super().forward(x)
+        dims = [0] + list(range(2, x.ndim))
+        c = x.shape[1]
+        stats = torch.cat([x.sum(dims), (x * x).sum(dims), x.new_tensor([x.numel() / c])])
+        stats = _AllReduceSum.apply(stats)
+        n = stats[-1]
+        mean = stats[:c] / n
+        var = (stats[c:2 * c] / n - mean * mean).clamp_min(0)
+        if self.track_running_stats:
+            with torch.no_grad():
+                self.num_batches_tracked.add_(1)
+                momentum = 1 / self.num_batches_tracked.item() if self.momentum is None else self.momentum
+                self.running_mean.lerp_(mean, momentum)
+                self.running_var.lerp_(var * n / (n - 1).clamp_min(1), momentum)
+        shape = [1, c] + [1] * (x.ndim - 2)
+        x = (x - mean.view(shape)) * torch.rsqrt(var.view(shape) + self.eps)
+        if self.affine: x = x * self.weight.view(shape) + self.bias.view(shape)
+        return x
+
+
+def _convert_batchnorm(module, revert=False):
+    "Replaces BatchNorm layers by `_SyncBatchNorm` (or back if `revert`) sharing the same parameters and buffers"
+    for name, child in module.named_children():
+        if (isinstance(child, _SyncBatchNorm) if revert else isinstance(child, nn.modules.batchnorm._BatchNorm)):
+            new = (child._orig_cls if revert else _SyncBatchNorm)(child.num_features, child.eps, child.momentum, child.affine, 
+                                                                   child.track_running_stats)
+            if not revert: new._orig_cls = type(child)
+            new.load_state_dict(child.state_dict())
+            if child.affine: new.weight, new.bias = child.weight, child.bias
+            new.train(child.training)
+            setattr(module, name, new)
+        else: _convert_batchnorm(child, revert=revert)
+    return module
+
+
+def _share_array(a, path):
+    "Returns a reference to `a` that can be opened by other processes without pickling its data"
+    if a is None: return None
+    if isinstance(a, np.memmap) and a.filename is not None and a.flags.c_contiguous and a.base is not None:
+        return (str(a.filename), a.dtype.str, a.shape, a.offset)
+    a = np.asarray(a.detach().cpu() if isinstance(a, torch.Tensor) else a)
+    np.save(path, a)
+    return str(path)
+
+
+def _load_shared_array(ref):
+    if ref is None: return None
+    if isinstance(ref, tuple):
+        fname, dtype, shape, offset = ref
+        return np.memmap(fname, dtype=dtype, mode='r', shape=shape, offset=offset)
+    return np.load(ref, mmap_mode='r', allow_pickle=True)
+
+
+class _DistributedTrainer(Callback):
+    "Wraps the model in `DistributedDataParallel` during training and reduces the validation metrics across processes"
+    order = Recorder.order - 1 # metrics are reduced before they are logged
+    def __init__(self, rank): self.rank = rank
+
+    def before_fit(self):
+        self.learn.model = nn.parallel.DistributedDataParallel(self.learn.model)
+
+    def after_validate(self):
+        for m in self.recorder._valid_mets: _reduce_metric(m)
+
+    def after_fit(self):
+        self.learn.model = self.learn.model.module
+
+
+def _reduce_metric(m):
+    from fastai.metrics import AccumMetric
+    if isinstance(m, AccumMetric):
+        local = [torch.cat(m.preds) if len(m.preds) else None, torch.cat(m.targs) if len(m.targs) else None]
+        out = [None] * torch.distributed.get_world_size()
+        torch.distributed.all_gather_object(out, local)
+        m.preds, m.targs = [o[0] for o in out if o[0] is not None], [o[1] for o in out if o[1] is not None]
+    elif hasattr(m, 'total') and hasattr(m, 'count'):
+        stats = torch.tensor([float(m.total), float(m.count)], dtype=torch.float64)
+        torch.distributed.all_reduce(stats)
+        m.total, m.count = stats[0].item(), stats[1].item()
+
+
+def _distributed_worker(rank, world_size, port, learner_cls, X, y, splits, n_epoch, lr_max, fit_fn, fit_kwargs, n_threads, 
+                        sync_bn, out_path, kwargs):
+    os.environ.update(MASTER_ADDR='127.0.0.1', MASTER_PORT=str(port))
+    torch.distributed.init_process_group('gloo', rank=rank, world_size=world_size)
+    try:
+        torch.set_num_threads(n_threads)
+        learn = learner_cls(_load_shared_array(X), _load_shared_array(y), splits=splits, **kwargs)
+        for dl in learn.dls.loaders:
+            if isinstance(dl, NumpyDataLoader): dl.world_size, dl.rank, dl.dist_seed = world_size, rank, kwargs['seed']
+        if sync_bn: _convert_batchnorm(learn.model)
+        learn.add_cb(_DistributedTrainer(rank))
+        if rank != 0:
+            learn.remove_cbs(learn.cbs.filter(lambda cb: isinstance(cb, ProgressCallback)))
+            learn.logger = noop
+        args = (n_epoch,) if lr_max is None else (n_epoch, lr_max)
+        getattr(learn, fit_fn)(*args, **fit_kwargs)
+        if rank == 0:
+            if sync_bn: _convert_batchnorm(learn.model, revert=True)
+            rec = learn.recorder
+            torch.save({'model': learn.model.state_dict(), 'recorder': {k: getattr(rec, k) for k in ['lrs', 'iters', 'losses', 'values']}}, 
+                       out_path)
+        torch.distributed.barrier()
+    finally:
+        torch.distributed.destroy_process_group()
+
+
+def fit_distributed(
+    learner_cls, # TSClassifier, TSRegressor or TSForecaster
+    X, # array-like of shape (n_samples, n_vars, seq_len). It's shared with the processes through a memory-mapped file
+    y=None, # targets
+    splits=None, # train and valid splits (the train split is sharded across processes)
+    n_procs:int=2, # number of processes
+    n_epoch:int=1, # number of epochs
+    lr_max=None, # learning rate. Defaults to the learner's lr
+    fit_fn:str='fit_one_cycle', # Learner method used for training
+    fit_kwargs:dict=None, # additional arguments passed to `fit_fn`
+    n_threads:int=None, # torch threads per process. Defaults to the available threads divided by `n_procs`
+    sync_bn:bool=True, # computes BatchNorm statistics across processes
+    port:int=None, # port used by the processes to communicate. Defaults to a free port
+    tmp_dir:str=None, # folder used to store the memory-mapped data and the trained model
+    **kwargs, # `learner_cls` arguments (they need to be picklable)
+)->Learner: # learner with the trained weights and training history
+    r"""Trains a learner with `n_procs` CPU processes using `DistributedDataParallel` with the gloo backend.
+
+    Each process trains on a different shard of the training set (the batch size is per process) and the validation
+    metrics are computed on the whole validation set. 
+    """
+    import socket
+    import tempfile
+    import torch.multiprocessing as mp
+    if kwargs.get('seed') is None: kwargs['seed'] = np.random.randint(2**31) # all processes need to draw the same indices
+    n_threads = ifnone(n_threads, max(1, torch.get_num_threads() // n_procs))
+    if port is None:
+        with socket.socket() as s:
+            s.bind(('', 0))
+            port = s.getsockname()[1]
+    learn = learner_cls(X, y, splits=splits, **kwargs)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        tmp = Path(tmp)
+        X_ref, y_ref = _share_array(X, tmp/'X.npy'), _share_array(y, tmp/'y.npy')
+        mp.spawn(_distributed_worker, nprocs=n_procs, join=True,
+                 args=(n_procs, port, learner_cls, X_ref, y_ref, splits, n_epoch, lr_max, fit_fn, ifnone(fit_kwargs, {}), n_threads, 
+                       sync_bn, tmp/'learn.pth', kwargs))
+        state = torch.load(tmp/'learn.pth')
+    learn.model.load_state_dict(state['model'])
+    for k, v in state['recorder'].items(): setattr(learn.recorder, k, v)
+    return learn
@@ -18,15 +18,16 @@ __all__ = ['rng', 'bytes2size', 'b2s', 'memmap2cache', 'cache_memmap', 'a', 'b',
            'torch_clamp', 'get_robustscale_params', 'torch_slice_by_dim', 'torch_nanmean', 'torch_nanstd', 'concat',
            'reduce_memory_usage', 'cls_name', 'roll2d', 'roll3d', 'random_roll2d', 'random_roll3d', 'rotate_axis0',
            'rotate_axis1', 'rotate_axis2', 'chunks_calculator', 'is_memory_shared', 'assign_in_chunks', 'create_array',
-           'np_save_compressed', 'np_load_compressed', 'np2memmap', 'torch_mean_groupby', 'torch_flip',
-           'torch_nan_to_num', 'torch_masked_to_num', 'mpl_trend', 'int2digits', 'array2digits', 'sincos_encoding',
-           'linear_encoding', 'encode_positions', 'sort_generator', 'get_subset_dict', 'create_dir', 'remove_dir',
-           'named_partial', 'attrdict2dict', 'dict2attrdict', 'dict2yaml', 'yaml2dict', 'get_config', 'str2list',
-           'str2index', 'get_cont_cols', 'get_cat_cols', 'get_mapping', 'map_array', 'log_tfm', 'to_sincos_time',
-           'plot_feature_dist', 'rolling_moving_average', 'ffill_sequence', 'bfill_sequence', 'fbfill_sequence',
-           'dummify', 'shuffle_along_axis', 'analyze_feature', 'analyze_array', 'get_relpath', 'get_root',
-           'to_root_path', 'split_in_chunks', 'save_object', 'load_object', 'get_idxs_to_keep', 'zerofy', 'feat2list',
-           'smallest_dtype', 'plot_forecast', 'str2callable']
+           'np_save_compressed', 'np_load_compressed', 'np_save_chunked', 'np_load_chunked', 'ChunkedArray',
+           'np2memmap', 'torch_mean_groupby', 'torch_flip', 'torch_nan_to_num', 'torch_masked_to_num', 'mpl_trend',
+           'int2digits', 'array2digits', 'sincos_encoding', 'linear_encoding', 'encode_positions', 'sort_generator',
+           'get_subset_dict', 'create_dir', 'remove_dir', 'named_partial', 'attrdict2dict', 'dict2attrdict',
+           'dict2yaml', 'yaml2dict', 'get_config', 'str2list', 'str2index', 'get_cont_cols', 'get_cat_cols',
+           'get_mapping', 'map_array', 'log_tfm', 'to_sincos_time', 'plot_feature_dist', 'rolling_moving_average',
+           'ffill_sequence', 'bfill_sequence', 'fbfill_sequence', 'dummify', 'shuffle_along_axis', 'analyze_feature',
+           'analyze_array', 'get_relpath', 'get_root', 'to_root_path', 'split_in_chunks', 'save_object', 'load_object',
+           'get_idxs_to_keep', 'zerofy', 'feat2list', 'smallest_dtype', 'compact_idxs', 'range2slice', 'take_idxs',
+           'plot_forecast', 'str2callable', 'time_fn']
 
 # %% ../nbs/002_utils.ipynb 3
 from .imports import *
@@ -993,37 +994,65 @@ def is_memory_shared(a, b):
     return np.shares_memory(a, b)
 
 # %% ../nbs/002_utils.ipynb 109
-def assign_in_chunks(a, b, chunksize='auto', inplace=True, verbose=True):
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def _assign_chunk(a, b, start, end, seed=None):
+    if isinstance(b, str) and b == 'rand':
+        a[start:end] = np.random.rand(end - start, *a.shape[1:]) if seed is None else np.random.default_rng(seed).random((end - start, *a.shape[1:]))
+    elif is_dask(b):
+        a[start:end] = b[start:end].compute()
+    else:
+        a[start:end] = b[start:end]
+
+def assign_in_chunks(a, b, chunksize='auto', inplace=True, verbose=True, n_workers=None, n_bytes=1024**3):
     """Assigns values in b to an array-like object a using chunks to avoid memory overload.
     The resulting a retains it's dtype and share it's memory.
     a: array-like object
-    b: may be an integer, float, str, 'rand' (for random data), or another array like object.
-    chunksize: is the size of chunks. If 'auto' chunks will have around 1GB each.
+    b: may be an integer, float, str, 'rand' (for random data), another array like object, or a generator/iterator that yields
+        consecutive chunks of samples.
+    chunksize: is the size of chunks. If 'auto' chunks will have around n_bytes (default: 1GB) in total across all workers.
+    n_workers: if > 1, non-overlapping chunks are read and written concurrently in a thread pool.
     """
+    start_time = time.time()
+    n_workers = max(1, ifnone(n_workers, 1))
     if not (isinstance(b, str) and b == 'rand') and not isinstance(b, (Iterable, Generator)):
         a[:] = b
+    elif not hasattr(b, '__getitem__'):
+        # generators are consumed in order in this thread, and chunks are written by the workers
+        with ThreadPoolExecutor(n_workers) as pool:
+            start, futures = 0, []
+            for chunk in b:
+                chunk = np.array(chunk) # copied as generators may reuse the same buffer while the chunk is being written
+                futures.append(pool.submit(a.__setitem__, slice(start, start + len(chunk)), chunk))
+                start += len(chunk)
+                if len(futures) >= 2 * n_workers: futures.pop(0).result()
+            for f in futures: f.result()
     else:
         shape = a.shape
         dtype = a.dtype
         if chunksize == "auto":
-            chunksize = chunks_calculator(shape, dtype)
+            chunksize = chunks_calculator(shape, dtype, n_bytes // n_workers)
             chunksize = shape[0] if not chunksize else  chunksize[0]
             if verbose:
                 print(f'auto chunksize: {chunksize}')
-        for i in progress_bar(range((shape[0] - 1) // chunksize + 1), display=verbose, leave=False):
-            start, end = i * chunksize, min(shape[0], (i + 1) * chunksize)
-            if start >= shape[0]: break
-            if (isinstance(b, str) and b == 'rand'):
-                a[start:end] = np.random.rand(end - start, *shape[1:])
-            else:
-                if is_dask(b):
-                    a[start:end] = b[start:end].compute()
-                else:
-                    a[start:end] = b[start:end]
+        bounds = [(start, min(shape[0], start + chunksize)) for start in range(0, shape[0], chunksize)]
+        if n_workers > 1:
+            # each chunk of random data uses its own generator so that they can be created concurrently
+            seeds = np.random.randint(0, 2**31, len(bounds)) if (isinstance(b, str) and b == 'rand') else [None] * len(bounds)
+            with ThreadPoolExecutor(n_workers) as pool:
+                futures = [pool.submit(_assign_chunk, a, b, start, end, seed) for (start, end), seed in zip(bounds, seeds)]
+                for f in progress_bar(as_completed(futures), total=len(futures), display=verbose, leave=False): f.result()
+        else:
+            for start, end in progress_bar(bounds, display=verbose, leave=False):
+                _assign_chunk(a, b, start, end)
+    if verbose:
+        elapsed = time.time() - start_time
+        print(f'{bytes2str(a.nbytes)} assigned in {elapsed:.2f}s ({bytes2str(a.nbytes / max(elapsed, 1e-6))}/s)')
     if not inplace: return a
 
-# %% ../nbs/002_utils.ipynb 112
-def create_array(shape, fname=None, path='./data', on_disk=True, dtype='float32', mode='r+', fill_value='rand', chunksize='auto', verbose=True, **kwargs):
+# %% ../nbs/002_utils.ipynb 113
+def create_array(shape, fname=None, path='./data', on_disk=True, dtype='float32', mode='r+', fill_value='rand', chunksize='auto', verbose=True, 
+                 n_workers=None, n_bytes=1024**3, **kwargs):
     """
     mode:
         ‘r’:  Open existing file for reading only.
@@ -1031,7 +1060,9 @@ def create_array(shape, fname=None, path='./data', on_disk=True, dtype='float32'
         ‘w+’: Create or overwrite existing file for reading and writing.
         ‘c’:  Copy-on-write: assignments affect data in memory, but changes are not saved to disk. The file on disk is read-only.
     fill_value: 'rand' (for random numbers), int or float
-    chunksize = 'auto' to calculate chunks of 1GB, or any integer (for a given number of samples)
+    chunksize = 'auto' to calculate chunks of n_bytes (default: 1GB) across all workers, or any integer (for a given number of samples)
+    n_workers: number of threads used to fill the array (see `assign_in_chunks`)
+    kwargs: passed to np.lib.format.open_memmap (on_disk=True) or np.empty. order='F' is supported in both cases.
     """
     if on_disk:
         assert fname is not None, 'you must provide a fname (filename)'
@@ -1039,25 +1070,21 @@ def create_array(shape, fname=None, path='./data', on_disk=True, dtype='float32'
         if not fname.endswith('npy'): fname = f'{fname}.npy'
         filename = path/fname
         filename.parent.mkdir(parents=True, exist_ok=True)
-        # Save a small empty array
-        _temp_fn = path/'temp_X.npy'
-        np.save(_temp_fn, np.empty(0))
-        # Create  & save file
-        arr = np.memmap(_temp_fn, dtype=dtype, mode='w+', shape=shape, **kwargs)
-        np.save(filename, arr)
+        # Create file (without writing the data, that will be read as zeros)
+        order = kwargs.pop('order', 'C')
+        arr = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape, fortran_order=order == 'F', **kwargs)
         del arr
-        os.remove(_temp_fn)
         # Open file in selected mode
         arr = np.load(filename, mmap_mode=mode)
     else:
         arr = np.empty(shape, dtype=dtype, **kwargs)
     if fill_value != 0:
-        assign_in_chunks(arr, fill_value, chunksize=chunksize, inplace=True, verbose=verbose)
+        assign_in_chunks(arr, fill_value, chunksize=chunksize, inplace=True, verbose=verbose, n_workers=n_workers, n_bytes=n_bytes)
     return arr
 
 create_empty_array = partial(create_array, fill_value=0)
 
-# %% ../nbs/002_utils.ipynb 115
+# %% ../nbs/002_utils.ipynb 117
 import gzip
 
 def np_save_compressed(arr, fname=None, path='./data', verbose=False, **kwargs):
@@ -1081,7 +1108,135 @@ def np_load_compressed(fname=None, path='./data', **kwargs):
     f.close()
     return arr
 
-# %% ../nbs/002_utils.ipynb 117
+# %% ../nbs/002_utils.ipynb 119
+import json, lzma, zlib
+from collections import OrderedDict
+
+_CHUNKED_MAGIC = b'TSAICHK1'
+_codecs = {
+    None:   (lambda b,level: bytes(b), lambda b: b),
+    'zlib': (lambda b,level: zlib.compress(b, -1 if level is None else level), zlib.decompress),
+    'lzma': (lambda b,level: lzma.compress(b, preset=level), lzma.decompress),
+}
+
+def _chunked_filename(fname, path):
+    assert fname is not None, 'you must provide a fname (filename)'
+    if not str(fname).endswith('.npc'): fname = f'{fname}.npc'
+    return Path(path)/fname
+
+def np_save_chunked(arr, fname=None, path='./data', chunk_len=None, compression='zlib', level=None, n_workers=None, verbose=False):
+    """Saves an array (or memmap) as independently compressed chunks of `chunk_len` samples plus a chunk index,
+    so that any sample can be loaded without decompressing the whole file.
+    compression: 'zlib', 'lzma' or None. chunk_len=None uses chunks of ~256KB (smaller chunks speed up random access). Chunks are compressed in `n_workers` threads."""
+    assert compression in _codecs, f"compression must be one of {list(_codecs)}"
+    filename = _chunked_filename(fname, path)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    sample_nbytes = max(1, arr[:1].nbytes)
+    chunk_len = ifnone(chunk_len, max(1, 2**18 // sample_nbytes))
+    n_workers = ifnone(n_workers, defaults.cpus)
+    compress = partial(_codecs[compression][0], level=level)
+    starts = range(0, len(arr), chunk_len)
+    offsets = [0]
+    with open(filename, 'wb') as f, ThreadPoolExecutor(max(1, n_workers)) as pool:
+        # chunks are read and compressed in groups to keep memory usage constant (arr may be larger than RAM)
+        for i in range(0, len(starts), 4 * max(1, n_workers)):
+            group = [np.ascontiguousarray(arr[s:s + chunk_len]) for s in starts[i:i + 4 * max(1, n_workers)]]
+            for b in pool.map(compress, group):
+                f.write(b)
+                offsets.append(offsets[-1] + len(b))
+        header = json.dumps(dict(shape=list(arr.shape), dtype=np.dtype(arr.dtype).str, chunk_len=chunk_len, compression=compression,
+                                 n_chunks=len(offsets) - 1)).encode()
+        f.write(np.array(offsets, dtype='<i8').tobytes())
+        f.write(header)
+        f.write(np.array([len(header)], dtype='<u8').tobytes())
+        f.write(_CHUNKED_MAGIC)
+    pv(f'array saved to {filename} ({bytes2str(offsets[-1])} compressed, {bytes2str(arr.nbytes)} uncompressed)', verbose)
+
+def np_load_chunked(fname=None, path='./data', **kwargs):
+    "Returns a lazy `ChunkedArray` from a file saved with `np_save_chunked`"
+    return ChunkedArray(_chunked_filename(fname, path), **kwargs)
+
+
+class ChunkedArray():
+    """Read-only array stored on disk in independently compressed chunks (see `np_save_chunked`).
+    Indexing along the first axis only decompresses (in parallel) the chunks it touches."""
+    def __init__(self, filename, n_workers=None, cache_chunks=16):
+        self.filename, self.cache_chunks = str(filename), cache_chunks
+        self.n_workers = ifnone(n_workers, defaults.cpus)
+        with open(self.filename, 'rb') as f:
+            f.seek(-16, os.SEEK_END)
+            header_len, magic = int(np.frombuffer(f.read(8), dtype='<u8')[0]), f.read(8)
+            assert magic == _CHUNKED_MAGIC, f'{self.filename} is not a chunked array file'
+            f.seek(-16 - header_len, os.SEEK_END)
+            header = json.loads(f.read(header_len))
+            f.seek(-16 - header_len - 8 * (header['n_chunks'] + 1), os.SEEK_END)
+            self.offsets = np.frombuffer(f.read(8 * (header['n_chunks'] + 1)), dtype='<i8')
+        self.shape, self.dtype = tuple(header['shape']), np.dtype(header['dtype'])
+        self.chunk_len, self.compression = header['chunk_len'], header['compression']
+        self._buffer, self._pool, self._cache = None, None, OrderedDict()
+
+    @property
+    def ndim(self): return len(self.shape)
+    @property
+    def nbytes(self): return int(np.prod(self.shape)) * self.dtype.itemsize
+    def __len__(self): return self.shape[0]
+    def __array__(self, dtype=None): return self[:] if dtype is None else self[:].astype(dtype)
+    def __repr__(self):
+        return f'{self.__class__.__name__}(shape={self.shape}, dtype={self.dtype}, chunk_len={self.chunk_len}, compression={self.compression})'
+
+    def __getstate__(self):
+        # file buffer, thread pool and cache are recreated in each process (ie. dataloader workers)
+        return {k:v for k,v in self.__dict__.items() if k not in ('_buffer', '_pool', '_cache')}
+    def __setstate__(self, d):
+        self.__dict__.update(d)
+        self._buffer, self._pool, self._cache = None, None, OrderedDict()
+
+    def _read_chunk(self, i):
+        chunk = _codecs[self.compression][1](self._buffer[self.offsets[i]:self.offsets[i + 1]])
+        return np.frombuffer(chunk, dtype=self.dtype).reshape(-1, *self.shape[1:])
+
+    def _get_chunks(self, chunk_ids):
+        if self._buffer is None: self._buffer = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        missing = [i for i in chunk_ids if i not in self._cache]
+        if len(missing) > 1 and self.n_workers > 1:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool, self._pool_pid = ThreadPoolExecutor(self.n_workers), os.getpid()
+            decoded = self._pool.map(self._read_chunk, missing)
+        else:
+            decoded = map(self._read_chunk, missing)
+        chunks = {i:self._cache[i] for i in chunk_ids if i in self._cache}
+        chunks.update(zip(missing, decoded))
+        if self.cache_chunks:
+            for i in chunk_ids:
+                self._cache[i] = chunks[i]
+                self._cache.move_to_end(i)
+                if len(self._cache) > self.cache_chunks: self._cache.popitem(last=False)
+        return chunks
+
+    def __getitem__(self, idx):
+        if isinstance(idx, tuple):
+            output = self[idx[0]]
+            return output[idx[1:]] if isinstance(idx[0], (int, np.integer)) else output[(slice(None),) + idx[1:]]
+        if isinstance(idx, (int, np.integer)):
+            if not -len(self) <= idx < len(self): raise IndexError(f'index {idx} is out of bounds for axis 0 with size {len(self)}')
+            return self[[idx]][0]
+        if isinstance(idx, slice): idxs = np.arange(*idx.indices(len(self)))
+        else:
+            idxs = np.asarray(idx)
+            if idxs.dtype == bool: idxs = np.flatnonzero(idxs)
+            idxs = np.where(idxs < 0, idxs + len(self), idxs).astype(np.int64).reshape(-1)
+        output = np.empty((len(idxs),) + self.shape[1:], dtype=self.dtype)
+        if not len(idxs): return output
+        chunk_ids = idxs // self.chunk_len
+        order = np.argsort(chunk_ids, kind='stable')
+        uchunks, starts = np.unique(chunk_ids[order], return_index=True)
+        chunks = self._get_chunks(uchunks.tolist())
+        for c, start, end in zip(uchunks.tolist(), starts, np.append(starts[1:], len(idxs))):
+            sel = order[start:end]
+            output[sel] = chunks[c][idxs[sel] - c * self.chunk_len]
+        return output
+
+# %% ../nbs/002_utils.ipynb 121
 def np2memmap(arr, fname=None, path='./data', dtype='float32', mode='c', **kwargs):
     """ Function that turns an ndarray into a memmap ndarray
     mode:
@@ -1100,7 +1255,7 @@ def np2memmap(arr, fname=None, path='./data', dtype='float32', mode='c', **kwarg
     arr = np.load(filename, mmap_mode=mode)
     return arr
 
-# %% ../nbs/002_utils.ipynb 119
+# %% ../nbs/002_utils.ipynb 123
 def torch_mean_groupby(o, idxs):
     """Computes torch mean along axis 0 grouped by the idxs.
     Need to ensure that idxs have the same order as o"""
@@ -1110,14 +1265,14 @@ def torch_mean_groupby(o, idxs):
     vs = torch.split_with_sizes(o, tuple(vals))
     return torch.cat([v.mean(0).unsqueeze(0) for k,v in zip(idxs, vs)])
 
-# %% ../nbs/002_utils.ipynb 121
+# %% ../nbs/002_utils.ipynb 125
 def torch_flip(t, dims=-1):
     if dims == -1: return t[..., np.arange(t.shape[dims])[::-1].copy()]
     elif dims == 0: return t[np.arange(t.shape[dims])[::-1].copy()]
     elif dims == 1: return t[:, np.arange(t.shape[dims])[::-1].copy()]
     elif dims == 2: return t[:, :, np.arange(t.shape[dims])[::-1].copy()]
 
-# %% ../nbs/002_utils.ipynb 123
+# %% ../nbs/002_utils.ipynb 127
 def torch_nan_to_num(o, num=0, inplace=False):
     if ismin_torch("1.8") and not inplace:
         return torch.nan_to_num(o, num)
@@ -1130,11 +1285,11 @@ def torch_masked_to_num(o, mask, num=0, inplace=False):
     else:
         return o.masked_fill(mask, num)
 
-# %% ../nbs/002_utils.ipynb 127
+# %% ../nbs/002_utils.ipynb 131
 def mpl_trend(x, y, deg=1):
     return np.poly1d(np.polyfit(x, y, deg))(x)
 
-# %% ../nbs/002_utils.ipynb 129
+# %% ../nbs/002_utils.ipynb 133
 def int2digits(o, n_digits=None, normalize=True):
     if n_digits is not None:
         iterable = '0' * (n_digits - len(str(abs(o)))) + str(abs(o))
@@ -1153,7 +1308,7 @@ def array2digits(o, n_digits=None, normalize=True):
         output = output / 10
     return output
 
-# %% ../nbs/002_utils.ipynb 131
+# %% ../nbs/002_utils.ipynb 135
 def sincos_encoding(seq_len, device=None, to_np=False):
     if to_np:
         sin = np.sin(np.arange(seq_len) / seq_len * 2 * np.pi)
@@ -1164,7 +1319,7 @@ def sincos_encoding(seq_len, device=None, to_np=False):
         cos = torch.cos(torch.arange(seq_len, device=device) / seq_len * 2 * np.pi)
     return sin, cos
 
-# %% ../nbs/002_utils.ipynb 133
+# %% ../nbs/002_utils.ipynb 137
 def linear_encoding(seq_len, device=None, to_np=False, lin_range=(-1,1)):
     if to_np:
         enc =  np.linspace(lin_range[0], lin_range[1], seq_len)
@@ -1173,7 +1328,7 @@ def linear_encoding(seq_len, device=None, to_np=False, lin_range=(-1,1)):
         enc = torch.linspace(lin_range[0], lin_range[1], seq_len, device=device)
     return enc
 
-# %% ../nbs/002_utils.ipynb 135
+# %% ../nbs/002_utils.ipynb 139
 def encode_positions(pos_arr, min_val=None, max_val=None, linear=False, lin_range=(-1,1)):
     """ Encodes an array with positions using a linear or sincos methods
     """
@@ -1190,17 +1345,17 @@ def encode_positions(pos_arr, min_val=None, max_val=None, linear=False, lin_rang
         cos = np.cos((pos_arr - min_val)/(max_val - min_val) * 2 * np.pi)
         return sin, cos
 
-# %% ../nbs/002_utils.ipynb 138
+# %% ../nbs/002_utils.ipynb 142
 def sort_generator(generator, bs):
     g = list(generator)
     for i in range(len(g)//bs + 1): g[bs*i:bs*(i+1)] = np.sort(g[bs*i:bs*(i+1)])
     return (i for i in g)
 
-# %% ../nbs/002_utils.ipynb 140
+# %% ../nbs/002_utils.ipynb 144
 def get_subset_dict(d, keys):
     return dict((k,d[k]) for k in listify(keys) if k in d)
 
-# %% ../nbs/002_utils.ipynb 142
+# %% ../nbs/002_utils.ipynb 146
 def create_dir(directory, verbose=True):
     if not is_listy(directory): directory = [directory]
     for d in directory:
@@ -1226,7 +1381,7 @@ def remove_dir(directory, verbose=True):
             assert not d.exists(), f"a problem has occurred while deleting {d}"
             if verbose: print(f"{d} directory removed.")
 
-# %% ../nbs/002_utils.ipynb 147
+# %% ../nbs/002_utils.ipynb 151
 class named_partial(object):
     """Create a partial function with a __name__"""
 
@@ -1238,7 +1393,7 @@ class named_partial(object):
     def __repr__(self):
         return self.__name__
 
-# %% ../nbs/002_utils.ipynb 149
+# %% ../nbs/002_utils.ipynb 153
 def attrdict2dict(
     d: dict,  # a dict
 ):
@@ -1264,7 +1419,7 @@ def dict2attrdict(
             d[k] = list(v)  # convert L to list
     return AttrDict(d)
 
-# %% ../nbs/002_utils.ipynb 151
+# %% ../nbs/002_utils.ipynb 155
 def dict2yaml(
     d, # a dict
     file_path, # a path to a yaml file
@@ -1304,7 +1459,7 @@ def get_config(file_path):
     config = dict2attrdict(config)
     return config
 
-# %% ../nbs/002_utils.ipynb 154
+# %% ../nbs/002_utils.ipynb 158
 def str2list(o):
     if o is None: return []
     elif o is not None and not isinstance(o, (list, L)):
@@ -1326,11 +1481,11 @@ def get_cat_cols(df):
     cont_cols = df._get_numeric_data().columns.tolist()
     return [col for col in cols if col not in cont_cols]
 
-# %% ../nbs/002_utils.ipynb 155
+# %% ../nbs/002_utils.ipynb 159
 alphabet = L(list(string.ascii_lowercase))
 ALPHABET = L(list(string.ascii_uppercase))
 
-# %% ../nbs/002_utils.ipynb 156
+# %% ../nbs/002_utils.ipynb 160
 def get_mapping(arr, dim=1, return_counts=False):
     maps = [L(np.unique(np.take(arr, i, dim)).tolist()) for i in range(arr.shape[dim])]
     if return_counts:
@@ -1343,7 +1498,7 @@ def map_array(arr, dim=1):
     if dim == 1: out = out.T
     return out
 
-# %% ../nbs/002_utils.ipynb 159
+# %% ../nbs/002_utils.ipynb 163
 def log_tfm(o, inplace=False):
     "Log transforms an array-like object with positive and/or negative values"
     if isinstance(o, torch.Tensor):
@@ -1363,13 +1518,13 @@ def log_tfm(o, inplace=False):
         output[output < 0] = neg_o
         return output
 
-# %% ../nbs/002_utils.ipynb 162
+# %% ../nbs/002_utils.ipynb 166
 def to_sincos_time(arr, max_value):
     sin = np.sin(arr / max_value * 2 * np.pi)
     cos = np.cos(arr / max_value * 2 * np.pi)
     return sin, cos
 
-# %% ../nbs/002_utils.ipynb 164
+# %% ../nbs/002_utils.ipynb 168
 def plot_feature_dist(X, percentiles=[0,0.1,0.5,1,5,10,25,50,75,90,95,99,99.5,99.9,100]):
     for i in range(X.shape[1]):
         ys = []
@@ -1381,7 +1536,7 @@ def plot_feature_dist(X, percentiles=[0,0.1,0.5,1,5,10,25,50,75,90,95,99,99.5,99
         plt.title(f"var_{i}")
         plt.show()
 
-# %% ../nbs/002_utils.ipynb 166
+# %% ../nbs/002_utils.ipynb 170
 def rolling_moving_average(o, window=2):
     if isinstance(o, torch.Tensor):
         cunsum = torch.cumsum(o, axis=-1) # nancumsum not available (can't be used with missing data!)
@@ -1394,7 +1549,7 @@ def rolling_moving_average(o, window=2):
         count = np.minimum(np.ones_like(o).cumsum(-1), window)
         return (cunsum - lag_cunsum) / count
 
-# %% ../nbs/002_utils.ipynb 168
+# %% ../nbs/002_utils.ipynb 172
 def ffill_sequence(o):
     """Forward fills an array-like object alongside sequence dimension"""
     if isinstance(o, torch.Tensor):
@@ -1425,7 +1580,7 @@ def fbfill_sequence(o):
     o = bfill_sequence(o)
     return o
 
-# %% ../nbs/002_utils.ipynb 173
+# %% ../nbs/002_utils.ipynb 177
 def dummify(o:Union[np.ndarray, torch.Tensor], by_var:bool=True, inplace:bool=False, skip:Optional[list]=None, random_state=None):
     """Shuffles an array-like object along all dimensions or dimension 1 (variables) if by_var is True."""
     if not inplace:
@@ -1441,7 +1596,7 @@ def dummify(o:Union[np.ndarray, torch.Tensor], by_var:bool=True, inplace:bool=Fa
     if not inplace:
         return o_dummy
 
-# %% ../nbs/002_utils.ipynb 176
+# %% ../nbs/002_utils.ipynb 180
 def shuffle_along_axis(o, axis=-1, random_state=None):
     if isinstance(o, torch.Tensor): size = o.numel()
     else: size = np.size(o)
@@ -1450,7 +1605,7 @@ def shuffle_along_axis(o, axis=-1, random_state=None):
         o = np.take_along_axis(o, idx, axis=ax)
     return o
 
-# %% ../nbs/002_utils.ipynb 178
+# %% ../nbs/002_utils.ipynb 182
 def analyze_feature(feature, bins=100, density=False, feature_name=None, clip_outliers_plot=False, quantile_range=(25.0, 75.0),
            percentiles=[1, 25, 50, 75, 99], text_len=12, figsize=(10,6)):
     non_nan_feature = feature[~np.isnan(feature)]
@@ -1491,7 +1646,7 @@ def analyze_array(o, bins=100, density=False, feature_names=None, clip_outliers_
     else:
         analyze_feature(o.flatten(), feature_name=feature_names)
 
-# %% ../nbs/002_utils.ipynb 181
+# %% ../nbs/002_utils.ipynb 185
 def get_relpath(path):
     current_path = os.getcwd()
     if is_listy(path):
@@ -1502,7 +1657,7 @@ def get_relpath(path):
     else:
         return os.path.relpath(path, current_path)
 
-# %% ../nbs/002_utils.ipynb 182
+# %% ../nbs/002_utils.ipynb 186
 def get_root():
     "Returns the root directory of the git repository."
     import subprocess
@@ -1520,7 +1675,7 @@ def to_root_path(path):
     else:
         return Path(get_root()) / path
 
-# %% ../nbs/002_utils.ipynb 183
+# %% ../nbs/002_utils.ipynb 187
 def split_in_chunks(o, chunksize, start=0, shuffle=False, drop_last=False):
     stop = ((len(o) - start)//chunksize*chunksize) if drop_last else None
     chunk_list = []
@@ -1529,7 +1684,7 @@ def split_in_chunks(o, chunksize, start=0, shuffle=False, drop_last=False):
     if shuffle: random.shuffle(chunk_list)
     return chunk_list
 
-# %% ../nbs/002_utils.ipynb 185
+# %% ../nbs/002_utils.ipynb 189
 def save_object(o, file_path, verbose=True):
     file_path = Path(file_path)
     if not file_path.suffix == '.pkl':
@@ -1544,7 +1699,7 @@ def load_object(file_path):
         file_path = file_path.parent / (file_path.name + '.pkl')
     return joblib.load(file_path)
 
-# %% ../nbs/002_utils.ipynb 188
+# %% ../nbs/002_utils.ipynb 192
 def get_idxs_to_keep(o, cond, crit='all', invert=False, axis=(1,2), keepdims=False):
     idxs_to_keep = cond(o)
     if isinstance(o, torch.Tensor):
@@ -1564,7 +1719,7 @@ def get_idxs_to_keep(o, cond, crit='all', invert=False, axis=(1,2), keepdims=Fal
         if invert: idxs_to_keep = ~idxs_to_keep
         return idxs_to_keep
 
-# %% ../nbs/002_utils.ipynb 190
+# %% ../nbs/002_utils.ipynb 194
 def zerofy(a, stride, keep=False):
     "Create copies of an array setting individual/ group values to zero "
     if keep:
@@ -1586,13 +1741,13 @@ def zerofy(a, stride, keep=False):
     else:
         return a
 
-# %% ../nbs/002_utils.ipynb 192
+# %% ../nbs/002_utils.ipynb 196
 def feat2list(o):
     if o is None: return []
     elif isinstance(o, str): return [o]
     return list(o)
 
-# %% ../nbs/002_utils.ipynb 194
+# %% ../nbs/002_utils.ipynb 198
 def smallest_dtype(num, use_unsigned=False):
     "Find the smallest dtype that can safely hold `num`"
     if use_unsigned:
@@ -1617,7 +1772,39 @@ def smallest_dtype(num, use_unsigned=False):
     else:
         raise ValueError("Input is not a number")
 
-# %% ../nbs/002_utils.ipynb 196
+# %% ../nbs/002_utils.ipynb 200
+def compact_idxs(o):
+    "Returns indices `o` as a `range` if they are contiguous and ascending, or as an array with the smallest int dtype otherwise"
+    if isinstance(o, range) and o.step == 1: return o
+    if isinstance(o, slice): return o
+    if isinstance(o, torch.Tensor): o = o.cpu().numpy()
+    o = np.asarray(o).reshape(-1)
+    if o.dtype == bool: o = np.flatnonzero(o)
+    if len(o) == 0: return range(0)
+    start = int(o[0])
+    if int(o[-1]) - start == len(o) - 1 and (len(o) == 1 or (o[1:] - o[:-1] == 1).all()):
+        return range(start, start + len(o))
+    return o.astype(smallest_dtype(int(o.max())), copy=False)
+
+
+def range2slice(o):
+    "Converts a `range` with a positive step into the equivalent `slice` (other objects are returned unchanged)"
+    if isinstance(o, range) and o.step > 0: return slice(o.start, o.stop, o.step if o.step != 1 else None)
+    return o
+
+
+def take_idxs(idxs, it):
+    "Indexes compact indices `idxs` with `it` without materializing `range` objects"
+    if not isinstance(idxs, range): return idxs[it]
+    if isinstance(it, slice) or is_indexer(it): return idxs[it]
+    if isinstance(it, range): return idxs[range2slice(it)] if it.step > 0 else np.asarray(idxs)[it]
+    it = np.asarray(it)
+    if it.dtype == bool: it = np.flatnonzero(it)
+    if len(it) and (it.min() < -len(idxs) or it.max() >= len(idxs)): raise IndexError("index out of range")
+    it = np.where(it < 0, it + len(idxs), it)
+    return (idxs.start + it.astype(np.int64) * idxs.step).astype(smallest_dtype(max(abs(idxs.start), abs(idxs.stop))), copy=False)
+
+# %% ../nbs/002_utils.ipynb 202
 def plot_forecast(X_true, y_true, y_pred, sel_vars=None, idx=None, figsize=(8, 4), n_samples=1):
 
     import matplotlib.pyplot as plt
@@ -1675,7 +1862,7 @@ def plot_forecast(X_true, y_true, y_pred, sel_vars=None, idx=None, figsize=(8, 4
             for sel_var in sel_vars:
                 _plot_forecast(X_true, y_true, y_pred, sel_var=sel_var, idx=idx, figsize=figsize)
 
-# %% ../nbs/002_utils.ipynb 197
+# %% ../nbs/002_utils.ipynb 203
 def str2callable(
     object_path: str = None # The string representing the object path.
 ):
@@ -1724,3 +1911,15 @@ def str2callable(
     except Exception as e:
         raise TypeError(f"{object_path} is not a class or a function: {e}")
 
+
+# %% ../nbs/002_utils.ipynb 204
+def time_fn(
+    f:callable, # function called without arguments
+    n_iters:int=10, # number of timed calls
+    n_warmup:int=2, # number of untimed calls made first
+)->float: # average time per call (seconds)
+    "Returns the average time per call of `f` after `n_warmup` untimed calls."
+    for _ in range(n_warmup): f()
+    start = time.perf_counter()
+    for _ in range(n_iters): f()
+    return (time.perf_counter() - start) / n_iters